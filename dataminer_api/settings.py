@@ -41,6 +41,7 @@
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'drf_spectacular',
@@ -99,9 +100,26 @@
     },
 }
 
+# Redis instance shared by Celery (db 0) and the cache (db 1)
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': f"{REDIS_URL}/1",
+    },
+}
+
 # Jira Config
 JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = (os.getenv("JIRA_API_TOKEN") or "").strip('"')
+# Issues enriched in parallel per page, and max in-flight requests per Jira domain
+JIRA_MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "8"))
+JIRA_DOMAIN_CONCURRENCY = int(os.getenv("JIRA_DOMAIN_CONCURRENCY", "8"))
+JIRA_MAX_RATE_LIMIT_RETRIES = int(os.getenv("JIRA_MAX_RATE_LIMIT_RETRIES", "5"))
+# Seconds a domain's field metadata and a validated token are reused across tasks
+JIRA_FIELD_CACHE_TTL = int(os.getenv("JIRA_FIELD_CACHE_TTL", str(60 * 60)))
+JIRA_TOKEN_CACHE_TTL = int(os.getenv("JIRA_TOKEN_CACHE_TTL", str(10 * 60)))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -171,7 +189,7 @@
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
+        'utils.search.FullTextSearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -187,10 +205,10 @@
 }
 
 # Defines the broker URL (Redis) that Celery will use for messaging
-CELERY_BROKER_URL = 'redis://redis:6379/0'
+CELERY_BROKER_URL = f"{REDIS_URL}/0"
 
 # Defines where the task results will be stored
-CELERY_RESULT_BACKEND = 'redis://redis:6379/0'
+CELERY_RESULT_BACKEND = f"{REDIS_URL}/0"
 
 # Defines which serialization formats are accepted for the messages
 # In this case, only JSON is allowed
@@ -235,9 +253,48 @@
 # Adicione esta linha para dizer ao Celery para procurar tarefas em outros apps
 CELERY_IMPORTS = ('jobs.tasks', 'stackoverflow.tasks')
 
+# Workers send task events (task-started, task-succeeded, ...), consumed by
+# `python manage.py consume_task_events` to keep the Task table in sync
+CELERY_WORKER_SEND_TASK_EVENTS = True
+
+# Seconds without any event from a worker before its active tasks are failed as orphaned
+TASK_WORKER_LOST_AFTER = int(os.getenv("TASK_WORKER_LOST_AFTER", "60"))
+
+# Seconds a collection lock or deduplicated request is kept at most, should its task never release it
+COLLECTION_LOCK_TTL = int(os.getenv("COLLECTION_LOCK_TTL", str(60 * 60 * 24)))
+
+# Seconds a collection waits before trying again while an overlapping range of the same data is collected
+COLLECTION_LOCK_RETRY = int(os.getenv("COLLECTION_LOCK_RETRY", "60"))
+
+# Seconds between two reconciliations of active Task rows with their Celery state
+# (a safety net for events missed while the consumer was down)
+TASK_SYNC_INTERVAL = int(os.getenv("TASK_SYNC_INTERVAL", "60"))
+
+# Seconds a server-sent events stream of task progress stays open before the client reconnects.
+# Kept below the gunicorn worker timeout (GUNICORN_TIMEOUT, see start.sh) and nginx's proxy_read_timeout
+TASK_EVENTS_MAX_SECONDS = min(
+    int(os.getenv("TASK_EVENTS_MAX_SECONDS", "90")),
+    int(os.getenv("GUNICORN_TIMEOUT", "120")) - 10,
+)
+
+# Periodic tasks, run by `celery -A dataminer_api beat`
+CELERY_BEAT_SCHEDULE = {
+    'sync-task-statuses': {
+        'task': 'jobs.sync_task_statuses',
+        'schedule': TASK_SYNC_INTERVAL,
+    },
+}
+
 STACK_API_KEY = os.getenv("STACK_API_KEY")
 STACK_ACCESS_TOKEN = os.getenv("STACK_ACCESS_TOKEN")
 
+# Stack Exchange calls rotate over these keys/tokens (comma separated), paired by
+# position; a single access token is shared by every key
+STACK_API_KEYS = [k.strip() for k in (os.getenv("STACK_API_KEYS") or STACK_API_KEY or "").split(",") if k.strip()]
+STACK_ACCESS_TOKENS = [
+    t.strip() for t in (os.getenv("STACK_ACCESS_TOKENS") or STACK_ACCESS_TOKEN or "").split(",") if t.strip()
+]
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -261,7 +318,8 @@
     'loggers': {
         'stackoverflow': {
             'handlers': ['console'],
-            'level': 'INFO',
+            # DEBUG adds one structured record per page (counters, quota, backoff)
+            'level': os.getenv('MINER_LOG_LEVEL', 'INFO'),
             'propagate': False,
         },
     },
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.8 on 2026-10-19 04:33
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('github', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='githubcommit',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('message', config='english', weight='A'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='githubissuepullrequest',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('body', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='githubcommit',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='github_commit_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='githubissuepullrequest',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='github_issuepr_search_gin'),
+        ),
+    ]
@@ -102,17 +102,19 @@ def get_commits(self, repo_name: str, start_date: Optional[str] = None,
     
     # Pull requests mining methods
     def get_pull_requests(self, repo_name: str, start_date: Optional[str] = None, 
-                         end_date: Optional[str] = None, depth: str = 'basic', task_obj=None) -> List[Dict[str, Any]]:
+                         end_date: Optional[str] = None, depth: str = 'basic', task_obj=None,
+                         start_page: int = 1) -> List[Dict[str, Any]]:
         """Extract pull requests from a GitHub repository"""
         self._sync_auth_state()
-        return self._pull_requests_miner.get_pull_requests(repo_name, start_date, end_date, depth, task_obj)
+        return self._pull_requests_miner.get_pull_requests(repo_name, start_date, end_date, depth, task_obj, start_page)
     
     # Issues mining methods
     def get_issues(self, repo_name: str, start_date: Optional[str] = None, 
-                   end_date: Optional[str] = None, depth: str = 'basic', task_obj=None) -> List[Dict[str, Any]]:
+                   end_date: Optional[str] = None, depth: str = 'basic', task_obj=None,
+                   start_page: int = 1) -> List[Dict[str, Any]]:
         """Extract issues from a GitHub repository"""
         self._sync_auth_state()
-        return self._issues_miner.get_issues(repo_name, start_date, end_date, depth, task_obj)
+        return self._issues_miner.get_issues(repo_name, start_date, end_date, depth, task_obj, start_page)
     
     # Metadata and branches mining methods
     def get_branches(self, repo_name: str) -> List[Dict[str, Any]]:
@@ -5,7 +5,7 @@
 from django.utils import timezone
 
 from .base import BaseMiner
-from .utils import APIMetrics, split_date_range, update_task_progress_date
+from .utils import APIMetrics, save_cursor, split_date_range, update_task_progress_date
 from ..models import GitHubIssuePullRequest, GitHubIssue, GitHubMetadata
 
 
@@ -13,7 +13,8 @@ class IssuesMiner(BaseMiner):
     """Specialized miner for GitHub issues extraction"""
 
     def get_issues(self, repo_name: str, start_date: Optional[str] = None, 
-                   end_date: Optional[str] = None, depth: str = 'basic', task_obj=None) -> List[Dict[str, Any]]:
+                   end_date: Optional[str] = None, depth: str = 'basic', task_obj=None,
+                   start_page: int = 1) -> List[Dict[str, Any]]:
         """
         Extract issues from a GitHub repository
         
@@ -23,6 +24,7 @@ def get_issues(self, repo_name: str, start_date: Optional[str] = None,
             end_date: End date in ISO format (optional)
             depth: Extraction depth ('basic' or 'complex')
             task_obj: Task object for progress updates (optional)
+            start_page: Search page the first period resumes on (from Task.cursor)
             
         Returns:
             List of extracted issue data
@@ -81,7 +83,8 @@ def log_progress(message: str) -> None:
             for period_start, period_end in split_date_range(start_date, end_date):
                 log_progress(f"📊 Processing period: {period_start} to {period_end}")
                 
-                page = 1
+                # only the first period resumes mid-way
+                page, start_page = start_page, 1
                 has_more_pages = True
                 period_issues_count = 0
 
@@ -238,6 +241,7 @@ def log_progress(message: str) -> None:
                         has_more_pages = False
                     else:
                         page += 1
+                        save_cursor(task_obj, day=period_start, page=page)
 
                     time.sleep(1)
 
@@ -250,6 +254,7 @@ def log_progress(message: str) -> None:
                 elif period_start:
                     # For single-day periods, use the start date
                     update_task_progress_date(task_obj, period_start)
+                save_cursor(task_obj)
 
             log_progress(f"✅ Extraction completed! Total issues collected: {len(all_issues)}")
             return all_issues
@@ -5,7 +5,7 @@
 from django.utils import timezone
 
 from .base import BaseMiner
-from .utils import APIMetrics, split_date_range, update_task_progress_date
+from .utils import APIMetrics, save_cursor, split_date_range, update_task_progress_date
 from ..models import GitHubIssuePullRequest, GitHubMetadata
 
 
@@ -13,7 +13,8 @@ class PullRequestsMiner(BaseMiner):
     """Specialized miner for GitHub pull requests extraction"""
 
     def get_pull_requests(self, repo_name: str, start_date: Optional[str] = None, 
-                         end_date: Optional[str] = None, depth: str = 'basic', task_obj=None) -> List[Dict[str, Any]]:
+                         end_date: Optional[str] = None, depth: str = 'basic', task_obj=None,
+                         start_page: int = 1) -> List[Dict[str, Any]]:
         """
         Extract pull requests from a GitHub repository
         
@@ -23,6 +24,7 @@ def get_pull_requests(self, repo_name: str, start_date: Optional[str] = None,
             end_date: End date in ISO format (optional)
             depth: Extraction depth ('basic' or 'complex')
             task_obj: Task object for progress updates (optional)
+            start_page: Search page the first period resumes on (from Task.cursor)
             
         Returns:
             List of extracted pull request data
@@ -104,7 +106,8 @@ def flush_debug_logs() -> None:
                 log_progress(f"📊 Processing period: {period_start} to {period_end}")
                 
                 base_url = "https://api.github.com/search/issues"
-                page = 1
+                # only the first period resumes mid-way
+                page, start_page = start_page, 1
                 has_more_pages = True
 
                 while has_more_pages:
@@ -273,6 +276,7 @@ def flush_debug_logs() -> None:
                         has_more_pages = False
                     else:
                         page += 1
+                        save_cursor(task_obj, day=period_start, page=page)
 
                     time.sleep(1)
 
@@ -283,6 +287,7 @@ def flush_debug_logs() -> None:
                     update_task_progress_date(task_obj, period_end)
                 elif period_start:
                     update_task_progress_date(task_obj, period_start)
+                save_cursor(task_obj)
 
             log_progress(f"✅ Extraction completed! Total pull requests collected: {len(all_prs)}")
             return all_prs
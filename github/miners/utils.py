@@ -148,6 +148,18 @@ def convert_to_iso8601(date: datetime) -> str:
     return date.isoformat()
 
 
+def save_cursor(task_obj, **cursor) -> None:
+    """
+    Record the period and next page being collected on the task, so a restart
+    resumes on that page; no arguments clears it.
+    """
+    if task_obj:
+        try:
+            task_obj.save_cursor(**cursor)
+        except Exception as e:
+            print(f"⚠️ Warning: Could not save the collection cursor: {str(e)}", flush=True)
+
+
 def update_task_progress_date(task_obj, completed_date: str) -> None:
     """
     Updates the task's date_last_update field to track scraping progress
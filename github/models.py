@@ -1,5 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
+from utils.search import search_vector_field
+
 
 class GitHubAuthor(models.Model):
     name = models.CharField(max_length=255)
@@ -29,6 +32,12 @@ class GitHubCommit(models.Model):
     dmm_unit_complexity = models.FloatField(null=True)
     dmm_unit_interfacing = models.FloatField(null=True)
     time_mined = models.DateTimeField(null=True, help_text="Date and time of mining")
+    search_vector = search_vector_field(('message', 'A'))
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='github_commit_search_gin'),
+        ]
 
     def __str__(self):
         return f"Commit {self.sha}"
@@ -193,12 +202,14 @@ class GitHubIssuePullRequest(models.Model):
     reactions = models.JSONField(default=dict)
     data_type = models.CharField(max_length=20)
     time_mined = models.DateTimeField(null=True, help_text="Date and time of mining")
+    search_vector = search_vector_field(('title', 'A'), ('body', 'B'))
 
     class Meta:
         indexes = [
             models.Index(fields=['repository', 'record_id']),
             models.Index(fields=['github_created_at']),
-            models.Index(fields=['github_updated_at'])
+            models.Index(fields=['github_updated_at']),
+            GinIndex(fields=['search_vector'], name='github_issuepr_search_gin'),
         ]
 
     def __str__(self):
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import GitHubCommit, GitHubIssue, GitHubPullRequest, GitHubBranch, GitHubAuthor, GitHubModifiedFile, GitHubMethod, GitHubMetadata, GitHubIssuePullRequest
 from .utils import DateTimeHandler
+from utils.expand import ExpandableFieldsMixin
 
 class GitHubAuthorSerializer(serializers.ModelSerializer):
     class Meta:
@@ -12,21 +13,23 @@ class Meta:
         model = GitHubMethod
         fields = ['name', 'complexity', 'max_nesting']
 
-class GitHubModifiedFileSerializer(serializers.ModelSerializer):
+class GitHubModifiedFileSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     methods = GitHubMethodSerializer(many=True, read_only=True)
     
     class Meta:
         model = GitHubModifiedFile
-        fields = ['filename', 'change_type', 'added_lines', 'deleted_lines', 'complexity', 'methods']
+        fields = ['filename', 'change_type', 'added_lines', 'deleted_lines', 'complexity', 'diff', 'methods']
+        # Heavy columns/relations, rendered only with ?expand=diff / ?expand=methods
+        expandable_fields = ['diff', 'methods']
 
-class GitHubCommitSerializer(serializers.ModelSerializer):
+class GitHubCommitSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     author = GitHubAuthorSerializer(read_only=True)
     committer = GitHubAuthorSerializer(read_only=True)
     modified_files = GitHubModifiedFileSerializer(many=True, read_only=True)
     
     class Meta:
         model = GitHubCommit
-        fields = '__all__'
+        exclude = ['search_vector']
 
 class GitHubIssueSerializer(serializers.ModelSerializer):
     created_at_formatted = serializers.SerializerMethodField()
@@ -98,7 +101,7 @@ class GitHubIssuePullRequestSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = GitHubIssuePullRequest
-        fields = '__all__'
+        exclude = ['search_vector']
 
     def get_created_at_formatted(self, obj):
         return DateTimeHandler.format_date(obj.github_created_at)
@@ -186,9 +189,9 @@ class ExportDataSerializer(serializers.Serializer):
         help_text="List of IDs to export (optional)"
     )
     format = serializers.ChoiceField(
-        choices=['json', 'csv'],
+        choices=['json', 'ndjson', 'csv', 'parquet', 'arrow'],
         default='json',
-        help_text="Output format"
+        help_text="Output format (json array, newline-delimited json, csv, parquet or arrow ipc file)"
     )
     data_type = serializers.ChoiceField(
         choices=['issue', 'pull_request'],
@@ -198,7 +201,7 @@ class ExportDataSerializer(serializers.Serializer):
     fields = serializers.ListField(
         child=serializers.CharField(),
         required=False,
-        help_text="Optional: limit CSV columns to this list of field names"
+        help_text="Optional: limit exported columns to this list of field names"
     )
 
     # New fields for filter on the BODY
@@ -211,6 +214,11 @@ class ExportDataSerializer(serializers.Serializer):
     state = serializers.CharField(required=False, help_text="Filter by issue/PR state (e.g. open, closed)")
     creator = serializers.CharField(required=False, help_text="Filter by creator username")
 
+    run_async = serializers.BooleanField(
+        default=False,
+        help_text="Run the export as a background job writing a compressed file; returns a task id"
+    )
+
     def validate(self, data):
         if data.get("date") and (data.get("start_date") or data.get("end_date")):
             raise serializers.ValidationError("Use apenas 'date' OU 'start_date'/'end_date'.")
@@ -1,7 +1,8 @@
 from celery import shared_task
 from .miners import GitHubMiner
+from jobs.locks import collection_guard
 from jobs.models import Task
-from datetime import datetime, timedelta
+from datetime import datetime
 from django.utils import timezone as dj_tz
 
 def format_date_for_json(date_value):
@@ -58,7 +59,9 @@ def _verify_token_or_fail(self, miner, task_obj, operation, repo_name, extra_met
 def _reuse_or_create_task(self, *, defaults, task_pk=None):
     if task_pk:
         update_data = {**defaults, "task_id": self.request.id}
+        # a restart keeps the original range start and parameters
         update_data.pop("date_init", None)
+        update_data.pop("params", None)
         updated = Task.objects.filter(pk=task_pk).update(**update_data)
         if updated:
             return Task.objects.get(pk=task_pk), False
@@ -66,6 +69,7 @@ def _reuse_or_create_task(self, *, defaults, task_pk=None):
 
 
 @shared_task(bind=True)
+@collection_guard("github", "commits", target="repo_name")
 def fetch_commits(self, repo_name, start_date=None, end_date=None, commit_sha=None, task_pk=None):
     defaults = {
         "operation": f"🔄 Starting GitHub commit collection: {repo_name}",
@@ -75,6 +79,10 @@ def fetch_commits(self, repo_name, start_date=None, end_date=None, commit_sha=No
         "date_init": start_date,
         "date_end": end_date,
         "type": f"github_commits_{commit_sha}" if commit_sha else "github_commits",
+        "params": {
+            "repo_name": repo_name, "start_date": format_date_for_json(start_date),
+            "end_date": format_date_for_json(end_date), "commit_sha": commit_sha,
+        },
     }
     task_obj, created = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
 
@@ -174,7 +182,8 @@ def fetch_commits(self, repo_name, start_date=None, end_date=None, commit_sha=No
         }
 
 @shared_task(bind=True)
-def fetch_issues(self, repo_name, start_date=None, end_date=None, depth='basic', task_pk=None):
+@collection_guard("github", "issues", target="repo_name")
+def fetch_issues(self, repo_name, start_date=None, end_date=None, depth='basic', task_pk=None, start_page=1):
     defaults = {
         "operation": f"🔄 Starting GitHub issue collection: {repo_name}",
         "repository": repo_name,
@@ -182,6 +191,10 @@ def fetch_issues(self, repo_name, start_date=None, end_date=None, depth='basic',
         "date_init": start_date,
         "date_end": end_date,
         "type": f"github_issues_{depth}",
+        "params": {
+            "repo_name": repo_name, "start_date": format_date_for_json(start_date),
+            "end_date": format_date_for_json(end_date), "depth": depth,
+        },
     }
     task_obj, created = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
 
@@ -210,7 +223,7 @@ def fetch_issues(self, repo_name, start_date=None, end_date=None, depth='basic',
             return token_failure
 
         miner.get_repository_metadata(repo_name)
-        issues = miner.get_issues(repo_name, start_date, end_date, depth, task_obj)
+        issues = miner.get_issues(repo_name, start_date, end_date, depth, task_obj, start_page=start_page)
 
         task_obj.status = 'SUCCESS'
         task_obj.operation = f"Completed GitHub issue collection: {repo_name}"
@@ -276,7 +289,8 @@ def fetch_issues(self, repo_name, start_date=None, end_date=None, depth='basic',
         }
 
 @shared_task(bind=True)
-def fetch_pull_requests(self, repo_name, start_date=None, end_date=None, depth='basic', task_pk=None):
+@collection_guard("github", "pull_requests", target="repo_name")
+def fetch_pull_requests(self, repo_name, start_date=None, end_date=None, depth='basic', task_pk=None, start_page=1):
     defaults = {
         "operation": f"🔄 Starting GitHub pull request collection: {repo_name} ",
         "repository": repo_name,
@@ -285,6 +299,10 @@ def fetch_pull_requests(self, repo_name, start_date=None, end_date=None, depth='
         "date_init": start_date,
         "date_end": end_date,
         "type": f"github_pull_requests_{depth}",
+        "params": {
+            "repo_name": repo_name, "start_date": format_date_for_json(start_date),
+            "end_date": format_date_for_json(end_date), "depth": depth,
+        },
     }
     task_obj, created = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
 
@@ -311,7 +329,7 @@ def fetch_pull_requests(self, repo_name, start_date=None, end_date=None, depth='
             return token_failure
 
         miner.get_repository_metadata(repo_name)
-        pull_requests = miner.get_pull_requests(repo_name, start_date, end_date, depth, task_obj)
+        pull_requests = miner.get_pull_requests(repo_name, start_date, end_date, depth, task_obj, start_page=start_page)
 
         task_obj.status = 'SUCCESS'
         task_obj.operation = f"Completed GitHub pull request collection: {repo_name}"
@@ -377,6 +395,7 @@ def fetch_pull_requests(self, repo_name, start_date=None, end_date=None, depth='
         }
 
 @shared_task(bind=True)
+@collection_guard("github", "branches", target="repo_name")
 def fetch_branches(self, repo_name, task_pk=None):
     defaults = {
         "operation": f"🔄 Starting GitHub branches collection: {repo_name}",
@@ -384,6 +403,7 @@ def fetch_branches(self, repo_name, task_pk=None):
         "error": None,
         "status": "STARTED",
         "type": "github_branches",
+        "params": {"repo_name": repo_name},
     }
     task_obj, created = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
 
@@ -464,6 +484,7 @@ def fetch_branches(self, repo_name, task_pk=None):
         }
 
 @shared_task(bind=True)
+@collection_guard("github", "metadata", target="repo_name")
 def fetch_metadata(self, repo_name, task_pk=None):
     defaults = {
         "operation": f"🔄 Starting GitHub metadata collection: {repo_name}",
@@ -471,6 +492,7 @@ def fetch_metadata(self, repo_name, task_pk=None):
         "error": None,
         "status": "STARTED",
         "type": "github_metadata",
+        "params": {"repo_name": repo_name},
     }
     task_obj, created = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
 
@@ -577,33 +599,41 @@ def fetch_metadata(self, repo_name, task_pk=None):
 
 @shared_task(bind=True, name="github.restart_collection")
 def restart_collection(self, task_pk: str):
+    """
+    Restart a collection with the parameters it was started with, from its
+    cursor (period and page) or from the day after its last completed day.
+    """
     task_obj = Task.objects.get(pk=task_pk)
 
-    repo_name = task_obj.repository or ""
     collect_type = (task_obj.type or "").strip().lower()
+    # Tasks created before parameters were stored carry them in their type
+    legacy_extra = collect_type.rsplit("_", 1)[1] if "_" in collect_type else None
+    params = task_obj.params or {}
+    repo_name = params.get("repo_name") or task_obj.repository or ""
     end_date = task_obj.date_end
 
-    extra = None
-    if "_" in collect_type:
-        extra = collect_type.rsplit("_", 1)[1] or None
-
-    base = task_obj.date_last_update or getattr(task_obj, "date_init", None)
-    start_date = (base + timedelta(days=1)) if base else None
+    start_date = task_obj.resume_from()
     if isinstance(start_date, datetime) and dj_tz.is_naive(start_date):
         start_date = dj_tz.make_aware(start_date, dj_tz.get_current_timezone())
+    start_page = (task_obj.cursor or {}).get("page", 1)
 
     def _dispatch_issues():
-        depth = extra
-        return fetch_issues.apply_async(args=[repo_name, start_date, end_date, depth, task_pk]).id
+        depth = params.get("depth", legacy_extra)
+        return fetch_issues.apply_async(
+            args=[repo_name, start_date, end_date, depth, task_pk], kwargs={"start_page": start_page}
+        ).id
 
     def _dispatch_prs():
-        depth = extra
-        return fetch_pull_requests.apply_async(args=[repo_name, start_date, end_date, depth, task_pk]).id
+        depth = params.get("depth", legacy_extra)
+        return fetch_pull_requests.apply_async(
+            args=[repo_name, start_date, end_date, depth, task_pk], kwargs={"start_page": start_page}
+        ).id
 
     def _dispatch_commits():
-        commit_sha = None
-        if extra != 'commits':
-            commit_sha = extra
+        if task_obj.params is not None:
+            commit_sha = params.get("commit_sha")
+        else:
+            commit_sha = legacy_extra if legacy_extra != 'commits' else None
         return fetch_commits.apply_async(args=[repo_name, start_date, end_date, commit_sha, task_pk]).id
 
     def _dispatch_branches():
@@ -6,6 +6,7 @@
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from jobs.locks import dispatch_collection
 from jobs.models import Task
 from ..tasks import (
     fetch_commits,
@@ -20,6 +21,16 @@
 logger = logging.getLogger(__name__)
 
 
+def _accepted(task_id, coalesced):
+    """202 response of a collection request; a coalesced request returns the job already running it."""
+    return Response({
+        "task_id": task_id,
+        "coalesced": coalesced,
+        "message": "Identical collection already in progress" if coalesced else "Task successfully initiated",
+        "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task_id}/"
+    }, status=status.HTTP_202_ACCEPTED)
+
+
 class GitHubCommitViewSet(viewsets.ViewSet):
     @extend_schema(
         summary="Mine GitHub commits",
@@ -66,13 +77,9 @@ def create(self, request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        task = fetch_commits.apply_async(args=[repo_name, start_date, end_date, commit_sha])
+        task_id, coalesced = dispatch_collection(fetch_commits, args=[repo_name, start_date, end_date, commit_sha])
         
-        return Response({
-            "task_id": task.id,
-            "message": "Task successfully initiated",
-            "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task.id}/"
-        }, status=status.HTTP_202_ACCEPTED)
+        return _accepted(task_id, coalesced)
 
 
 class GitHubIssueViewSet(viewsets.ViewSet):
@@ -122,13 +129,9 @@ def create(self, request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        task = fetch_issues.apply_async(args=[repo_name, start_date, end_date, depth])
+        task_id, coalesced = dispatch_collection(fetch_issues, args=[repo_name, start_date, end_date, depth])
         
-        return Response({
-            "task_id": task.id,
-            "message": "Task successfully initiated",
-            "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task.id}/"
-        }, status=status.HTTP_202_ACCEPTED)
+        return _accepted(task_id, coalesced)
 
 
 class GitHubPullRequestViewSet(viewsets.ViewSet):
@@ -178,13 +181,9 @@ def create(self, request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        task = fetch_pull_requests.apply_async(args=[repo_name, start_date, end_date, depth])
+        task_id, coalesced = dispatch_collection(fetch_pull_requests, args=[repo_name, start_date, end_date, depth])
         
-        return Response({
-            "task_id": task.id,
-            "message": "Task successfully initiated",
-            "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task.id}/"
-        }, status=status.HTTP_202_ACCEPTED)
+        return _accepted(task_id, coalesced)
 
 
 class GitHubBranchViewSet(viewsets.ViewSet):
@@ -215,7 +214,7 @@ def create(self, request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        task = fetch_branches.apply_async(args=[repo_name])
+        task_id, coalesced = dispatch_collection(fetch_branches, args=[repo_name])
         
         # objects.create(
         #     task_id=task.id,
@@ -224,11 +223,7 @@ def create(self, request):
         #     status='PENDING'
         # )
 
-        return Response({
-            "task_id": task.id,
-            "message": "Task successfully initiated",
-            "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task.id}/"
-        }, status=status.HTTP_202_ACCEPTED)
+        return _accepted(task_id, coalesced)
 
 
 class GitHubMetadataViewSet(viewsets.ViewSet):
@@ -259,13 +254,9 @@ def create(self, request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        task = fetch_metadata.apply_async(args=[repo_name])
+        task_id, coalesced = dispatch_collection(fetch_metadata, args=[repo_name])
 
-        return Response({
-            "task_id": task.id,
-            "message": "Task successfully initiated",
-            "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task.id}/"
-        }, status=status.HTTP_202_ACCEPTED)
+        return _accepted(task_id, coalesced)
 
 
 class GitHubIssuePullRequestViewSet(viewsets.ViewSet):
@@ -305,16 +296,12 @@ def create(self, request):
             )
 
         if data_type == 'issue':
-            task = fetch_issues.apply_async(args=[repo_name, start_date, end_date, depth])
+            task_id, coalesced = dispatch_collection(fetch_issues, args=[repo_name, start_date, end_date, depth])
         else:
-            task = fetch_pull_requests.apply_async(args=[repo_name, start_date, end_date, depth])
+            task_id, coalesced = dispatch_collection(fetch_pull_requests, args=[repo_name, start_date, end_date, depth])
 
 
-        return Response({
-            "task_id": task.id,
-            "message": "Task successfully initiated",
-            "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task.id}/"
-        }, status=status.HTTP_202_ACCEPTED)
+        return _accepted(task_id, coalesced)
 
 
 class GitHubCommitByShaViewSet(viewsets.ViewSet):
@@ -347,13 +334,9 @@ def create(self, request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        task = fetch_commits.apply_async(args=[repo_name, None, None, commit_sha])
+        task_id, coalesced = dispatch_collection(fetch_commits, args=[repo_name, None, None, commit_sha])
 
-        return Response({
-            "task_id": task.id,
-            "message": "Task successfully initiated",
-            "status_endpoint": f"http://localhost:8000/api/jobs/tasks/{task.id}/"
-        }, status=status.HTTP_202_ACCEPTED)
+        return _accepted(task_id, coalesced)
 
 
 class GitHubCollectAllViewSet(viewsets.ViewSet):
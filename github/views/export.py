@@ -1,10 +1,6 @@
-import json
 import logging
-import csv
 from datetime import datetime, time, timezone
-
-from django.http import HttpResponse
-from django.utils.encoding import smart_str
+from types import SimpleNamespace
 
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
 from rest_framework import status
@@ -12,11 +8,13 @@
 from rest_framework.views import APIView
 
 from django_filters.rest_framework import DjangoFilterBackend  # use backend directly
-from django.db.models import Q
 
 from ..models import GitHubCommit, GitHubBranch, GitHubMetadata, GitHubIssuePullRequest
 from ..serializers import ExportDataSerializer
 from utils.lookup import get_filterset_fields as _get_filterset_fields, get_search_fields as _get_search_fields
+from utils.export import ExportError, ExportPlan, get_export_fields, streaming_export_response
+from jobs.tasks import queue_export
+from utils.search import apply_search
 
 logger = logging.getLogger(__name__)
 
@@ -44,21 +42,145 @@ def _date_field_for_model(model):
     return None
 
 
+def build_export(data, query_params):
+    """
+    Validate an export request and build its queryset.
+
+    Shared by ExportDataView and the asynchronous export job, which rebuilds the
+    queryset from the same body and querystring inside the worker.
+
+    Raises:
+        ExportError: invalid parameters, unknown table or nothing to export
+    """
+    serializer = ExportDataSerializer(data=data)
+    if not serializer.is_valid():
+        raise ExportError(serializer.errors)
+
+    table = serializer.validated_data['table']
+    ids = serializer.validated_data.get('ids', [])
+    format_type = serializer.validated_data['format']
+    data_type = serializer.validated_data.get('data_type')
+    selected_fields = serializer.validated_data.get('fields')
+
+    # Date filters coming from the body
+    body_date = serializer.validated_data.get('date')
+    body_start = serializer.validated_data.get('start_date')
+    body_end = serializer.validated_data.get('end_date')
+
+    model_mapping = {
+        'githubcommit': GitHubCommit,
+        'githubbranch': GitHubBranch,
+        'githubmetadata': GitHubMetadata,
+        'githubissuepullrequest': GitHubIssuePullRequest
+    }
+
+    if table not in model_mapping:
+        raise ExportError(f"Table '{table}' not found", status.HTTP_404_NOT_FOUND)
+
+    model = model_mapping[table]
+    queryset = model.objects.all()
+    repo = serializer.validated_data.get("repository")
+    state = serializer.validated_data.get("state")
+    creator = serializer.validated_data.get("creator")
+
+    # Filter for issues or pull requests
+    if model is GitHubIssuePullRequest and data_type:
+        queryset = queryset.filter(data_type=data_type)
+
+    # Filter by explicit IDs
+    if ids:
+        queryset = queryset.filter(id__in=ids)
+
+    if repo:
+        queryset = queryset.filter(repository_name__icontains=repo)
+    if state:
+        queryset = queryset.filter(state__iexact=state)
+    if creator:
+        queryset = queryset.filter(creator__icontains=creator)
+
+    # UI filters via querystring (DjangoFilterBackend)
+    filterset_fields = _get_filterset_fields(model)
+    if filterset_fields:
+        DummyView = type(
+            "DummyView",
+            (),
+            {
+                "filterset_fields": filterset_fields,
+                "get_queryset": lambda self: model.objects.all(),
+            },
+        )
+        backend = DjangoFilterBackend()
+        queryset = backend.filter_queryset(SimpleNamespace(query_params=query_params), queryset, DummyView())
+
+    # Search filter (compatible with FullTextSearchFilter)
+    ordering = query_params.get('ordering')
+    search_query = query_params.get('search')
+    if search_query:
+        queryset = apply_search(queryset, search_query, _get_search_fields(model), rank=not ordering)
+
+    # Ordering (compatible with OrderingFilter)
+    if ordering:
+        try:
+            queryset = queryset.order_by(*[seg.strip() for seg in ordering.split(",") if seg.strip()])
+        except Exception as e:
+            logger.warning(f"Ignoring invalid ordering '{ordering}': {e}")
+
+    # Date filter from body (single day or range)
+    date_field = _date_field_for_model(model)
+    if date_field:
+        if body_date:
+            start_dt, end_dt = _day_bounds_utc(body_date)
+            queryset = queryset.filter(**{f"{date_field}__gte": start_dt, f"{date_field}__lte": end_dt})
+        elif body_start or body_end:
+            if body_start:
+                queryset = queryset.filter(**{f"{date_field}__gte": body_start})
+            if body_end:
+                queryset = queryset.filter(**{f"{date_field}__lte": body_end})
+
+    if not queryset.exists():
+        raise ExportError("No data found to export", status.HTTP_404_NOT_FOUND)
+
+    # File name base
+    filename_parts = [table]
+    if model is GitHubIssuePullRequest and data_type:
+        filename_parts.append(data_type)
+    filename_base = f"{'_'.join(filename_parts)}_export"
+
+    export_fields = get_export_fields(model)
+    if selected_fields:
+        unknown = [f for f in selected_fields if f not in export_fields]
+        if unknown:
+            raise ExportError(f"Unknown fields: {', '.join(unknown)}")
+        export_fields = selected_fields
+
+    return ExportPlan(
+        queryset=queryset,
+        fields=export_fields,
+        format_type=format_type,
+        filename_base=filename_base,
+        run_async=serializer.validated_data['run_async'],
+    )
+
+
 class ExportDataView(APIView):
     @extend_schema(
         summary="Export GitHub data",
         tags=["GitHub"],
         description=(
             "Export data from GitHub tables.\n"
-            "- `format=json|csv`\n"
+            "- `format=json|ndjson|csv|parquet|arrow` (streamed, never buffered in memory). "
+            "Parquet and Arrow IPC files have typed columns and zstd compression.\n"
             "- Reuses filters from the UI via querystring (django-filters, search, ordering).\n"
             "- Also accepts filters in the BODY: `date` (single day) or `start_date`/`end_date` (range).\n"
             "- For `githubissuepullrequest`, allows `data_type=issue|pull_request`.\n"
-            "- Optional field `fields` to limit CSV columns."
+            "- Optional field `fields` to limit the exported columns.\n"
+            "- `run_async=true` writes a gzip file in the background and returns 202 with a task id; "
+            "progress and the download link are served by the jobs API."
         ),
         request=ExportDataSerializer,
         responses={
             200: OpenApiResponse(description="Exported data file"),
+            202: OpenApiResponse(description="Export job scheduled (run_async=true)"),
             400: OpenApiResponse(description="Invalid parameters"),
             404: OpenApiResponse(description="Table not found or no data found"),
             500: OpenApiResponse(description="Server error")
@@ -77,185 +199,22 @@ class ExportDataView(APIView):
         ]
     )
     def post(self, request):
-        serializer = ExportDataSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        table = serializer.validated_data['table']
-        ids = serializer.validated_data.get('ids', [])
-        format_type = serializer.validated_data['format']
-        data_type = serializer.validated_data.get('data_type')
-        selected_fields = serializer.validated_data.get('fields')
-
-        # Date filters coming from the body
-        body_date = serializer.validated_data.get('date')
-        body_start = serializer.validated_data.get('start_date')
-        body_end = serializer.validated_data.get('end_date')
-
-        model_mapping = {
-            'githubcommit': GitHubCommit,
-            'githubbranch': GitHubBranch,
-            'githubmetadata': GitHubMetadata,
-            'githubissuepullrequest': GitHubIssuePullRequest
-        }
-
-        if table not in model_mapping:
-            return Response(
-                {"error": f"Table '{table}' not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        try:
+            plan = build_export(request.data, request.query_params)
+        except ExportError as e:
+            return Response(e.payload, status=e.status_code)
 
-        model = model_mapping[table]
-        queryset = model.objects.all()
-        repo = serializer.validated_data.get("repository")
-        state = serializer.validated_data.get("state")
-        creator = serializer.validated_data.get("creator")
-
-        # Filter for issues or pull requests
-        if model is GitHubIssuePullRequest and data_type:
-            queryset = queryset.filter(data_type=data_type)
-
-        # Filter by explicit IDs
-        if ids:
-            queryset = queryset.filter(id__in=ids)
-
-        if repo:
-            queryset = queryset.filter(repository_name__icontains=repo)
-        if state:
-            queryset = queryset.filter(state__iexact=state)
-        if creator:
-            queryset = queryset.filter(creator__icontains=creator)
-
-        # UI filters via querystring (DjangoFilterBackend)
-        filterset_fields = _get_filterset_fields(model)
-        if filterset_fields:
-            DummyView = type(
-                "DummyView",
-                (),
-                {
-                    "filterset_fields": filterset_fields,
-                    "get_queryset": lambda self: model.objects.all(),
-                },
-            )
-            backend = DjangoFilterBackend()
-            queryset = backend.filter_queryset(request, queryset, DummyView())
-
-        # Search filter (compatible with SearchFilter)
-        search_query = request.query_params.get('search')
-        if search_query:
-            search_fields = _get_search_fields(model) or []
-            if search_fields:
-                q = Q()
-                for fld in search_fields:
-                    if "__" in fld:
-                        q |= Q(**{fld: search_query})
-                    else:
-                        q |= Q(**{f"{fld}__icontains": search_query})
-                queryset = queryset.filter(q)
-
-        # Ordering (compatible with OrderingFilter)
-        ordering = request.query_params.get('ordering')
-        if ordering:
-            try:
-                queryset = queryset.order_by(*[seg.strip() for seg in ordering.split(",") if seg.strip()])
-            except Exception as e:
-                logger.warning(f"Ignoring invalid ordering '{ordering}': {e}")
-
-        # Date filter from body (single day or range)
-        date_field = _date_field_for_model(model)
-        if date_field:
-            if body_date:
-                start_dt, end_dt = _day_bounds_utc(body_date)
-                queryset = queryset.filter(**{f"{date_field}__gte": start_dt, f"{date_field}__lte": end_dt})
-            elif body_start or body_end:
-                if body_start:
-                    queryset = queryset.filter(**{f"{date_field}__gte": body_start})
-                if body_end:
-                    queryset = queryset.filter(**{f"{date_field}__lte": body_end})
-
-        if not queryset.exists():
+        if plan.run_async:
             return Response(
-                {"error": "No data found to export"},
-                status=status.HTTP_404_NOT_FOUND
+                queue_export(request, "github.views.export.build_export", "GitHub"),
+                status=status.HTTP_202_ACCEPTED
             )
 
-        # File name base
-        filename_parts = [table]
-        if model is GitHubIssuePullRequest and data_type:
-            filename_parts.append(data_type)
-        filename_base = f"{'_'.join(filename_parts)}_export"
-
-        # JSON export
-        if format_type == 'json':
-            data = []
-            for obj in queryset:
-                obj_dict = {}
-                for field in obj._meta.fields:
-                    value = getattr(obj, field.name)
-                    if hasattr(value, 'id'):
-                        obj_dict[field.name] = value.id
-                    else:
-                        obj_dict[field.name] = value
-                data.append(obj_dict)
-
-            try:
-                response = HttpResponse(
-                    json.dumps(data, default=str, indent=2),
-                    content_type='application/json'
-                )
-                response['Content-Disposition'] = f'attachment; filename="{filename_base}.json"'
-                response['Access-Control-Expose-Headers'] = 'Content-Disposition'
-                return response
-            except Exception as e:
-                logger.error(f"Error exporting data (json): {str(e)}")
-                return Response(
-                    {"error": f"Error exporting data: {str(e)}"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # CSV export
-        if not selected_fields:
-            selected_fields = [f.name for f in model._meta.fields]
-
-        def row_iter():
-            # Header
-            yield [smart_str(col) for col in selected_fields]
-            # Rows
-            for obj in queryset.iterator(chunk_size=5000):
-                row = []
-                for col in selected_fields:
-                    val = getattr(obj, col, "")
-                    if hasattr(val, "id"):
-                        val = val.id
-                    if val is None:
-                        val = ""
-                    elif hasattr(val, "isoformat"):
-                        val = val.isoformat()
-                    elif isinstance(val, bool):
-                        val = "true" if val else "false"
-                    elif isinstance(val, (list, tuple, set)):
-                        val = ", ".join(map(str, val))
-                    row.append(smart_str(val))
-                yield row
-
-        class Echo:
-            def write(self, v):
-                return v
-
+        # Rows are streamed straight from a server-side cursor (values_list), for every format
         try:
-            pseudo_buffer = Echo()
-            writer = csv.writer(pseudo_buffer)
-
-            def stream():
-                for r in row_iter():
-                    yield writer.writerow(r)
-
-            response = HttpResponse(stream(), content_type="text/csv; charset=utf-8")
-            response['Content-Disposition'] = f'attachment; filename="{filename_base}.csv"'
-            response['Access-Control-Expose-Headers'] = 'Content-Disposition'
-            return response
+            return streaming_export_response(plan.queryset, plan.fields, plan.format_type, plan.filename_base)
         except Exception as e:
-            logger.error(f"Error exporting data (csv): {str(e)}")
+            logger.error(f"Error exporting data ({plan.format_type}): {str(e)}")
             return Response(
                 {"error": f"Error exporting data: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
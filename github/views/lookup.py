@@ -1,12 +1,13 @@
 import logging
 
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
 
-from ..models import GitHubCommit, GitHubBranch, GitHubMetadata, GitHubIssuePullRequest, GitHubAuthor
+from ..models import GitHubCommit, GitHubBranch, GitHubMetadata, GitHubIssuePullRequest, GitHubAuthor, GitHubModifiedFile
 from ..serializers import (
     GitHubCommitSerializer,
     GitHubBranchSerializer,
@@ -15,6 +16,8 @@
     GitHubAuthorSerializer
 )
 from utils.lookup import get_filterset_fields as _get_filterset_fields, get_search_fields as _get_search_fields
+from utils.search import FullTextSearchFilter
+from utils.expand import ExpandableViewMixin, expand_parameter, fields_parameter
 
 logger = logging.getLogger(__name__)
 
@@ -25,29 +28,59 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 1000
 
 
-@extend_schema(tags=["GitHub"], summary="List all GitHub commits")
-class CommitListView(generics.ListAPIView):
-    queryset = GitHubCommit.objects.all()
+class CommitQuerysetMixin(ExpandableViewMixin):
+    """
+    Prefetch plan for GitHubCommitSerializer.
+
+    Authors are joined, modified files are fetched in one query (without the
+    `diff` column unless expanded) and their methods only with ?expand=methods.
+    """
+
+    def get_queryset(self):
+        queryset = GitHubCommit.objects.select_related('author', 'committer')
+        if not self.wants_field('modified_files'):
+            return queryset
+
+        expand = self.get_expand()
+        files = GitHubModifiedFile.objects.all()
+        if 'diff' not in expand:
+            files = files.defer('diff')
+        lookups = [Prefetch('modified_files', queryset=files)]
+        if 'methods' in expand:
+            lookups.append('modified_files__methods')
+        return queryset.prefetch_related(*lookups)
+
+
+@extend_schema(
+    tags=["GitHub"],
+    summary="List all GitHub commits",
+    parameters=[fields_parameter(), expand_parameter('diff', 'methods')],
+)
+class CommitListView(CommitQuerysetMixin, generics.ListAPIView):
     serializer_class = GitHubCommitSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(GitHubCommit)
     search_fields = _get_search_fields(GitHubCommit)
     ordering_fields = '__all__'
     pagination_class = StandardResultsSetPagination
 
 
-@extend_schema(tags=["GitHub"], summary="Retrieve a specific GitHub commit")
-class CommitDetailView(generics.RetrieveAPIView):
-    queryset = GitHubCommit.objects.all()
+@extend_schema(
+    tags=["GitHub"],
+    summary="Retrieve a specific GitHub commit",
+    parameters=[fields_parameter(), expand_parameter('diff', 'methods')],
+)
+class CommitDetailView(CommitQuerysetMixin, generics.RetrieveAPIView):
     serializer_class = GitHubCommitSerializer
     lookup_field = 'sha'
+    default_expand = ('methods',)
 
 
 @extend_schema(tags=["GitHub"], summary="List all GitHub issues")
 class IssueListView(generics.ListAPIView):
     queryset = GitHubIssuePullRequest.objects.filter(data_type='issue')
     serializer_class = GitHubIssuePullRequestSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(GitHubIssuePullRequest)
     search_fields = _get_search_fields(GitHubIssuePullRequest)
     ordering_fields = '__all__'
@@ -65,7 +98,7 @@ class IssueDetailView(generics.RetrieveAPIView):
 class PullRequestListView(generics.ListAPIView):
     queryset = GitHubIssuePullRequest.objects.filter(data_type='pull_request')
     serializer_class = GitHubIssuePullRequestSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(GitHubIssuePullRequest)
     search_fields = _get_search_fields(GitHubIssuePullRequest)
     ordering_fields = '__all__'
@@ -83,7 +116,7 @@ class PullRequestDetailView(generics.RetrieveAPIView):
 class BranchListView(generics.ListAPIView):
     queryset = GitHubBranch.objects.all()
     serializer_class = GitHubBranchSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(GitHubBranch)
     search_fields = _get_search_fields(GitHubBranch)
     pagination_class = StandardResultsSetPagination
@@ -101,7 +134,7 @@ class BranchDetailView(generics.RetrieveAPIView):
 class MetadataListView(generics.ListAPIView):
     queryset = GitHubMetadata.objects.all()
     serializer_class = GitHubMetadataSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(GitHubMetadata)
     search_fields = _get_search_fields(GitHubMetadata)
     ordering_fields = '__all__'
@@ -111,7 +144,7 @@ class MetadataListView(generics.ListAPIView):
 class IssuePullRequestListView(generics.ListAPIView):
     queryset = GitHubIssuePullRequest.objects.all()
     serializer_class = GitHubIssuePullRequestSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(GitHubIssuePullRequest)
     search_fields = _get_search_fields(GitHubIssuePullRequest)
     ordering_fields = _get_filterset_fields(GitHubIssuePullRequest)
@@ -127,7 +160,7 @@ class IssuePullRequestDetailView(generics.RetrieveAPIView):
 class UserListView(generics.ListAPIView):
     queryset = GitHubAuthor.objects.all()
     serializer_class = GitHubAuthorSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(GitHubAuthor)
     search_fields = _get_search_fields(GitHubAuthor)
     ordering_fields = "__all__"
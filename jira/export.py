@@ -1,28 +1,132 @@
-import json
-import csv
 import logging
-from io import StringIO
 
-from django.http import HttpResponse
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from jira.models import JiraIssue
+from django.db.models import F
+
+from jira.models import (
+    JiraIssue,
+    JiraProject,
+    JiraUser,
+    JiraComment,
+    JiraHistory,
+    JiraHistoryItem,
+    JiraActivityLog,
+    JiraChecklist,
+    JiraSprint,
+    JiraCommit,
+    JiraIssueType
+)
+from jobs.tasks import queue_export
+from utils.export import ExportError, ExportPlan, get_export_fields, streaming_export_response
 from .serializers import ExportDataSerializer
 
 logger = logging.getLogger(__name__)
 
+# Exportable tables: model and lookup path from a row to its JiraIssue
+# (None for tables not tied to an issue)
+EXPORT_TABLES = {
+    'jiraissue': (JiraIssue, ''),
+    'jiraissuetype': (JiraIssueType, 'issue__'),
+    'jiracomment': (JiraComment, 'issue__'),
+    'jirahistory': (JiraHistory, 'issue__'),
+    'jirahistoryitem': (JiraHistoryItem, 'history__issue__'),
+    'jiraactivitylog': (JiraActivityLog, 'issue__'),
+    'jirachecklist': (JiraChecklist, 'issue__'),
+    'jiracommit': (JiraCommit, 'issue__'),
+    'jirasprint': (JiraSprint, 'issues__'),
+    'jiraproject': (JiraProject, None),
+    'jirauser': (JiraUser, None),
+}
+
+# Columns joined from related tables, exported after the table's own columns
+JOINED_COLUMNS = {
+    'jiraissue': {'issuetype': 'jiraissuetype__issuetype'},
+    'jirahistoryitem': {'issue': 'history__issue', 'created': 'history__created'},
+}
+
+
+def build_export(data, query_params=None):
+    """
+    Validate an export request and build its queryset (also used by the async export job).
+
+    `issue_type` and `project_key` filter every issue-related table through its
+    issue; joined columns (e.g. the issue type of an issue) are read in the same query.
+    """
+    serializer = ExportDataSerializer(data=data)
+    if not serializer.is_valid():
+        raise ExportError(serializer.errors)
+
+    validated = serializer.validated_data
+    table = validated['table']
+    ids = validated.get('ids', [])
+    format_type = validated['format']
+    issue_type = validated.get('issue_type')
+    project_key = validated.get('project_key')
+
+    if table not in EXPORT_TABLES:
+        raise ExportError(f"Table '{table}' not found", status.HTTP_404_NOT_FOUND)
+
+    model, issue_path = EXPORT_TABLES[table]
+    if issue_path is None and issue_type:
+        raise ExportError(f"'issue_type' cannot be used with table '{table}'")
+
+    joined = JOINED_COLUMNS.get(table, {})
+    queryset = model.objects.annotate(**{name: F(path) for name, path in joined.items()})
+
+    if issue_type:
+        queryset = queryset.filter(**{f"{issue_path}jiraissuetype__issuetype": issue_type})
+    if project_key:
+        if model is JiraProject:
+            queryset = queryset.filter(key=project_key)
+        elif issue_path is not None:
+            queryset = queryset.filter(**{f"{issue_path}project__key": project_key})
+        else:
+            raise ExportError(f"'project_key' cannot be used with table '{table}'")
+    if ids:
+        queryset = queryset.filter(pk__in=ids)
+    if issue_path == 'issues__' and (issue_type or project_key):
+        # A sprint matches once per issue
+        queryset = queryset.distinct()
+
+    if not queryset.exists():
+        raise ExportError("No data found to export", status.HTTP_404_NOT_FOUND)
+
+    filename_parts = [table]
+    if project_key:
+        filename_parts.append(project_key.lower())
+    if issue_type:
+        filename_parts.append(issue_type.lower())
+    filename_base = f"{'_'.join(filename_parts)}_export"
+
+    return ExportPlan(
+        queryset=queryset,
+        fields=get_export_fields(model) + list(joined),
+        format_type=format_type,
+        filename_base=filename_base,
+        run_async=validated['run_async'],
+        compress=validated['compress'],
+    )
+
 
 class ExportDataView(APIView):
     @extend_schema(
         summary="Export Jira data",
         tags=["Jira"],
-        description="Export data from Jira tables. You can filter by issue_type.",
+        description=(
+            "Export data from Jira tables (issues with their issue type, comments, histories, history items, "
+            "activity logs, checklists, commits, sprints, projects and users), streamed from the database. "
+            "Issue-related tables can be filtered by issue_type and project_key. "
+            "`compress=true` gzips text formats on the fly; "
+            "`run_async=true` writes a gzip file in the background and returns 202 with a task id."
+        ),
         request=ExportDataSerializer,
         responses={
             200: OpenApiResponse(description="Exported data file"),
+            202: OpenApiResponse(description="Export job scheduled (run_async=true)"),
             400: OpenApiResponse(description="Invalid parameters"),
             404: OpenApiResponse(description="Table not found or no data found"),
             500: OpenApiResponse(description="Server error")
@@ -37,71 +141,27 @@ class ExportDataView(APIView):
                 "Export only bugs",
                 value={"table": "jiraissue", "issue_type": "Bug", "format": "csv"},
                 summary="Export only bugs from jiraissue table"
+            ),
+            OpenApiExample(
+                "Export a project's comments, gzipped",
+                value={"table": "jiracomment", "project_key": "PROJ", "format": "ndjson", "compress": True},
+                summary="Stream the comments of one project as gzipped NDJSON"
             )
         ]
     )
     def post(self, request):
-        serializer = ExportDataSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        validated = serializer.validated_data
-        table = validated['table']
-        ids = validated.get('ids', [])
-        format_type = validated['format']
-        issue_type = validated.get('issue_type')
-
-        model_mapping = {
-            'jiraissue': JiraIssue,
-        }
-
-        if table not in model_mapping:
-            return Response({"error": f"Table '{table}' not found"}, status=status.HTTP_404_NOT_FOUND)
-
-        model = model_mapping[table]
-        queryset = model.objects.all()
-
-        if issue_type:
-            queryset = queryset.filter(issue_type=issue_type)
-        if ids:
-            queryset = queryset.filter(id__in=ids)
-
-        data = []
-        for obj in queryset:
-            obj_dict = {
-                field.name: getattr(obj, field.name).id if hasattr(getattr(obj, field.name), 'id') else getattr(obj, field.name)
-                for field in obj._meta.fields
-            }
-            data.append(obj_dict)
-
-        if not data:
-            return Response({"error": "No data found to export"}, status=status.HTTP_404_NOT_FOUND)
-
-        filename_parts = [table]
-        if issue_type:
-            filename_parts.append(issue_type.lower())
-        extension = 'csv' if format_type == 'csv' else 'json'
-        filename = f"{'_'.join(filename_parts)}_export.{extension}"
-
         try:
-            if format_type == 'csv':
-                buffer = StringIO()
-                writer = csv.DictWriter(buffer, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
-                buffer.seek(0)
-
-                response = HttpResponse(buffer.getvalue(), content_type='text/csv; charset=utf-8-sig')
-            else:
-                response = HttpResponse(
-                    json.dumps(data, default=str, indent=2),
-                    content_type='application/json'
-                )
-
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            response['Access-Control-Expose-Headers'] = 'Content-Disposition'
-            return response
+            plan = build_export(request.data)
+        except ExportError as e:
+            return Response(e.payload, status=e.status_code)
+
+        if plan.run_async:
+            return Response(queue_export(request, "jira.export.build_export", "Jira"), status=status.HTTP_202_ACCEPTED)
 
+        try:
+            return streaming_export_response(
+                plan.queryset, plan.fields, plan.format_type, plan.filename_base, compress=plan.compress
+            )
         except Exception as e:
             logger.error(f"Error exporting data: {str(e)}", exc_info=True)
             return Response(
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.8 on 2026-10-19 04:33
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jiraissue',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('summary', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='jiraissue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jira_issue_search_gin'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.8 on 2026-10-19 04:48
+
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+NATURAL_KEYS = (
+    ('JiraActivityLog', ('issue', 'created', 'description')),
+    ('JiraChecklist', ('issue',)),
+    ('JiraHistoryItem', ('history', 'field')),
+)
+
+
+def remove_duplicates(apps, schema_editor):
+    """Keep the most recent row of each natural key before adding the constraints."""
+    for model_name, fields in NATURAL_KEYS:
+        model = apps.get_model('jira', model_name)
+        duplicates = (
+            model.objects.values(*fields)
+            .annotate(keep_id=Max('id'), rows=Count('id'))
+            .filter(rows__gt=1)
+        )
+        for row in duplicates.iterator():
+            keep_id = row.pop('keep_id')
+            row.pop('rows')
+            model.objects.filter(**row).exclude(id=keep_id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira', '0002_jiraissue_search_vector_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+    ]
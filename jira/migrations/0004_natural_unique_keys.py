@@ -0,0 +1,25 @@
+# Generated by Django 5.1.8 on 2026-10-19 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira', '0003_remove_duplicate_rows'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='jiraactivitylog',
+            constraint=models.UniqueConstraint(fields=('issue', 'created', 'description'), name='jira_activity_unique_entry'),
+        ),
+        migrations.AddConstraint(
+            model_name='jirachecklist',
+            constraint=models.UniqueConstraint(fields=('issue',), name='jira_checklist_unique_issue'),
+        ),
+        migrations.AddConstraint(
+            model_name='jirahistoryitem',
+            constraint=models.UniqueConstraint(fields=('history', 'field'), name='jira_historyitem_unique_field'),
+        ),
+    ]
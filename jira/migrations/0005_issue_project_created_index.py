@@ -0,0 +1,17 @@
+# Generated by Django 5.1.8 on 2026-10-19 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira', '0004_natural_unique_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jiraissue',
+            index=models.Index(fields=['project', 'created'], name='jira_issue_project_created'),
+        ),
+    ]
@@ -1,30 +1,39 @@
 import os
-import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from urllib.parse import quote
+from zoneinfo import ZoneInfo
 
 import requests
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
 
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Max
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
-from .models import (
-    JiraIssue,
-    JiraProject,
-    JiraUser,
-    JiraComment,
-    JiraHistory,
-    JiraHistoryItem,
-    JiraActivityLog,
-    JiraChecklist,
-    JiraSprint,
-    JiraCommit,
-    JiraIssueType
+from .models import JiraHistory, JiraIssue
+from .writer import JiraPageWriter
+
+from jira.utils import (
+    update_task_progress_date,
+    get_domain_throttle,
+    retry_after_seconds,
+    cache_get,
+    cache_set,
+    field_cache_key,
+    token_cache_key,
 )
 
-from jira.utils import update_task_progress_date, split_date_range
+# Entries per call of the paginated /issue/{key}/changelog endpoint (Jira maximum)
+CHANGELOG_PAGE_SIZE = 100
+
+# Incremental syncs re-read this much before the stored watermark, since JQL
+# dates have minute precision
+INCREMENTAL_SYNC_OVERLAP = timedelta(minutes=5)
+
 
 class JiraMiner:
     class NoValidJiraTokenError(Exception):
@@ -42,6 +51,10 @@ def __init__(self, jira_domain, task_obj=None):
         self.tokens = [token.strip() for token in os.getenv("JIRA_API_TOKEN", "").split(",") if token.strip()]
         self.jira_email = os.getenv("JIRA_EMAIL")
         self.current_token_index = 0
+        # Time zone of the token's user; Jira evaluates JQL dates in it
+        self.user_timezone = None
+        # Users already written during this run (skipped by later pages)
+        self.known_users = set()
 
         if not self.tokens or not self.jira_email:
             raise Exception("JIRA_API_TOKEN and JIRA_EMAIL must be correctly configured in .env")
@@ -75,11 +88,25 @@ def switch_token(self):
 
 
     def verify_token(self):
+        """
+        Find a working token, starting from the current one.
+
+        A token validated by /myself is remembered per domain for
+        JIRA_TOKEN_CACHE_TTL seconds, so later miners skip the call.
+        """
         for _ in range(len(self.tokens)):
+            key = token_cache_key(self.jira_domain, self.jira_email, self.tokens[self.current_token_index])
+            cached = cache_get(key)
+            if cached is not None:
+                self.user_timezone = cached.get("timeZone")
+                return
+
             try:
                 url = f"https://{self.jira_domain}/rest/api/3/myself"
-                response = requests.get(url, headers=self.headers, auth=self.auth)
+                response = self._get(url)
                 if response.status_code == 200:
+                    self.user_timezone = response.json().get("timeZone")
+                    cache_set(key, {"timeZone": self.user_timezone}, settings.JIRA_TOKEN_CACHE_TTL)
                     print(f"Token {self.current_token_index + 1} is valid")
                     return
                 else:
@@ -96,30 +123,54 @@ def verify_token(self):
         raise self.NoValidJiraTokenError("❌ No valid Jira token found.")
 
 
-    def handle_rate_limit(self, response):
-        if response.status_code == 429 or "rate limit" in response.text.lower():
-            self.log_progress(" Rate limit reached. Trying next token...")
-
-            original_index = self.current_token_index
+    def _send(self, method, url, **kwargs):
+        """
+        Send a request through the per-domain throttle.
 
-            for _ in range(len(self.tokens)):
+        On 429 the next token is tried first; once every token has been
+        rate limited, all threads mining this domain wait for Retry-After.
+        """
+        throttle = get_domain_throttle(self.jira_domain, settings.JIRA_DOMAIN_CONCURRENCY)
+        attempts = 0
+        while True:
+            with throttle:
+                response = getattr(requests, method)(url, headers=self.headers, auth=self.auth, **kwargs)
+            if response.status_code != 429:
+                return response
+
+            attempts += 1
+            if attempts > settings.JIRA_MAX_RATE_LIMIT_RETRIES:
+                return response
+            if attempts < len(self.tokens):
                 self.switch_token()
-                retry = requests.get(response.request.url, headers=self.headers, auth=self.auth)
-                if retry.status_code != 429:
-                    self.log_progress("New Token worked after rate limit.")
+                continue
+
+            wait = retry_after_seconds(response)
+            self.log_progress(f" Rate limit reached. Waiting {wait:.0f}s before retrying...")
+            throttle.back_off(wait)
 
-                    return True
 
-            # If no token worked, wait for 60 seconds
-            self.log_progress("All tokens failed after rate limit. Waiting for 60 seconds before retrying...")
+    def _get(self, url, **kwargs):
+        return self._send("get", url, **kwargs)
 
-            time.sleep(60)
-            return True
 
-        return False
+    def _post(self, url, **kwargs):
+        return self._send("post", url, **kwargs)
 
 
-    def collect_jira_issues(self, project_key, issuetypes, start_date=None, end_date=None):
+    def collect_jira_issues(self, project_key, issuetypes, start_date=None, end_date=None,
+                            incremental=False, updated_since=None):
+        """
+        Collect the issues of a project into the database.
+
+        Args:
+            project_key (str): Jira project key
+            issuetypes (list): Issue type names to collect (all when empty)
+            start_date, end_date: Optional `created` range
+            incremental (bool): Only collect issues updated since the last sync
+                (the newest stored `updated` of the project, unless updated_since is given)
+            updated_since: Explicit lower bound on `updated` (datetime or date string)
+        """
         custom_fields_mapping = self.get_custom_fields_mapping()
         self.log_progress(f" Colecting project issues {project_key}...")
 
@@ -138,208 +189,258 @@ def collect_jira_issues(self, project_key, issuetypes, start_date=None, end_date
             issuetypes_jql = " OR ".join([f'issuetype="{issuetype}"' for issuetype in issuetypes])
             base_jql += f' AND ({issuetypes_jql})'
 
-        # Helper to run a single JQL (paged) and return collected count
-        def run_paged_collection(jql_where: str, total_hint: int | None = None) -> int:
-            collected = 0
-            next_page_token = None
+        if incremental and updated_since is None:
+            updated_since = self.get_last_sync(project_key)
+        if updated_since:
+            updated_since = self.parse_sync_datetime(updated_since)
+            base_jql += f' AND updated >= "{self.format_jql_datetime(updated_since)}"'
+            self.log_progress(f"Incremental sync: issues updated since {updated_since.isoformat()}")
+            # A restart must replay the same window, not one derived from the rows this run writes
+            if self.task_obj and self.task_obj.params is not None:
+                self.task_obj.params = {**self.task_obj.params, "updated_since": updated_since.isoformat()}
+                self.task_obj.save(update_fields=["params"])
+
+        # One stream over the whole range, oldest first: pages advance through
+        # `created`, so every day before the current page's last day is complete.
+        jql_where = ""
+        start_bound = self.jql_date_bound(start_date)
+        end_bound = self.jql_date_bound(end_date, end_of_day=True)
+        if start_bound:
+            jql_where += f' AND created >= "{start_bound}"'
+        if end_bound:
+            jql_where += f' AND created <= "{end_bound}"'
+        jql_query = f"{base_jql}{jql_where} ORDER BY created ASC"
+
+        total_hint = None
+        self.log_progress("Checking the approximate total of issues to be mined...")
+        try:
+            count_url = f"https://{self.jira_domain}/rest/api/3/search/approximate-count"
+            count_resp = self._post(count_url, json={"jql": f"{base_jql}{jql_where}"})
+            if count_resp.status_code == 200:
+                total_hint = count_resp.json().get("count", 0)
+                self.log_progress(f"Approximately {total_hint} issues found.")
+            else:
+                self.log_progress(f"It was not possible to obtain the approximate count: {count_resp.text}")
+        except Exception as e:
+            self.log_progress(f"Error querying approximate-count: {e}")
+
+        self.log_progress("Starting collection via new API /search/jql...")
+
+        collected = 0
+        pages = 0
+        next_page_token = None
+        checkpoint = None
+        completed = True
+
+        while True:
+            payload = {
+                "jql": jql_query,
+                "maxResults": 100,
+            }
+            if next_page_token:
+                payload["nextPageToken"] = next_page_token
+
+            search_url = f"https://{self.jira_domain}/rest/api/3/search/jql"
+            resp = self._post(search_url, json=payload)
 
-            jql_query = f"{base_jql} {jql_where}".strip()
-            self.log_progress("Checking the approximate total of issues to be mined...")
+            if resp.status_code != 200:
+                self.log_progress(f"❌ Error fetching issues: {resp.status_code} - {resp.text}")
+                completed = False
+                break
 
-            try:
-                count_url = f"https://{self.jira_domain}/rest/api/3/search/approximate-count"
-                count_payload = {"jql": jql_query}
-                count_resp = requests.post(count_url, headers=self.headers, auth=self.auth, json=count_payload)
-                if count_resp.status_code == 200:
-                    total_hint = count_resp.json().get("count", 0)
-                    self.log_progress(f"Approximately {total_hint} issues found.")
-                else:
-                    self.log_progress(f"It was not possible to obtain the approximate count: {count_resp.text}")
-            except Exception as e:
-                self.log_progress(f"Error querying approximate-count: {e}")
+            data = resp.json()
+            issues_meta = data.get("issues", [])
+            next_page_token = data.get("nextPageToken")
 
-            self.log_progress("Starting collection via new API /search/jql...")
+            if not issues_meta:
+                break
 
-            while True:
-                payload = {
-                    "jql": jql_query,
-                    "maxResults": 100,
-                }
-                if next_page_token:
-                    payload["nextPageToken"] = next_page_token
-
-                search_url = f"https://{self.jira_domain}/rest/api/3/search/jql"
-                resp = requests.post(search_url, headers=self.headers, auth=self.auth, json=payload)
-
-                if resp.status_code != 200:
-                    self.log_progress(f"❌ Error fetching issues: {resp.status_code} - {resp.text}")
-                    break
+            issue_ids = [i["id"] for i in issues_meta if "id" in i]
 
-                data = resp.json()
-                issues_meta = data.get("issues", [])
-                next_page_token = data.get("nextPageToken")
+            # One call returns fields (including comments) and the changelog for up to
+            # 100 issues; history, activity and checklist are derived from this payload.
+            bulk_url = f"https://{self.jira_domain}/rest/api/3/issue/bulkfetch"
+            bulk_payload = {"issueIdsOrKeys": issue_ids, "fields": ["*all"], "expand": ["changelog"]}
+            bulk_resp = self._post(bulk_url, json=bulk_payload)
 
-                if not issues_meta:
-                    break
+            if bulk_resp.status_code != 200:
+                self.log_progress(f"Error when fetching issue details: {bulk_resp.status_code} - {bulk_resp.text}")
+                completed = False
+                break
 
-                issue_ids = [i["id"] for i in issues_meta if "id" in i]
+            bulk_data = bulk_resp.json()
+            issues = bulk_data.get("issues", [])
 
-                bulk_url = f"https://{self.jira_domain}/rest/api/3/issue/bulkfetch"
-                bulk_payload = {"issueIdsOrKeys": issue_ids, "fields": ["*all"]}
-                bulk_resp = requests.post(bulk_url, headers=self.headers, auth=self.auth, json=bulk_payload)
+            # Remote lookups (dev-status commits, truncated comments/changelog) for the
+            # whole page run concurrently; rows are then written here, one thread.
+            enriched = self.enrich_issues(issues, self.get_known_history(issues))
+            writer = JiraPageWriter(known_users=self.known_users)
+            hint = total_hint if total_hint is not None else "?"
 
-                if bulk_resp.status_code != 200:
-                    self.log_progress(f"Error when fetching issue details: {bulk_resp.status_code} - {bulk_resp.text}")
-                    break
+            for index, issue_data in enumerate(issues):
+                issue_count = collected + index + 1
 
-                bulk_data = bulk_resp.json()
-                issues = bulk_data.get("issues", [])
-
-                for index, issue_data in enumerate(issues):
-                    issue_count = collected + index + 1
-
-                    fields = issue_data.get("fields")
-                    if not isinstance(fields, dict):
-                        self.log_progress(
-                            f"Issue without 'fields' (skipping): {issue_data.get('key', issue_data.get('id', 'unknown'))}"
-                        )
-                        continue
-
-                    issue_id = issue_data["id"]
-                    issue_key = issue_data["key"]
-                    current_timestamp = timezone.now()
-                    description = self.extract_words_from_description(fields.get("description"))
-
-                    if sprint_field_key:
-                        fields["sprint"] = fields.get(sprint_field_key)
-
-                    project_obj, _ = JiraProject.objects.get_or_create(
-                        id=fields['project']['id'],
-                        defaults={
-                            'key': fields['project']['key'],
-                            'name': fields['project']['name'],
-                            'simplified': fields['project'].get('simplified', False),
-                            'projectTypeKey': fields['project']['projectTypeKey']
-                        }
+                fields = issue_data.get("fields")
+                if not isinstance(fields, dict):
+                    self.log_progress(
+                        f"Issue without 'fields' (skipping): {issue_data.get('key', issue_data.get('id', 'unknown'))}"
                     )
+                    continue
 
-                    creator_obj = self.ensure_user(fields["creator"])
-                    assignee_obj = self.ensure_user(fields.get("assignee"))
-                    reporter_obj = self.ensure_user(fields.get("reporter"))
-
-                    parent_issue_id = fields.get('parent', {}).get('id')
-                    parent_issue_obj = None
-                    if parent_issue_id:
-                        parent_issue_obj = JiraIssue.objects.filter(issue_id=parent_issue_id).first()
-
-                    issue_obj, _ = JiraIssue.objects.update_or_create(
-                        issue_id=issue_id,
-                        defaults={
-                            "issue_key": issue_key,
-                            "project": project_obj,
-                            "created": parse_datetime(fields["created"]),
-                            "updated": parse_datetime(fields["updated"]),
-                            "status": fields["status"]["name"],
-                            "priority": fields["priority"]["name"] if fields.get("priority") else None,
-                            "assignee": assignee_obj,
-                            "creator": creator_obj,
-                            "reporter": reporter_obj,
-                            "summary": fields["summary"],
-                            "description": description,
-                            "duedate": parse_datetime(fields["duedate"]) if fields.get("duedate") else None,
-                            "timeoriginalestimate": fields.get("timeoriginalestimate"),
-                            "timeestimate": fields.get("timeestimate"),
-                            "timespent": fields.get("timespent"),
-                            "time_mined": current_timestamp,
-                            "parent_issue": parent_issue_obj
-                        }
-                    )
+                if sprint_field_key:
+                    fields["sprint"] = fields.get(sprint_field_key)
 
-                    JiraIssueType.objects.update_or_create(
-                        issue=issue_obj,
-                        defaults={
-                            'issuetype': fields['issuetype']['name'],
-                            'issuetype_description': fields['issuetype'].get('description', ''),
-                            'hierarchyLevel': fields['issuetype'].get('hierarchyLevel', 0),
-                            'subtask': fields['issuetype'].get('subtask', False)
-                        }
-                    )
+                extras = dict(enriched.get(issue_data["id"], {}))
+                extras["activities"] = self.get_activity_log(issue_data["key"], history=extras.get("history", []))
+                writer.add_issue(issue_data, self.extract_words_from_description(fields.get("description")), extras)
 
-                    hint = total_hint if total_hint is not None else "?"
-                    self.log_progress(
-                        f"⛏️ Mining issue {issue_count} of {hint}. Key: {issue_key} - {fields['summary']}"
-                    )
+                self.log_progress(
+                    f"⛏️ Mining issue {issue_count} of {hint}. Key: {issue_data['key']} - {fields['summary']}"
+                )
 
-                    self.save_comments(issue_key, issue_obj)
-                    self.save_history(issue_key, issue_obj)
-                    self.save_activity(issue_key, issue_obj)
-                    self.save_checklist(issue_key, issue_obj)
-                    self.save_commits(issue_key, issue_obj)
-                    self.save_sprints(fields, issue_obj)
+            # One bulk upsert per table for the whole page
+            writer.flush()
+
+            collected += len(issues)
+            pages += 1
+
+            # Checkpoint the last fully collected day
+            page_created = [i["fields"]["created"] for i in issues if isinstance(i.get("fields"), dict)]
+            if page_created:
+                newest = max(page_created)
+                done_day = (date.fromisoformat(newest[:10]) - timedelta(days=1)).isoformat()
+                if not start_bound or done_day >= start_bound[:10]:
+                    checkpoint = self.checkpoint_day(done_day, checkpoint)
+                # Exact resume point: a restart starts at the minute of the newest issue written
+                # (JQL has minute precision; issues read again are upserted)
+                if self.task_obj:
+                    self.task_obj.save_cursor(
+                        day=newest[:10], page=pages, created=self.format_jql_datetime(parse_datetime(newest))
+                    )
 
-                collected += len(issues)
+            # If Jira says it's the last page, or nextPageToken is missing, stop.
+            if data.get("isLast") is True or not next_page_token:
+                break
 
-                # If Jira says it's the last page, or nextPageToken is missing, stop.
-                if data.get("isLast") is True or not next_page_token:
-                    break
+        if completed and end_bound:
+            self.checkpoint_day(end_bound[:10], checkpoint)
+        if completed and self.task_obj:
+            self.task_obj.save_cursor()
 
-            return collected
+        result = {"status": f"Collected {collected} issues successfully.", "total_issues": collected}
+        if updated_since:
+            result["updated_since"] = updated_since.isoformat()
+        return result
 
-        total_collected = 0
 
-        # If both dates are provided, process day by day and update progress
-        if start_date and end_date and self.task_obj:
-            # Normalize dates for daily windows: expect strings 'YYYY-MM-DD' via utils
+    def jql_date_bound(self, value, end_of_day=False):
+        """
+        Render a collection bound ('YYYY-MM-DD', 'YYYY-MM-DD HH:mm', ISO string or
+        datetime) as a JQL date. Date-only end bounds cover the whole day.
+        """
+        if not value:
+            return None
+        if isinstance(value, str):
             try:
-                day_windows = list(split_date_range(start_date, end_date, interval_days=1))
-            except Exception:
-                # Fallback: treat as single window
-                day_windows = [(None, None)]
-
-            for (day_start, day_end) in day_windows:
-                # Build daily WHERE using 00:00..23:59 bounds
-                if day_start and day_end:
-                    jql_where = (
-                        f"AND created >= \"{day_start} 00:00\" AND created <= \"{day_end} 23:59\""
-                    )
-                else:
-                    jql_where = ""
-
-                collected = run_paged_collection(jql_where)
-                total_collected += collected
-
-                # Update task progress per completed day
-                if day_start:
-                    update_task_progress_date(self.task_obj, day_start)
-                    self.log_progress(f"Completed day {day_start}: {collected} issues")
-
-        else:
-            # Single run without per-day tracking
-            jql_where = ""
-            if start_date:
-                start_dt = self.validate_and_parse_date(start_date)
-                jql_where += f" AND created >= \"{start_dt.strftime('%Y-%m-%d %H:%M')}\""
-            if end_date:
-                end_dt = self.validate_and_parse_date(end_date)
-                jql_where += f" AND created <= \"{end_dt.strftime('%Y-%m-%d %H:%M')}\""
-            total_collected = run_paged_collection(jql_where)
-
-        return {"status": f"Collected {total_collected} issues successfully.", "total_issues": total_collected}
-
-
-    def get_commits_for_issue(self, issue_key):
-        # Search for the numeric ID of the issue
-        issue_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}?fields=id"
-        response = requests.get(issue_url, headers=self.headers, auth=self.auth)
-        if response.status_code != 200:
-            return []
-        issue_id = response.json().get('id')
+                value = self.validate_and_parse_date(value)
+            except ValueError:
+                value = parse_datetime(value) or datetime.strptime(value[:10], "%Y-%m-%d")
+        if end_of_day and (value.hour, value.minute) == (0, 0):
+            return value.strftime("%Y-%m-%d 23:59")
+        return value.strftime("%Y-%m-%d %H:%M")
+
+
+    def checkpoint_day(self, day, last_checkpoint):
+        """Record `day` as completed on the task if it is later than the last checkpoint."""
+        if not self.task_obj or (last_checkpoint and day <= last_checkpoint):
+            return last_checkpoint
+        update_task_progress_date(self.task_obj, day)
+        return day
+
+
+    def get_last_sync(self, project_key):
+        """Newest `updated` stored for the project, or None when it was never collected."""
+        last_updated = JiraIssue.objects.filter(project__key=project_key).aggregate(last=Max("updated"))["last"]
+        return last_updated - INCREMENTAL_SYNC_OVERLAP if last_updated else None
+
+
+    def parse_sync_datetime(self, value):
+        if isinstance(value, str):
+            value = self.validate_and_parse_date(value)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, dt_timezone.utc)
+        return value
+
+
+    def format_jql_datetime(self, value):
+        """Render an aware datetime as a JQL date in the Jira user's time zone."""
+        try:
+            tz = ZoneInfo(self.user_timezone) if self.user_timezone else dt_timezone.utc
+        except (ValueError, KeyError):
+            tz = dt_timezone.utc
+        return value.astimezone(tz).strftime("%Y-%m-%d %H:%M")
+
+
+    def get_known_history(self, issues):
+        """Newest stored history id and number of stored entries, per issue id of a page."""
+        rows = (
+            JiraHistory.objects.filter(issue_id__in=[issue.get("id") for issue in issues])
+            .values("issue_id")
+            .annotate(last_id=Max("id"), stored=Count("id"))
+        )
+        return {row["issue_id"]: (row["last_id"], row["stored"]) for row in rows}
+
+
+    def enrich_issue(self, issue_data, known_history=None):
+        """
+        Fetch what an issue needs beyond its bulkfetch payload.
+
+        Only performs HTTP calls, so it can run in a worker thread; persisting
+        stays on the calling thread. known_history is the (last id, count) of
+        the history already stored for the issue; only newer entries are returned.
+        """
+        try:
+            fields = issue_data["fields"]
+            issue_key = issue_data["key"]
+            last_id, stored = known_history or (None, 0)
+            return {
+                "comments": self.get_comments_for_issue(issue_key, fields=fields),
+                "history": self.get_issue_history(issue_key, issue_data=issue_data, since_id=last_id, stored=stored),
+                "checklist": self.get_checklist(issue_key, fields=fields),
+                "commits": self.get_commits_for_issue(issue_key, issue_id=issue_data["id"]),
+            }
+        finally:
+            # log_progress may have opened a DB connection in this worker thread
+            connections.close_all()
+
+
+    def enrich_issues(self, issues, known_history=None):
+        """Run enrich_issue for a page of issues on a bounded thread pool, keyed by issue id."""
+        valid = [issue for issue in issues if isinstance(issue.get("fields"), dict)]
+        if not valid:
+            return {}
+
+        known_history = known_history or {}
+        workers = max(1, min(settings.JIRA_MAX_WORKERS, len(valid)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda issue: self.enrich_issue(issue, known_history.get(issue["id"])), valid)
+            return dict(zip([issue["id"] for issue in valid], results))
+
+
+    def get_commits_for_issue(self, issue_key, issue_id=None):
+        # Search for the numeric ID of the issue, unless the caller already has it
         if not issue_id:
-            return []
+            issue_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}?fields=id"
+            response = self._get(issue_url)
+            if response.status_code != 200:
+                return []
+            issue_id = response.json().get('id')
+            if not issue_id:
+                return []
 
         # Search for commits using the issue ID
         jira_commits_url = f"https://{self.jira_domain}/rest/dev-status/latest/issue/detail?issueId={issue_id}&applicationType=GitHub&dataType=repository"
-        response = requests.get(jira_commits_url, headers=self.headers, auth=self.auth)
+        response = self._get(jira_commits_url)
         if response.status_code != 200:
             return []
 
@@ -360,32 +461,39 @@ def get_commits_for_issue(self, issue_key):
         return commits
 
 
-    def get_comments_for_issue(self, issue_key):
+    def get_comments_for_issue(self, issue_key, fields=None):
         """
         Collects comments for a Jira issue.
         
         Args:
             issue_key (str): The issue key (e.g., PROJ-123)
+            fields (dict): Issue fields already fetched (bulkfetch). Their embedded
+                'comment' block is used when it holds every comment.
             
         Returns:
             list: List of comments with their information
         """
+        embedded = (fields or {}).get('comment')
+        if isinstance(embedded, dict):
+            embedded_comments = embedded.get('comments', [])
+            if len(embedded_comments) >= embedded.get('total', 0):
+                return self.parse_comments(embedded_comments)
+
         comments_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}/comment"
         
-        response = requests.get(comments_url, headers=self.headers, auth=self.auth)
-        
-        if self.handle_rate_limit(response):
-            return self.get_comments_for_issue(issue_key)
-            
+        response = self._get(comments_url)
+
         if response.status_code != 200:
             self.log_progress(f"Problem collecting comments for {issue_key}: {response.status_code}")
 
             return []
             
-        comments_data = response.json()
+        return self.parse_comments(response.json().get('comments', []))
+
+
+    def parse_comments(self, raw_comments):
         comments = []
-        
-        for comment in comments_data.get('comments', []):
+        for comment in raw_comments:
             comments.append({
                 'id': comment.get('id'),
                 'body': self.extract_words_from_description(comment.get('body', '')),
@@ -398,32 +506,73 @@ def get_comments_for_issue(self, issue_key):
         return comments
 
 
-    def get_issue_history(self, issue_key):
+    def get_issue_history(self, issue_key, issue_data=None, since_id=None, stored=0):
         """
         Collects the change history of a Jira issue.
         
         Args:
             issue_key (str): The issue key (e.g., PROJ-123)
+            issue_data (dict): Issue already fetched with expand=changelog (bulkfetch).
+                Its changelog is used when it holds every history entry.
+            since_id (int): Newest history id already stored; only newer entries are returned
+            stored (int): Number of history entries already stored for the issue
             
         Returns:
             list: List of changes with their information
         """
-        history_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}?expand=changelog"
-        
-        response = requests.get(history_url, headers=self.headers, auth=self.auth)
-        
-        if self.handle_rate_limit(response):
-            return self.get_issue_history(issue_key)
-            
-        if response.status_code != 200:
-            self.log_progress(f"Problem collecting history for {issue_key}: {response.status_code}")
+        changelog = (issue_data or {}).get('changelog')
+        histories = None
+        if isinstance(changelog, dict):
+            embedded = changelog.get('histories', [])
+            if len(embedded) >= changelog.get('total', len(embedded)):
+                histories = embedded
 
-            return []
-            
-        history_data = response.json()
+        if histories is None:
+            histories = self.get_changelog(issue_key, since_id=since_id, stored=stored)
+
+        if since_id is not None:
+            histories = [h for h in histories if int(h.get('id', 0)) > int(since_id)]
+        return self.parse_history(histories)
+
+
+    def get_changelog(self, issue_key, since_id=None, stored=0):
+        """
+        Page through /issue/{key}/changelog, which is not truncated like the
+        changelog embedded by expand=changelog.
+
+        Entries come oldest first, so when `stored` entries are already known the
+        scan starts at the last of them. If that entry is not the expected one
+        (history was deleted in Jira), the scan restarts from the beginning.
+        """
+        changelog_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}/changelog"
+        start_at = max(stored - 1, 0) if since_id is not None else 0
+
+        while True:
+            histories = []
+            position = start_at
+            while True:
+                response = self._get(changelog_url, params={"startAt": position, "maxResults": CHANGELOG_PAGE_SIZE})
+
+                if response.status_code != 200:
+                    self.log_progress(f"Problem collecting history for {issue_key}: {response.status_code}")
+                    return histories
+
+                data = response.json()
+                values = data.get('values', [])
+                histories.extend(values)
+                position += len(values)
+                if not values or data.get('isLast', position >= data.get('total', 0)):
+                    break
+
+            if start_at and (not histories or int(histories[0].get('id', 0)) > int(since_id)):
+                start_at = 0
+                continue
+            return histories
+
+
+    def parse_history(self, histories):
         history = []
-        
-        for change in history_data.get('changelog', {}).get('histories', []):
+        for change in histories:
             history.append({
                 'id': change.get('id'),
                 'author': change.get('author', {}).get('displayName'),
@@ -443,7 +592,7 @@ def get_issue_history(self, issue_key):
         return history
     
 
-    def get_activity_log(self, issue_key):
+    def get_activity_log(self, issue_key, history=None):
         """
         Collects the activity log of a Jira issue, focusing on:
         - Status changes
@@ -453,29 +602,19 @@ def get_activity_log(self, issue_key):
         
         Args:
             issue_key (str): The issue key (e.g., PROJ-123)
+            history (list): Parsed history (get_issue_history); fetched when omitted
             
         Returns:
             list: List of activities with their information
         """
-        # First, get the complete history of the issue
-        history_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}?expand=changelog"
-        
-        response = requests.get(history_url, headers=self.headers, auth=self.auth)
-        
-        if self.handle_rate_limit(response):
-            return self.get_activity_log(issue_key)
-            
-        if response.status_code != 200:
-            self.log_progress(f"Problem collecting activity log for {issue_key}: {response.status_code}")
+        if history is None:
+            history = self.get_issue_history(issue_key)
 
-            return []
-            
-        history_data = response.json()
         activities = []
         
         # Process the history of changes
-        for change in history_data.get('changelog', {}).get('histories', []):
-            author = change.get('author', {}).get('displayName')
+        for change in history:
+            author = change.get('author')
             created = change.get('created')
             
             for item in change.get('items', []):
@@ -536,36 +675,33 @@ def get_activity_log(self, issue_key):
         return activities
         
 
-    def get_checklist(self, issue_key):
+    def get_checklist(self, issue_key, fields=None):
         """
         Collects the checklist of a Jira issue.
         
         Args:
             issue_key (str): The issue key (e.g., PROJ-123)
+            fields (dict): Issue fields already fetched (bulkfetch); fetched when omitted
             
         Returns:
             list: List of checklist items with their information
         """
         # Note: The Jira API does not have a specific endpoint for checklists
         # We will try to get this from custom fields or the description
-        issue_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}"
-        
-        response = requests.get(issue_url, headers=self.headers, auth=self.auth)
-        
-        if self.handle_rate_limit(response):
-            return self.get_checklist(issue_key)
+        if fields is None:
+            issue_url = f"https://{self.jira_domain}/rest/api/3/issue/{issue_key}"
             
-        if response.status_code != 200:
-            self.log_progress(f"Problem collecting checklist for {issue_key}: {response.status_code}")
+            response = self._get(issue_url)
+
+            if response.status_code != 200:
+                self.log_progress(f"Problem collecting checklist for {issue_key}: {response.status_code}")
+
+                return []
+                
+            fields = response.json().get('fields', {})
 
-            return []
-            
-        issue_data = response.json()
         checklist = []
         
-        # Check for a custom field for the checklist
-        fields = issue_data.get('fields', {})
-        
         # Look for fields that may contain the checklist
         for field_id, field_value in fields.items():
             if isinstance(field_value, dict) and field_value.get('type') == 'checklist':
@@ -628,17 +764,22 @@ def traverse_content(content):
     
 
     def get_custom_fields_mapping(self):
-        url = f"https://{self.jira_domain}/rest/api/3/field"
-        response = requests.get(url, headers=self.headers, auth=self.auth)
+        """Custom field id -> name for the domain, cached for JIRA_FIELD_CACHE_TTL seconds."""
+        key = field_cache_key(self.jira_domain)
+        mapping = cache_get(key)
+        if mapping is not None:
+            return mapping
 
-        if self.handle_rate_limit(response):
-            return self.get_custom_fields_mapping()
+        url = f"https://{self.jira_domain}/rest/api/3/field"
+        response = self._get(url)
 
         if response.status_code != 200:
             raise Exception(f"Failed to get custom fields: {response.status_code} - {response.text}")
 
         fields = response.json()
-        return {field['id']: field['name'] for field in fields if field['id'].startswith('customfield_')}
+        mapping = {field['id']: field['name'] for field in fields if field['id'].startswith('customfield_')}
+        cache_set(key, mapping, settings.JIRA_FIELD_CACHE_TTL)
+        return mapping
         
 
     def extract_words_from_description(self, description):
@@ -703,158 +844,3 @@ def validate_and_parse_date(self, date_string):
             except ValueError:
                 continue
         raise ValueError(f"Invalid date format: {date_string}. Expected formats are: 'yyyy-MM-dd' or 'yyyy-MM-dd HH:mm'.")
-    
-
-    def ensure_user(self, user_data):
-        if not user_data:
-            return None
-
-        user_obj, _ = JiraUser.objects.get_or_create(
-            accountId=user_data['accountId'],
-            defaults={
-                'displayName': user_data.get('displayName', ''),
-                'emailAddress': user_data.get('emailAddress', ''),
-                'active': user_data.get('active', True),
-                'timeZone': user_data.get('timeZone', 'UTC'),
-                'accountType': user_data.get('accountType', 'atlassian')
-            }
-        )
-        return user_obj
-
-
-    def save_comments(self, issue_key, issue_obj):
-        comments = self.get_comments_for_issue(issue_key)
-        for c in comments:
-            author_obj = self.ensure_user({
-                'accountId': f"temp_{(c.get('author') or 'unknown').replace(' ', '_')}",
-                'displayName': c.get('author') or 'Unknown',
-                'emailAddress': '',
-                'active': True,
-                'timeZone': 'UTC',
-                'accountType': 'atlassian'
-            })
-
-            JiraComment.objects.update_or_create(
-                id=c['id'],
-                defaults={
-                    'issue': issue_obj,
-                    'author': author_obj,
-                    'body': c['body'],
-                    'created': parse_datetime(c['created']),
-                    'updated': parse_datetime(c['updated'])
-                }
-            )
-
-
-    def save_history(self, issue_key, issue_obj):
-        history_list = self.get_issue_history(issue_key)
-        for h in history_list:
-            author_obj = self.ensure_user({
-                'accountId': f"temp_{(h.get('author') or 'unknown').replace(' ', '_')}",
-                'displayName': h.get('author') or 'Unknown',
-                'emailAddress': '',
-                'active': True,
-                'timeZone': 'UTC',
-                'accountType': 'atlassian'
-            })
-            history_obj, _ = JiraHistory.objects.update_or_create(
-                id=h['id'],
-                defaults={
-                    'issue': issue_obj,
-                    'author': author_obj,
-                    'created': parse_datetime(h['created'])
-                }
-            )
-            for item in h['items']:
-                JiraHistoryItem.objects.update_or_create(
-                    history=history_obj,
-                    field=item['field'],
-                    defaults={
-                        'fieldtype': item['fieldtype'],
-                        'from_value': item['from'],
-                        'to_value': item['to'],
-                        'fromString': item['fromString'],
-                        'toString': item['toString']
-                    }
-                )
-
-
-    def save_activity(self, issue_key, issue_obj):
-        activities = self.get_activity_log(issue_key)
-        for a in activities:
-            author_obj = self.ensure_user({
-                'accountId': f"temp_{(a.get('author') or 'unknown').replace(' ', '_')}",
-                'displayName': a.get('author') or 'Unknown',
-                'emailAddress': '',
-                'active': True,
-                'timeZone': 'UTC',
-                'accountType': 'atlassian'
-            })
-            JiraActivityLog.objects.create(
-                issue=issue_obj,
-                to_value=a.get('to'),
-                from_value=a.get('from'),
-                author=author_obj,
-                created=parse_datetime(a['created']),
-                description=a['description'][:300]
-            )
-
-
-    def save_checklist(self, issue_key, issue_obj):
-        checklist = self.get_checklist(issue_key)
-        if checklist:
-            JiraChecklist.objects.update_or_create(
-                issue=issue_obj,
-                defaults={
-                    'checklist': checklist,
-                    'progress': f"Checklist: {sum(1 for i in checklist if i['completed'])}/{len(checklist)}",
-                    'completed': all(i['completed'] for i in checklist)
-                }
-            )
-
-
-    def save_commits(self, issue_key, issue_obj):
-        commits = self.get_commits_for_issue(issue_key)
-        for c in commits:
-            JiraCommit.objects.update_or_create(
-                sha=c["id"],
-                defaults={
-                    "issue": issue_obj,
-                    "author": c.get("author", ""),
-                    "author_email": c.get("authorEmail", ""),
-                    "message": c.get("message"),
-                    # repository: we try to map to an existing GitHubMetadata by html_url
-                    # If it does not exist, we leave it as None
-                    "repository": None,
-                    "timestamp": timezone.now(),  # Ideally parse from data if available
-                },
-            )
-
-                
-    def save_sprints(self, fields, issue_obj):      
-        sprints_data = fields.get("sprint")
-        if not sprints_data:
-            return
-
-        if isinstance(sprints_data, dict):  # If it comes as a single dict
-            sprints_data = [sprints_data]
-
-        for sprint in sprints_data:
-            try:
-                sprint_obj, _ = JiraSprint.objects.update_or_create(
-                    id=sprint["id"],
-                    defaults={
-                        "name": sprint["name"],
-                        "goal": sprint.get("goal", ""),
-                        "state": sprint.get("state"),
-                        "boardId": sprint.get("originBoardId", 0),
-                        "startDate": parse_datetime(sprint.get("startDate")) if sprint.get("startDate") else None,
-                        "endDate": parse_datetime(sprint.get("endDate")) if sprint.get("endDate") else None,
-                        "completeDate": parse_datetime(sprint.get("completeDate")) if sprint.get("completeDate") else None,
-                    }
-                )
-                issue_obj.sprints.add(sprint_obj)
-
-
-            except Exception as e:
-                self.log_progress(f"Problem on saving sprint for {issue_obj.issue_key}: {e}")
\ No newline at end of file
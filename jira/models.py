@@ -1,6 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.timezone import now
 
+from utils.search import search_vector_field
+
 
 class JiraIssue(models.Model):
     issue_id = models.CharField(max_length=100, primary_key=True)
@@ -22,6 +25,14 @@ class JiraIssue(models.Model):
     timespent = models.IntegerField(null=True, blank=True)
     parent_issue = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = search_vector_field(('summary', 'A'), ('description', 'B'))
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='jira_issue_search_gin'),
+            # Dashboard and collection scopes: one project, optionally a created range
+            models.Index(fields=['project', 'created'], name='jira_issue_project_created'),
+        ]
 
     def __str__(self):
         return f"{self.issue_key} - {self.summary}"
@@ -68,6 +79,11 @@ class JiraChecklist(models.Model):
     completed = models.BooleanField()
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['issue'], name='jira_checklist_unique_issue'),
+        ]
+
 
 class JiraIssueType(models.Model):
     issue = models.OneToOneField(JiraIssue, on_delete=models.CASCADE)
@@ -120,6 +136,12 @@ class JiraActivityLog(models.Model):
     description = models.CharField(max_length=300)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Natural key of an activity row, so re-mining an issue does not duplicate it
+        constraints = [
+            models.UniqueConstraint(fields=['issue', 'created', 'description'], name='jira_activity_unique_entry'),
+        ]
+
 
 class JiraHistory(models.Model):
     issue = models.ForeignKey(JiraIssue, on_delete=models.CASCADE)
@@ -138,6 +160,11 @@ class JiraHistoryItem(models.Model):
     toString = models.TextField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['history', 'field'], name='jira_historyitem_unique_field'),
+        ]
+
 class JiraStatus(models.Model):
     name = models.CharField(max_length=100, unique=True)
     def __str__(self):
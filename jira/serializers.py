@@ -5,7 +5,7 @@
 class JiraIssueSerializer(serializers.ModelSerializer):
     class Meta:
         model = JiraIssue
-        fields = '__all__'
+        exclude = ['search_vector']
 
 class JiraProjectSerializer(serializers.ModelSerializer):
     class Meta:
@@ -73,9 +73,13 @@ class JiraIssueCollectSerializer(serializers.Serializer):
 
 class ExportDataSerializer(serializers.Serializer):
     table = serializers.CharField()
-    format = serializers.ChoiceField(choices=['json', 'csv'])  
+    format = serializers.ChoiceField(choices=['json', 'ndjson', 'csv', 'parquet', 'arrow'])
+    # Primary keys of the table (Jira ids are strings for issues, projects and users)
     ids = serializers.ListField(
-        child=serializers.IntegerField(), required=False, allow_empty=True
+        child=serializers.CharField(), required=False, allow_empty=True
     )
     issue_type = serializers.CharField(required=False, allow_blank=True)
-    data_type = serializers.CharField(required=False, allow_blank=True)  
+    project_key = serializers.CharField(required=False, allow_blank=True)
+    data_type = serializers.CharField(required=False, allow_blank=True)
+    compress = serializers.BooleanField(default=False)
+    run_async = serializers.BooleanField(default=False)
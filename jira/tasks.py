@@ -1,17 +1,20 @@
 from celery import shared_task
 from jira.miner import JiraMiner
-from datetime import datetime, timedelta
+from datetime import datetime
 from django.utils import timezone as dj_tz
 
 import traceback
 import uuid
+from jobs.locks import collection_guard
 from jobs.models import Task
 
 
 def _reuse_or_create_task(self, *, defaults, task_pk=None):
     if task_pk:
         update_data = {**defaults, "task_id": getattr(getattr(self, "request", None), "id", None)}
+        # a restart keeps the original range start and parameters
         update_data.pop("date_init", None)
+        update_data.pop("params", None)
         updated = Task.objects.filter(pk=task_pk).update(**update_data)
         if updated:
             return Task.objects.get(pk=task_pk), False
@@ -20,6 +23,10 @@ def _reuse_or_create_task(self, *, defaults, task_pk=None):
     return Task.objects.get_or_create(task_id=task_id, defaults=defaults)
 
 
+def _json_date(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
 def _is_no_valid_jira_token_error(exc: Exception) -> bool:
     try:
         if isinstance(exc, JiraMiner.NoValidJiraTokenError):
@@ -30,7 +37,9 @@ def _is_no_valid_jira_token_error(exc: Exception) -> bool:
 
 
 @shared_task(bind=True)
-def collect_jira_issues_task(self, jira_domain, project_key, issuetypes, start_date=None, end_date=None, task_pk=None):
+@collection_guard("jira", "issues", target=("jira_domain", "project_key"))
+def collect_jira_issues_task(self, jira_domain, project_key, issuetypes, start_date=None, end_date=None, task_pk=None,
+                             incremental=False, updated_since=None):
     if getattr(getattr(self, "request", None), "id", None):
         self.update_state(state="STARTED")
 
@@ -43,6 +52,15 @@ def collect_jira_issues_task(self, jira_domain, project_key, issuetypes, start_d
         "date_init": start_date,
         "date_end": end_date,
         "type": "jira_issues",
+        "params": {
+            "jira_domain": jira_domain,
+            "project_key": project_key,
+            "issuetypes": issuetypes,
+            "start_date": _json_date(start_date),
+            "end_date": _json_date(end_date),
+            "incremental": incremental,
+            "updated_since": _json_date(updated_since),
+        },
     }
     task_obj, _ = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
 
@@ -50,7 +68,10 @@ def collect_jira_issues_task(self, jira_domain, project_key, issuetypes, start_d
         print(f"Starting Jira issue collection: {project_key} on domain {jira_domain}", flush=True)
 
         miner = JiraMiner(jira_domain, task_obj=task_obj)
-        issues = miner.collect_jira_issues(project_key, issuetypes, start_date, end_date)
+        issues = miner.collect_jira_issues(
+            project_key, issuetypes, start_date, end_date,
+            incremental=incremental, updated_since=updated_since,
+        )
 
         result_payload = {
             **(issues or {}),
@@ -111,7 +132,13 @@ def collect_jira_issues_task(self, jira_domain, project_key, issuetypes, start_d
 
 @shared_task(bind=True, name="jira.restart_collection")
 def restart_collection(self, task_pk: str):
+    """
+    Restart a collection with the parameters it was started with (issue types,
+    incremental window), from the creation minute of the newest issue written
+    or, failing that, from the day after its last completed day.
+    """
     task_obj = Task.objects.get(pk=task_pk)
+    params = task_obj.params or {}
 
     repo = task_obj.repository or ""
     if "/" not in repo:
@@ -121,18 +148,19 @@ def restart_collection(self, task_pk: str):
     jira_domain, project_key = repo.split("/", 1)
     end_date = task_obj.date_end
 
-    base = task_obj.date_last_update or getattr(task_obj, "date_init", None)
-    start_date = (base + timedelta(days=1)) if base else None
+    start_date = (task_obj.cursor or {}).get("created") or task_obj.resume_from()
     if isinstance(start_date, datetime) and dj_tz.is_naive(start_date):
         start_date = dj_tz.make_aware(start_date, dj_tz.get_default_timezone())
 
     new_task = collect_jira_issues_task.delay(
         jira_domain=jira_domain,
         project_key=project_key,
-        issuetypes=[],
+        issuetypes=params.get("issuetypes") or [],
         start_date=start_date,
         end_date=end_date,
         task_pk=task_obj.pk,
+        incremental=params.get("incremental", False),
+        updated_since=params.get("updated_since"),
     )
 
     self.update_state(state="SUCCESS", meta={"spawned_task_pk": task_obj.pk, "celery_id": new_task.id, "type": "jira_issues"})
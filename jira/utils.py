@@ -1,52 +1,16 @@
-from datetime import datetime, timezone, timedelta
-from typing import Optional, Generator, Tuple
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
+from django.core.cache import cache
 
-def split_date_range(start_date: Optional[str], end_date: Optional[str], 
-                     interval_days: int = 1) -> Generator[Tuple[str, str], None, None]:
-    """
-    Split a date range into daily (or custom) intervals.
-
-    Args:
-        start_date: Start date in ISO8601 or YYYY-MM-DD format
-        end_date: End date in ISO8601 or YYYY-MM-DD format
-        interval_days: Number of days per interval
-
-    Yields:
-        Tuples of (start_date, end_date) in YYYY-MM-DD
-    """
-    if not start_date or not end_date:
-        yield (start_date, end_date)
-        return
+logger = logging.getLogger(__name__)
 
-    if isinstance(start_date, datetime):
-        start_date = start_date.strftime("%Y-%m-%dT%H:%M:%S")
-
-    if isinstance(end_date, datetime):
-        end_date = end_date.strftime("%Y-%m-%dT%H:%M:%S")
-
-    # Accept both YYYY-MM-DD and YYYY-MM-DDTHH:MM:SS
-    def _parse_date(s: str) -> datetime:
-        s = s.rstrip('Z')
-        for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"):
-            try:
-                return datetime.strptime(s, fmt)
-            except ValueError:
-                continue
-        # Fallback: try date only component
-        return datetime.strptime(s[:10], "%Y-%m-%d")
-
-    start = _parse_date(start_date)
-    end = _parse_date(end_date)
-
-    current = start
-    while current < end:
-        interval_end = min(current + timedelta(days=interval_days), end)
-        yield (
-            current.strftime("%Y-%m-%d"),
-            interval_end.strftime("%Y-%m-%d")
-        )
-        current = interval_end + timedelta(days=1)
+# Wait used when a 429 response carries no usable Retry-After header
+DEFAULT_RETRY_AFTER = 60
 
 
 def update_task_progress_date(task_obj, completed_date: str) -> None:
@@ -67,3 +31,105 @@ def update_task_progress_date(task_obj, completed_date: str) -> None:
         print(f" Progress tracked (Jira): Completed scraping for {completed_date}", flush=True)
     except Exception as e:
         print(f" Warning (Jira): Could not update progress date: {str(e)}", flush=True)
+
+
+def retry_after_seconds(response, default: int = DEFAULT_RETRY_AFTER) -> float:
+    """
+    Seconds to wait before retrying a rate-limited response.
+
+    Accepts both forms of the Retry-After header (delay in seconds or HTTP date).
+    """
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+class DomainThrottle:
+    """
+    Limits concurrent requests to one Jira domain and shares 429 back-off.
+
+    Used as a context manager around each request. When any thread receives a
+    429, back_off() pauses every thread talking to that domain until the
+    Retry-After delay has passed.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+
+    def back_off(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def wait(self) -> None:
+        while True:
+            with self._lock:
+                delay = self._blocked_until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def __enter__(self):
+        self.wait()
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+_domain_throttles = {}
+_domain_throttles_lock = threading.Lock()
+
+
+def get_domain_throttle(jira_domain: str, max_concurrency: int) -> DomainThrottle:
+    """Process-wide throttle for a Jira domain, shared by every JiraMiner."""
+    with _domain_throttles_lock:
+        throttle = _domain_throttles.get(jira_domain)
+        if throttle is None:
+            throttle = _domain_throttles[jira_domain] = DomainThrottle(max_concurrency)
+        return throttle
+
+
+def _cache_key(kind: str, jira_domain: str, *parts: str) -> str:
+    return ":".join(["jira", kind, jira_domain, *parts])
+
+
+def token_fingerprint(email: str, token: str) -> str:
+    """Stable, non-reversible id of a credential, safe to use in cache keys."""
+    return hashlib.sha256(f"{email}:{token}".encode()).hexdigest()[:16]
+
+
+def cache_get(key: str):
+    """Read from the shared cache; an unreachable cache counts as a miss."""
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Cache unavailable, reading {key} from Jira: {e}")
+        return None
+
+
+def cache_set(key: str, value, ttl: int) -> None:
+    try:
+        cache.set(key, value, ttl)
+    except Exception as e:
+        logger.warning(f"Cache unavailable, {key} not stored: {e}")
+
+
+def field_cache_key(jira_domain: str) -> str:
+    return _cache_key("fields", jira_domain)
+
+
+def token_cache_key(jira_domain: str, email: str, token: str) -> str:
+    return _cache_key("token", jira_domain, token_fingerprint(email, token))
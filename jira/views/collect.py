@@ -6,6 +6,7 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from jobs.locks import dispatch_collection
 from jobs.models import Task
 from jira.tasks import collect_jira_issues_task
 
@@ -39,7 +40,17 @@
                     'description': 'List of issue types to collect'
                 },
                 'start_date': {'type': 'string', 'format': 'date-time', 'nullable': True},
-                'end_date': {'type': 'string', 'format': 'date-time', 'nullable': True}
+                'end_date': {'type': 'string', 'format': 'date-time', 'nullable': True},
+                'sync_mode': {
+                    'type': 'string',
+                    'enum': ['full', 'incremental'],
+                    'default': 'full',
+                    'description': "'incremental' only collects issues updated since the last sync and their new changelog entries"
+                },
+                'updated_since': {
+                    'type': 'string', 'format': 'date-time', 'nullable': True,
+                    'description': 'Lower bound on `updated` for an incremental sync (defaults to the newest stored update)'
+                }
             },
             'required': ['projects']
         }
@@ -104,6 +115,14 @@ def post(self, request, *args, **kwargs):
             start_date = data.get('start_date', None)
             end_date = data.get('end_date', None)
 
+            sync_mode = data.get('sync_mode') or 'full'
+            if sync_mode not in ('full', 'incremental'):
+                return Response(
+                    {"error": "'sync_mode' must be 'full' or 'incremental'"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            updated_since = data.get('updated_since') or None
+
             # 4. Load Jira credentials from environment variables
             jira_email = settings.JIRA_EMAIL
             jira_api_token = settings.JIRA_API_TOKEN
@@ -124,17 +143,17 @@ def post(self, request, *args, **kwargs):
                 jira_domain = project_info['jira_domain']
                 project_key = project_info['project_key']
 
-                task = collect_jira_issues_task.delay(
-                    jira_domain,
-                    project_key,
-                    issuetypes if issuetypes else [],
-                    start_date,
-                    end_date
+                # an identical collection already queued or running is returned instead of a new one
+                task_id, coalesced = dispatch_collection(
+                    collect_jira_issues_task,
+                    args=[jira_domain, project_key, issuetypes if issuetypes else [], start_date, end_date],
+                    kwargs={"incremental": sync_mode == 'incremental', "updated_since": updated_since},
                 )
 
                 tasks.append({
-                    "task_id": task.id,
-                    "repository": f"{jira_domain}/{project_key}"
+                    "task_id": task_id,
+                    "repository": f"{jira_domain}/{project_key}",
+                    "coalesced": coalesced,
                 })
 
             # Return 202 response
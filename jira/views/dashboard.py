@@ -2,7 +2,7 @@
 
 from django.conf import settings
 from django.db.models.functions import TruncDay, TruncMonth, TruncYear
-from django.db.models import Min, Max
+from django.db.models import Count, Exists, Max, Min, OuterRef, Q
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from rest_framework import status
@@ -13,6 +13,50 @@
 
 logger = logging.getLogger(__name__)
 
+
+def _issue_filter(prefix, project_id=None, start_date=None, end_date=None):
+    """Filter on the issues reached through `prefix`: project and created range, served by (project_id, created)."""
+    q = Q()
+    if project_id:
+        q &= Q(**{f"{prefix}project_id": project_id})
+    if start_date:
+        q &= Q(**{f"{prefix}created__gte": start_date})
+    if end_date:
+        q &= Q(**{f"{prefix}created__lte": end_date})
+    return q
+
+
+def dashboard_counts(project_id=None, start_date=None, end_date=None):
+    """
+    Dashboard numbers with one aggregate query per table.
+
+    Related tables are joined to their issue and filtered on its project and
+    created date, so every count is scoped the same way. Users are the
+    creators, reporters and assignees of the issues in scope.
+    """
+    issues = JiraIssue.objects.filter(_issue_filter("", project_id, start_date, end_date))
+    counts = issues.aggregate(issues_count=Count('issue_id'), time_mined=Max('time_mined'))
+
+    counts.update(JiraComment.objects.filter(
+        _issue_filter("issue__", project_id, start_date, end_date)
+    ).aggregate(comments_count=Count('id')))
+
+    counts.update(JiraCommit.objects.filter(
+        _issue_filter("issue__", project_id, start_date, end_date)
+    ).aggregate(commits_count=Count('id')))
+
+    counts.update(JiraSprint.issues.through.objects.filter(
+        _issue_filter("jiraissue__", project_id, start_date, end_date)
+    ).aggregate(sprints_count=Count('jirasprint_id', distinct=True)))
+
+    counts['users_count'] = JiraUser.objects.filter(
+        Exists(issues.filter(
+            Q(creator=OuterRef('pk')) | Q(reporter=OuterRef('pk')) | Q(assignee=OuterRef('pk'))
+        ))
+    ).count()
+    return counts
+
+
 @extend_schema(
     tags=['Jira'],
     summary="Jira Dashboard statistics",
@@ -137,38 +181,20 @@ def get(self, request):
             start_date = request.query_params.get('start_date')
             end_date = request.query_params.get('end_date')
 
-            filters = {}
-
-            if start_date:
-                filters['created__gte'] = start_date
-            if end_date:
-                filters['created__lte'] = end_date
-
-            issues_query = JiraIssue.objects.filter(**filters)
-
             if project_id:
                 try:
                     project = JiraProject.objects.get(id=project_id)
-                    project_issues = issues_query.filter(project=project)
-
-                    if project_issues.exists():
-                        latest_time_mined = project_issues.order_by('-time_mined').first().time_mined
-                    else:
-                        latest_time_mined = None
-
-                    sprints_count = JiraSprint.objects.filter(issues__in=project_issues).distinct().count()
-                    comments_count = JiraComment.objects.filter(issue__in=project_issues).distinct().count()
-                    commits_count = JiraCommit.objects.filter(issue__in=project_issues).distinct().count()
-                    users_count = JiraUser.objects.filter().distinct().count()
+                    counts = dashboard_counts(project.id, start_date, end_date)
+                    latest_time_mined = counts['time_mined']
 
                     response_data = {
                         "project_name": project.name,
-                        "issues_count": project_issues.count(),
+                        "issues_count": counts['issues_count'],
                         "time_mined": latest_time_mined.isoformat() if latest_time_mined else None,
-                        "sprints_count": sprints_count,
-                        "comments_count": comments_count,
-                        "commits_count": commits_count,
-                        "users_count": users_count
+                        "sprints_count": counts['sprints_count'],
+                        "comments_count": counts['comments_count'],
+                        "commits_count": counts['commits_count'],
+                        "users_count": counts['users_count']
                     }
                 except JiraProject.DoesNotExist:
                     return Response(
@@ -181,27 +207,25 @@ def get(self, request):
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR
                     )
             else:
-                projects = JiraProject.objects.all()
-                projects_list = [{"id": p.id, "name": f"{p.name} ({p.key})"} for p in projects]
-
-                sprints_count = JiraSprint.objects.filter(issues__in=issues_query).distinct().count()
-                comments_count = JiraComment.objects.filter(issue__in=issues_query).distinct().count()
-                commits_count = JiraCommit.objects.filter(issue__in=issues_query).distinct().count()
-                users_count = JiraUser.objects.filter().distinct().count()
+                projects_list = [
+                    {"id": p['id'], "name": f"{p['name']} ({p['key']})"}
+                    for p in JiraProject.objects.values('id', 'name', 'key')
+                ]
+                counts = dashboard_counts(None, start_date, end_date)
 
                 response_data = {
-                    "issues_count": issues_query.count(),
+                    "issues_count": counts['issues_count'],
                     "projects_count": len(projects_list),
                     "projects": projects_list,
-                    "sprints_count": sprints_count,
-                    "comments_count": comments_count,
-                    "commits_count": commits_count,
-                    "users_count": users_count
+                    "sprints_count": counts['sprints_count'],
+                    "comments_count": counts['comments_count'],
+                    "commits_count": counts['commits_count'],
+                    "users_count": counts['users_count']
                 }
 
             return Response(response_data)
         except Exception as e:
-            print(e)
+            logger.error(f"Error in JiraDashboardView: {e}", exc_info=True)
             return Response({"error": "An internal server error occurred. Please try again later."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
@@ -2,13 +2,14 @@
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema
 
 from jira.models import JiraIssue, JiraProject, JiraSprint, JiraComment, JiraCommit, JiraUser, JiraChecklist, JiraIssueType, JiraIssueLink, JiraActivityLog, JiraHistory, JiraHistoryItem
 from jira.serializers import JiraIssueSerializer, JiraProjectSerializer, JiraUserSerializer, JiraSprintSerializer, JiraCommentSerializer, JiraChecklistSerializer, JiraIssueTypeSerializer, JiraIssueLinkSerializer, JiraCommitSerializer, JiraActivityLogSerializer, JiraHistorySerializer, JiraHistoryItemSerializer
 
 from utils.lookup import get_filterset_fields as _get_filterset_fields, get_search_fields as _get_search_fields
+from utils.search import FullTextSearchFilter
 
 class StandardPagination(PageNumberPagination):
     page_size = 100
@@ -21,7 +22,7 @@ class StandardPagination(PageNumberPagination):
 class JiraProjectListView(generics.ListAPIView):
     queryset = JiraProject.objects.all().order_by('id')
     serializer_class = JiraProjectSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(JiraProject)
     ordering_fields = '__all__'
     pagination_class = StandardPagination
@@ -34,7 +35,7 @@ class JiraProjectListView(generics.ListAPIView):
 class JiraUserListView(generics.ListAPIView):
     queryset = JiraUser.objects.all().order_by('accountId')
     serializer_class = JiraUserSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = _get_filterset_fields(JiraUser)
     ordering_fields = '__all__'
     pagination_class = StandardPagination
@@ -47,7 +48,7 @@ class JiraUserListView(generics.ListAPIView):
 class JiraIssueListView(generics.ListAPIView):
     queryset = JiraIssue.objects.all().order_by('issue_id')
     serializer_class = JiraIssueSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraIssue),
         'project': ['exact'],
@@ -64,7 +65,7 @@ class JiraIssueListView(generics.ListAPIView):
 class JiraChecklistListView(generics.ListAPIView):
     queryset = JiraChecklist.objects.all().order_by('id')
     serializer_class = JiraChecklistSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraChecklist),
         'issue__project': ['exact'],
@@ -81,7 +82,7 @@ class JiraChecklistListView(generics.ListAPIView):
 class JiraIssueTypeListView(generics.ListAPIView):
     queryset = JiraIssueType.objects.all().order_by('id')
     serializer_class = JiraIssueTypeSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraIssueType),
         'issue__project': ['exact'],
@@ -96,9 +97,9 @@ class JiraIssueTypeListView(generics.ListAPIView):
     tags=['Jira']
 )
 class JiraSprintListView(generics.ListAPIView):
-    queryset = JiraSprint.objects.all().order_by('id')
+    queryset = JiraSprint.objects.prefetch_related('issues').order_by('id')
     serializer_class = JiraSprintSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraSprint),
         'issues__project': ['exact'],
@@ -115,7 +116,7 @@ class JiraSprintListView(generics.ListAPIView):
 class JiraCommentListView(generics.ListAPIView):
     queryset = JiraComment.objects.all().order_by('id')
     serializer_class = JiraCommentSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraComment),
         'issue__project': ['exact'],
@@ -132,7 +133,7 @@ class JiraCommentListView(generics.ListAPIView):
 class JiraIssueLinkListView(generics.ListAPIView):
     queryset = JiraIssueLink.objects.all().order_by('id')
     serializer_class = JiraIssueLinkSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraIssueLink),
         'issue__project': ['exact'],
@@ -151,7 +152,7 @@ class JiraIssueLinkListView(generics.ListAPIView):
 class JiraCommitListView(generics.ListAPIView):
     queryset = JiraCommit.objects.all().order_by('id')
     serializer_class = JiraCommitSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraCommit),
         'issue__project': ['exact'],
@@ -168,7 +169,7 @@ class JiraCommitListView(generics.ListAPIView):
 class JiraActivityLogListView(generics.ListAPIView):
     queryset = JiraActivityLog.objects.all().order_by('id')
     serializer_class = JiraActivityLogSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraActivityLog),
         'issue__project': ['exact'],
@@ -185,7 +186,7 @@ class JiraActivityLogListView(generics.ListAPIView):
 class JiraHistoryListView(generics.ListAPIView):
     queryset = JiraHistory.objects.all().order_by('id')
     serializer_class = JiraHistorySerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraHistory),
         'issue__project': ['exact'],
@@ -202,7 +203,7 @@ class JiraHistoryListView(generics.ListAPIView):
 class JiraHistoryItemListView(generics.ListAPIView):
     queryset = JiraHistoryItem.objects.all().order_by('id')
     serializer_class = JiraHistoryItemSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = {
         **_get_filterset_fields(JiraHistoryItem),
         'history__issue__project': ['exact'],
@@ -0,0 +1,298 @@
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import (
+    JiraIssue,
+    JiraProject,
+    JiraUser,
+    JiraComment,
+    JiraHistory,
+    JiraHistoryItem,
+    JiraActivityLog,
+    JiraChecklist,
+    JiraSprint,
+    JiraCommit,
+    JiraIssueType
+)
+
+
+def _parse(value):
+    return parse_datetime(value) if value else None
+
+
+def _fields_except(model, *excluded):
+    """Concrete columns refreshed when a row already exists (primary key and natural key excluded)."""
+    return [
+        f.name for f in model._meta.concrete_fields
+        if not f.primary_key and not f.generated and f.name not in excluded
+    ]
+
+
+class JiraPageWriter:
+    """
+    Collects the rows of one search page and writes them with one bulk
+    statement per table.
+
+    Rows are upserted on their natural keys (Jira ids, or issue/history/field
+    for rows without one), so collecting the same range twice updates rows in
+    place instead of duplicating them. A page is written in one transaction.
+
+    `known_users` is shared by the pages of one run: users written by an
+    earlier page are not sent again.
+    """
+
+    def __init__(self, known_users=None):
+        self.known_users = known_users if known_users is not None else set()
+        self.projects = {}
+        self.users = {}
+        self.issues = {}
+        self.issue_types = {}
+        self.comments = {}
+        self.histories = {}
+        self.history_items = {}
+        self.activities = {}
+        self.checklists = {}
+        self.sprints = {}
+        self.sprint_links = set()
+        self.commits = {}
+
+    def __len__(self):
+        return len(self.issues)
+
+    def add_user(self, user_data):
+        if not user_data:
+            return None
+        account_id = user_data['accountId']
+        self.users.setdefault(account_id, JiraUser(
+            accountId=account_id,
+            displayName=user_data.get('displayName', ''),
+            emailAddress=user_data.get('emailAddress', ''),
+            active=user_data.get('active', True),
+            timeZone=user_data.get('timeZone', 'UTC'),
+            accountType=user_data.get('accountType', 'atlassian'),
+        ))
+        return account_id
+
+    def add_author(self, display_name):
+        """Comments, history and activity only carry a display name; they get a placeholder account."""
+        return self.add_user({
+            'accountId': f"temp_{(display_name or 'unknown').replace(' ', '_')}",
+            'displayName': display_name or 'Unknown',
+        })
+
+    def add_issue(self, issue_data, description, extras, time_mined=None):
+        """
+        Queue an issue and everything mined for it.
+
+        Args:
+            issue_data (dict): Issue from bulkfetch ('fields' already carries 'sprint')
+            description (str): Plain text description
+            extras (dict): comments, history, activities, checklist and commits of the issue
+            time_mined (datetime): Defaults to now
+        """
+        fields = issue_data['fields']
+        issue_id = issue_data['id']
+        project = fields['project']
+
+        self.projects.setdefault(project['id'], JiraProject(
+            id=project['id'],
+            key=project['key'],
+            name=project['name'],
+            simplified=project.get('simplified', False),
+            projectTypeKey=project['projectTypeKey'],
+        ))
+
+        self.issues[issue_id] = JiraIssue(
+            issue_id=issue_id,
+            issue_key=issue_data['key'],
+            project_id=project['id'],
+            created=_parse(fields['created']),
+            updated=_parse(fields['updated']),
+            status=fields['status']['name'],
+            priority=fields['priority']['name'] if fields.get('priority') else None,
+            assignee_id=self.add_user(fields.get('assignee')),
+            creator_id=self.add_user(fields['creator']),
+            reporter_id=self.add_user(fields.get('reporter')),
+            summary=fields['summary'],
+            description=description,
+            duedate=_parse(fields.get('duedate')),
+            timeoriginalestimate=fields.get('timeoriginalestimate'),
+            timeestimate=fields.get('timeestimate'),
+            timespent=fields.get('timespent'),
+            time_mined=time_mined or timezone.now(),
+            parent_issue_id=(fields.get('parent') or {}).get('id'),
+        )
+
+        issuetype = fields['issuetype']
+        self.issue_types[issue_id] = JiraIssueType(
+            issue_id=issue_id,
+            issuetype=issuetype['name'],
+            issuetype_description=issuetype.get('description', ''),
+            hierarchyLevel=issuetype.get('hierarchyLevel', 0),
+            subtask=issuetype.get('subtask', False),
+        )
+
+        for c in extras.get('comments') or []:
+            self.comments[c['id']] = JiraComment(
+                id=c['id'],
+                issue_id=issue_id,
+                author_id=self.add_author(c.get('author')),
+                body=c['body'],
+                created=_parse(c['created']),
+                updated=_parse(c['updated']),
+            )
+
+        for h in extras.get('history') or []:
+            self.histories[h['id']] = JiraHistory(
+                id=h['id'],
+                issue_id=issue_id,
+                author_id=self.add_author(h.get('author')),
+                created=_parse(h['created']),
+            )
+            for item in h['items']:
+                self.history_items[(h['id'], item['field'])] = JiraHistoryItem(
+                    history_id=h['id'],
+                    field=item['field'],
+                    fieldtype=item['fieldtype'],
+                    from_value=item['from'],
+                    to_value=item['to'],
+                    fromString=item['fromString'],
+                    toString=item['toString'],
+                )
+
+        for a in extras.get('activities') or []:
+            description = a['description'][:300]
+            self.activities[(issue_id, a['created'], description)] = JiraActivityLog(
+                issue_id=issue_id,
+                to_value=a.get('to'),
+                from_value=a.get('from'),
+                author_id=self.add_author(a.get('author')),
+                created=_parse(a['created']),
+                description=description,
+            )
+
+        checklist = extras.get('checklist')
+        if checklist:
+            self.checklists[issue_id] = JiraChecklist(
+                issue_id=issue_id,
+                checklist=checklist,
+                progress=f"Checklist: {sum(1 for i in checklist if i['completed'])}/{len(checklist)}",
+                completed=all(i['completed'] for i in checklist),
+            )
+
+        for c in extras.get('commits') or []:
+            self.commits[c['id']] = JiraCommit(
+                sha=c['id'],
+                issue_id=issue_id,
+                author=c.get('author') or '',
+                author_email=c.get('author_email') or '',
+                message=c.get('message'),
+                # repository: no GitHubMetadata mapping is attempted yet
+                repository=None,
+                timestamp=timezone.now(),  # Ideally parse from data if available
+            )
+
+        self.add_sprints(fields.get('sprint'), issue_id)
+
+    def add_sprints(self, sprints_data, issue_id):
+        if not sprints_data:
+            return
+        if isinstance(sprints_data, dict):  # If it comes as a single dict
+            sprints_data = [sprints_data]
+
+        for sprint in sprints_data:
+            self.sprints[sprint['id']] = JiraSprint(
+                id=sprint['id'],
+                name=sprint['name'],
+                goal=sprint.get('goal', ''),
+                state=sprint.get('state'),
+                boardId=sprint.get('originBoardId', 0),
+                startDate=_parse(sprint.get('startDate')),
+                endDate=_parse(sprint.get('endDate')),
+                completeDate=_parse(sprint.get('completeDate')),
+            )
+            self.sprint_links.add((sprint['id'], issue_id))
+
+    def _resolve_parents(self):
+        """Drop parent links to issues that are neither in this page nor already stored."""
+        parent_ids = {i.parent_issue_id for i in self.issues.values() if i.parent_issue_id}
+        missing = parent_ids - set(self.issues)
+        if missing:
+            missing -= set(JiraIssue.objects.filter(issue_id__in=missing).values_list('issue_id', flat=True))
+        for issue in self.issues.values():
+            if issue.parent_issue_id in missing:
+                issue.parent_issue_id = None
+
+    def _write_commits(self):
+        # Commits have no unique key in the schema: match on sha like before
+        existing = {
+            c.sha: c for c in JiraCommit.objects.filter(sha__in=list(self.commits))
+        }
+        to_update = []
+        for sha, commit in self.commits.items():
+            if sha in existing:
+                commit.pk = existing[sha].pk
+                to_update.append(commit)
+        if to_update:
+            JiraCommit.objects.bulk_update(
+                to_update, ['issue', 'author', 'author_email', 'message', 'repository', 'timestamp', 'updated_at']
+            )
+        JiraCommit.objects.bulk_create([c for c in self.commits.values() if c.pk is None])
+
+    def flush(self):
+        """Write the queued rows and reset the writer. Returns the number of issues written."""
+        if not self.issues:
+            return 0
+
+        self._resolve_parents()
+        now = timezone.now()
+        for commit in self.commits.values():
+            commit.updated_at = now
+
+        with transaction.atomic():
+            # Users and projects keep the values they were first stored with
+            JiraProject.objects.bulk_create(self.projects.values(), ignore_conflicts=True)
+            new_users = [u for account_id, u in self.users.items() if account_id not in self.known_users]
+            JiraUser.objects.bulk_create(new_users, ignore_conflicts=True)
+
+            JiraIssue.objects.bulk_create(
+                self.issues.values(), update_conflicts=True,
+                unique_fields=['issue_id'], update_fields=_fields_except(JiraIssue),
+            )
+            JiraIssueType.objects.bulk_create(
+                self.issue_types.values(), update_conflicts=True,
+                unique_fields=['issue'], update_fields=_fields_except(JiraIssueType, 'issue'),
+            )
+            JiraComment.objects.bulk_create(
+                self.comments.values(), update_conflicts=True,
+                unique_fields=['id'], update_fields=_fields_except(JiraComment),
+            )
+            JiraHistory.objects.bulk_create(
+                self.histories.values(), update_conflicts=True,
+                unique_fields=['id'], update_fields=_fields_except(JiraHistory),
+            )
+            JiraHistoryItem.objects.bulk_create(
+                self.history_items.values(), update_conflicts=True,
+                unique_fields=['history', 'field'], update_fields=_fields_except(JiraHistoryItem, 'history', 'field'),
+            )
+            JiraActivityLog.objects.bulk_create(self.activities.values(), ignore_conflicts=True)
+            JiraChecklist.objects.bulk_create(
+                self.checklists.values(), update_conflicts=True,
+                unique_fields=['issue'], update_fields=_fields_except(JiraChecklist, 'issue'),
+            )
+            JiraSprint.objects.bulk_create(
+                self.sprints.values(), update_conflicts=True,
+                unique_fields=['id'], update_fields=_fields_except(JiraSprint),
+            )
+            SprintIssue = JiraSprint.issues.through
+            SprintIssue.objects.bulk_create(
+                [SprintIssue(jirasprint_id=s, jiraissue_id=i) for s, i in self.sprint_links],
+                ignore_conflicts=True,
+            )
+            self._write_commits()
+
+        self.known_users.update(self.users)
+        written = len(self.issues)
+        self.__init__(known_users=self.known_users)
+        return written
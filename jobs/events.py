@@ -0,0 +1,128 @@
+import json
+import logging
+import time
+
+import redis
+from django.conf import settings
+from django.db import connection
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Per-task channel, and the channel carrying the events of every task
+TASK_CHANNEL_PREFIX = "jobs:task:"
+ALL_TASKS_CHANNEL = "jobs:tasks"
+
+# A task in one of these states sends no more events
+TERMINAL_STATUSES = frozenset({"COMPLETED", "SUCCESS", "FAILURE", "REVOKED"})
+
+# Task fields sent to subscribers; result payloads are not streamed, only their progress
+EVENT_FIELDS = ("task_id", "status", "operation", "type", "repository", "date_last_update", "cursor", "error")
+
+# After a failed publish, events are dropped for this many seconds instead of
+# retrying the connection on every save
+UNAVAILABLE_BACKOFF = 30
+
+_client = None
+_unavailable_until = 0.0
+
+
+def get_redis():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=5)
+    return _client
+
+
+def task_event(task):
+    """Progress snapshot of a Task, without loading fields deferred on the instance."""
+    deferred = task.get_deferred_fields()
+    event = {name: getattr(task, name) for name in EVENT_FIELDS if name not in deferred}
+    if "result" not in deferred and isinstance(task.result, dict) and "progress" in task.result:
+        event["progress"] = task.result["progress"]
+    return event
+
+
+def publish_task_event(task):
+    """
+    Publish the task's progress on its channel and on ALL_TASKS_CHANNEL.
+
+    Best effort: miners never fail because nobody can be told about their
+    progress.
+    """
+    global _unavailable_until
+    if time.monotonic() < _unavailable_until:
+        return
+    message = json.dumps(task_event(task), cls=DjangoJSONEncoder)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.publish(f"{TASK_CHANNEL_PREFIX}{task.task_id}", message)
+        pipe.publish(ALL_TASKS_CHANNEL, message)
+        pipe.execute()
+    except redis.RedisError as e:
+        _unavailable_until = time.monotonic() + UNAVAILABLE_BACKOFF
+        logger.warning(f"Task events unavailable for {UNAVAILABLE_BACKOFF}s: {e}")
+
+
+def _sse(data, event="task"):
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def stream_task_events(task_ids=None, heartbeat=15, max_seconds=None):
+    """
+    Server-sent events for the given tasks, or for every task when None.
+
+    A stream over given tasks starts with their current state and ends once
+    they have all finished. Streams send a comment every `heartbeat` seconds
+    of silence and close after `max_seconds` (TASK_EVENTS_MAX_SECONDS), as
+    EventSource clients reconnect on their own.
+    """
+    max_seconds = max_seconds or settings.TASK_EVENTS_MAX_SECONDS
+    pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+    # subscribe before reading the current state, so no event falls in between
+    if task_ids:
+        pubsub.subscribe(*[f"{TASK_CHANNEL_PREFIX}{task_id}" for task_id in task_ids])
+    else:
+        pubsub.subscribe(ALL_TASKS_CHANNEL)
+
+    try:
+        yield "retry: 3000\n\n"
+
+        pending = set(task_ids or [])
+        if task_ids:
+            for task in Task.objects.filter(task_id__in=task_ids).only(*EVENT_FIELDS, "result"):
+                yield _sse(json.dumps(task_event(task), cls=DjangoJSONEncoder))
+                if task.status in TERMINAL_STATUSES:
+                    pending.discard(task.task_id)
+            if not pending:
+                return
+
+        # the rest only reads Redis: do not hold a database connection for the whole stream
+        if not connection.in_atomic_block:
+            connection.close()
+
+        deadline = time.monotonic() + max_seconds
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=1.0)
+            if message is None:
+                if time.monotonic() - last_sent >= heartbeat:
+                    last_sent = time.monotonic()
+                    yield ": keepalive\n\n"
+                continue
+
+            data = message["data"]
+            data = data.decode() if isinstance(data, bytes) else data
+            last_sent = time.monotonic()
+            yield _sse(data)
+
+            if task_ids:
+                event = json.loads(data)
+                if event.get("status") in TERMINAL_STATUSES:
+                    pending.discard(event.get("task_id"))
+                    if not pending:
+                        return
+    finally:
+        pubsub.close()
@@ -0,0 +1,211 @@
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ACTIVE_STATUSES, Task
+
+logger = logging.getLogger(__name__)
+
+DEDUP_PREFIX = "jobs:dedup:"
+RANGES_PREFIX = "jobs:ranges:"
+
+# How long the mutex over a target's running ranges may be held, and waited for
+MUTEX_TIMEOUT = 10
+MUTEX_WAIT = 5.0
+
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, cls=DjangoJSONEncoder, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def request_key(task_name, args=None, kwargs=None):
+    """Cache key of a collection request: the task and every argument it is sent with."""
+    return f"{DEDUP_PREFIX}{_digest(str(task_name), list(args or []), kwargs or {})}"
+
+
+def _is_running(task_id):
+    """
+    Whether a task id still stands for a collection in progress. A task only
+    creates its Task row once a worker picks it up, so an id without a row is
+    still queued.
+    """
+    task_status = Task.objects.filter(task_id=task_id).values_list("status", flat=True).first()
+    return task_status is None or task_status in ACTIVE_STATUSES
+
+
+def dispatch_collection(task, args=None, kwargs=None):
+    """
+    Send a collection task unless an identical one is already queued or running.
+
+    Identical means the same task with the same arguments, i.e. the same
+    source, repository/project, data type and range. The request is then
+    coalesced onto the existing job.
+
+    Returns:
+        tuple: (task id, True when coalesced onto an existing job)
+    """
+    key = request_key(task.name, args, kwargs)
+    task_id = str(uuid.uuid4())
+    try:
+        existing = cache.get(key)
+        if existing and _is_running(existing):
+            return existing, True
+        if existing:
+            cache.delete(key)
+        if not cache.add(key, task_id, settings.COLLECTION_LOCK_TTL):
+            # an identical request won the race
+            existing = cache.get(key)
+            if existing:
+                return existing, True
+    except Exception as e:
+        logger.warning(f"Cache unavailable, {task.name} sent without deduplication: {e}")
+
+    task.apply_async(args=args, kwargs=kwargs, task_id=task_id)
+    return task_id, False
+
+
+def _bound(value):
+    """A range bound as an aware datetime; None is unbounded."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, str):
+        value = parse_datetime(value) or parse_date(value)
+        if value is None:
+            return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_timezone.utc)
+    return value
+
+
+def ranges_overlap(a, b):
+    """Whether two (start, end) ranges share any instant; a None bound is open."""
+    (a_start, a_end), (b_start, b_end) = a, b
+    return (a_start is None or b_end is None or a_start <= b_end) and (
+        b_start is None or a_end is None or b_start <= a_end
+    )
+
+
+class CollectionLock:
+    """
+    Ranges being collected for one (source, repository/project, data type).
+
+    Running ranges live in the shared cache under a short mutex. A range is
+    only granted while it overlaps none of them, so two collections of the
+    same data never write the same rows at once. A holder whose Task has
+    finished (or was orphaned) or that outlived COLLECTION_LOCK_TTL no longer
+    counts.
+    """
+
+    def __init__(self, source, target, data_type):
+        self.key = f"{RANGES_PREFIX}{source}:{_digest(target)}:{data_type}"
+        self.mutex_key = f"{self.key}:mutex"
+
+    def _lock_mutex(self):
+        token = str(uuid.uuid4())
+        deadline = time.monotonic() + MUTEX_WAIT
+        while not cache.add(self.mutex_key, token, MUTEX_TIMEOUT):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Mutex {self.mutex_key} still held after {MUTEX_WAIT}s")
+            time.sleep(0.05)
+        return token
+
+    def _unlock_mutex(self, token):
+        if cache.get(self.mutex_key) == token:
+            cache.delete(self.mutex_key)
+
+    def acquire(self, holder, start=None, end=None):
+        """
+        Grant [start, end] to `holder` (a task id).
+
+        Returns:
+            str | None: None once granted, else the id of a task collecting an overlapping range
+        """
+        wanted = (_bound(start), _bound(end))
+        token = self._lock_mutex()
+        try:
+            running = cache.get(self.key) or {}
+            now = time.time()
+            for task_id, entry in list(running.items()):
+                if now - entry["since"] > settings.COLLECTION_LOCK_TTL or not _is_running(task_id):
+                    del running[task_id]
+                elif task_id != holder and ranges_overlap(wanted, (_bound(entry["start"]), _bound(entry["end"]))):
+                    return task_id
+            running[holder] = {
+                "start": wanted[0] and wanted[0].isoformat(),
+                "end": wanted[1] and wanted[1].isoformat(),
+                "since": now,
+            }
+            cache.set(self.key, running, settings.COLLECTION_LOCK_TTL)
+            return None
+        finally:
+            self._unlock_mutex(token)
+
+    def release(self, holder):
+        token = self._lock_mutex()
+        try:
+            running = cache.get(self.key) or {}
+            if running.pop(holder, None) is not None:
+                cache.set(self.key, running, settings.COLLECTION_LOCK_TTL)
+        finally:
+            self._unlock_mutex(token)
+
+
+def collection_guard(source, data_type, target, start="start_date", end="end_date"):
+    """
+    Serialize overlapping runs of a bound collection task.
+
+    `target` names the argument(s) identifying the repository/project, and
+    `start`/`end` those holding the range. While another task collects an
+    overlapping range of the same target and data type, the task is retried
+    every COLLECTION_LOCK_RETRY seconds instead of running. Without a
+    reachable cache the task runs unguarded.
+    """
+    target_args = (target,) if isinstance(target, str) else tuple(target)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            call = signature.bind(self, *args, **kwargs)
+            call.apply_defaults()
+            values = call.arguments
+            holder = getattr(self.request, "id", None) or str(uuid.uuid4())
+            lock = CollectionLock(source, "/".join(str(values[name]) for name in target_args), data_type)
+
+            try:
+                busy = lock.acquire(holder, values.get(start), values.get(end))
+            except Exception as e:
+                logger.warning(f"Cache unavailable, {self.name} runs without a collection lock: {e}")
+                return func(self, *args, **kwargs)
+
+            if busy:
+                logger.info(f"{self.name} waits for {busy}, which collects an overlapping range")
+                raise self.retry(countdown=settings.COLLECTION_LOCK_RETRY, max_retries=None)
+
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                try:
+                    lock.release(holder)
+                    key = request_key(self.name, args, kwargs)
+                    if cache.get(key) == holder:
+                        cache.delete(key)
+                except Exception as e:
+                    logger.warning(f"Could not release the collection lock of {holder}: {e}")
+
+        return wrapper
+
+    return decorator
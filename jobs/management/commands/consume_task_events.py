@@ -0,0 +1,18 @@
+from celery import current_app
+from django.core.management.base import BaseCommand
+
+from jobs.monitor import TaskEventConsumer
+
+
+class Command(BaseCommand):
+    help = 'Keep the Task table in sync with Celery task and worker events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--flush-interval', type=float, default=2.0, help='Seconds between two batched writes')
+        parser.add_argument('--batch-size', type=int, default=500, help='Events buffered before an early write')
+
+    def handle(self, *args, **options):
+        self.stdout.write("Consuming Celery events...")
+        TaskEventConsumer(
+            current_app, flush_interval=options['flush_interval'], batch_size=options['batch_size'],
+        ).run()
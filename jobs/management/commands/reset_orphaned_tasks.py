@@ -1,23 +1,30 @@
+from celery import current_app
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from jobs.models import Task
+
+from jobs.monitor import live_task_ids, orphan_tasks, orphanable_tasks
 
 
 class Command(BaseCommand):
-    help = 'Reset orphaned tasks after container restart'
+    help = 'Fail the PENDING/STARTED tasks that no live worker runs or holds and that are no longer queued'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--timeout', type=float, default=5.0, help='Seconds to wait for worker replies')
 
     def handle(self, *args, **options):
-        orphaned_tasks = Task.objects.filter(status__in=['STARTED', 'PENDING'])
-        count = orphaned_tasks.count()
-        
-        if count == 0:
-            self.stdout.write("Nenhuma tarefa órfã encontrada")
+        active = orphanable_tasks()
+        if not active.exists():
+            self.stdout.write("No orphaned tasks found")
             return
-        
-        orphaned_tasks.update(
-            status='FAILURE',
-            error='Tarefa cancelada por reinício do container',
+
+        try:
+            alive = live_task_ids(current_app, timeout=options['timeout'])
+        except Exception as e:
+            # without the broker nothing can be told apart: leave every task as it is
+            self.stderr.write(f"Broker unavailable, no task reset: {e}")
+            return
+
+        count = orphan_tasks(
+            active.exclude(task_id__in=alive).only('pk', 'task_id', 'status', 'error', 'error_type'),
+            'Task lost: no live worker is running it and it is no longer queued',
         )
-        
-        self.stdout.write(f"Resetadas {count} tarefa(s) órfã(s)")
-        print(f"[INFO] Reset de {count} tarefas órfãs concluído")
+        self.stdout.write(f"Reset {count} orphaned task(s); {active.count()} still running or queued")
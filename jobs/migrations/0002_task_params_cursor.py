@@ -0,0 +1,23 @@
+# Generated by Django 5.1.8 on 2026-10-19 05:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='cursor',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='params',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-19 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='worker',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
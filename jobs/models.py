@@ -1,6 +1,16 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
 from django.db import models
 from django.utils import timezone
 
+# Statuses of tasks still waiting on Celery
+ACTIVE_STATUSES = ("PENDING", "STARTED")
+
+# result["status"] of a parent task whose subtasks are still running: its own
+# Celery task has returned, so its Celery state says nothing about the job
+AWAITING_SUBTASKS = "sharded"
+
+
 class Task(models.Model):
     task_id = models.CharField(max_length=255, unique=True)
     operation = models.TextField()
@@ -15,9 +25,41 @@ class Task(models.Model):
     error_type = models.CharField(max_length=100, null=True, blank=True)
     token_validation_error = models.BooleanField(default=False)
     result = models.JSONField(null=True, blank=True)
+    # Arguments the collection was started with, replayed by restarts
+    params = models.JSONField(null=True, blank=True)
+    # Position inside the day being collected (e.g. {"day": "2024-01-31", "page": 3}); empty between days
+    cursor = models.JSONField(null=True, blank=True)
+    # Hostname of the Celery worker running the task, as reported by its task-started event
+    worker = models.CharField(max_length=255, null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # listing newest first, and the background sync of active tasks
+            models.Index(fields=['-created_at'], name='jobs_task_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='jobs_task_status_created_idx'),
+        ]
+
+    def save_cursor(self, **cursor):
+        """Record the position of a running collection; no arguments clears it."""
+        self.cursor = cursor or None
+        self.save(update_fields=["cursor"])
+
+    def awaits_subtasks(self):
+        """Whether the row is only closed by its subtasks (e.g. a chord callback), not by its own Celery task."""
+        return isinstance(self.result, dict) and self.result.get("status") == AWAITING_SUBTASKS
+
+    def resume_from(self):
+        """
+        Where a restart picks up: the cursor day, else the day after the last
+        completed day, else date_init.
+        """
+        day = (self.cursor or {}).get("day")
+        if day:
+            return datetime.combine(datetime.strptime(day[:10], "%Y-%m-%d").date(), time.min, tzinfo=dt_timezone.utc)
+        if self.date_last_update:
+            return (self.date_last_update + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.date_init
 
     def __str__(self):
         return f"{self.operation} - {self.repository} ({self.task_id})"
@@ -0,0 +1,222 @@
+import json
+import logging
+import socket
+import time
+
+from django.conf import settings
+
+from .events import publish_task_event
+from .models import ACTIVE_STATUSES, AWAITING_SUBTASKS, Task
+
+logger = logging.getLogger(__name__)
+
+# Celery task events and the Task status they lead to
+TASK_EVENT_STATUSES = {
+    "task-started": "STARTED",
+    "task-succeeded": "SUCCESS",
+    "task-failed": "FAILURE",
+    "task-revoked": "REVOKED",
+    "task-rejected": "FAILURE",
+}
+
+WORKER_EVENTS = ("worker-online", "worker-heartbeat", "worker-offline")
+
+
+def orphanable_tasks():
+    """Active tasks a lost worker leaves unfinished; parents waiting on subtasks no longer run on one."""
+    return Task.objects.filter(status__in=ACTIVE_STATUSES).exclude(result__status=AWAITING_SUBTASKS)
+
+
+def orphan_tasks(tasks, reason):
+    """Fail active tasks whose worker is gone, and tell their subscribers."""
+    tasks = list(tasks)
+    for task in tasks:
+        task.status = "FAILURE"
+        task.error = reason
+        task.error_type = "WORKER_LOST"
+    Task.objects.bulk_update(tasks, ["status", "error", "error_type"])
+    for task in tasks:
+        publish_task_event(task)
+    return len(tasks)
+
+
+def queued_task_ids(app):
+    """Ids of the task messages still waiting in the default queue (Redis broker only)."""
+    with app.connection_for_read() as connection:
+        if connection.transport.driver_type != "redis":
+            return set()
+        messages = connection.default_channel.client.lrange(app.conf.task_default_queue, 0, -1)
+    ids = set()
+    for raw in messages:
+        try:
+            ids.add(json.loads(raw)["headers"]["id"])
+        except (ValueError, KeyError, TypeError):
+            continue
+    return ids
+
+
+def live_task_ids(app, timeout=5.0):
+    """
+    Ids of the tasks some live worker is running, holds or has scheduled,
+    plus those still queued in the broker: none of them is orphaned.
+    """
+    inspect = app.control.inspect(timeout=timeout)
+    ids = set()
+    for replies in (inspect.active(), inspect.reserved(), inspect.scheduled()):
+        for tasks in (replies or {}).values():
+            for task in tasks:
+                # scheduled (eta) entries wrap the task under "request"
+                ids.add((task.get("request") or task).get("id"))
+    return ids | queued_task_ids(app)
+
+
+class TaskEventConsumer:
+    """
+    Keeps the Task table in sync with the events sent by Celery workers.
+
+    Task events are buffered and written every `flush_interval` seconds (or
+    every `batch_size` events) with one bulk update per field set; a row only
+    changes while it is PENDING/STARTED, so the status a task wrote itself
+    (COMPLETED, FAILURE with its error) is never overwritten.
+
+    Workers are followed through their heartbeats: the active tasks of a
+    worker that goes offline, or stays silent for `worker_lost_after`
+    seconds, are failed as orphaned. Tasks of live workers are left alone.
+    """
+
+    def __init__(self, app, flush_interval=2.0, batch_size=500, worker_lost_after=None):
+        self.app = app
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.worker_lost_after = worker_lost_after or settings.TASK_WORKER_LOST_AFTER
+        self.started_at = time.time()
+        self.last_flush = time.monotonic()
+        # task id -> {"fields": latest {"status", "worker", "error"}, "since": first event time}
+        self.pending = {}
+        # worker hostname -> time of its last event
+        self.last_seen = {}
+
+    def handlers(self):
+        handlers = {name: self.on_task_event for name in TASK_EVENT_STATUSES}
+        handlers.update({name: self.on_worker_event for name in WORKER_EVENTS})
+        return handlers
+
+    def on_task_event(self, event):
+        hostname = event.get("hostname")
+        if hostname:
+            self.last_seen[hostname] = time.time()
+
+        entry = self.pending.setdefault(event["uuid"], {"fields": {}, "since": time.monotonic()})
+        update = entry["fields"]
+        status = TASK_EVENT_STATUSES[event["type"]]
+        # events can arrive out of order: a finished task never goes back to STARTED
+        if not (status == "STARTED" and update.get("status") not in (None, "STARTED")):
+            update["status"] = status
+        if hostname and event["type"] == "task-started":
+            update["worker"] = hostname
+        if status == "FAILURE":
+            update["error"] = event.get("exception") or event.get("type")
+        elif status == "REVOKED":
+            update["error"] = "Task revoked"
+        self.tick()
+
+    def on_worker_event(self, event):
+        hostname = event.get("hostname")
+        if event["type"] == "worker-offline":
+            self.last_seen.pop(hostname, None)
+            self.flush()
+            self.orphan_worker_tasks([hostname], f"Worker {hostname} went offline")
+        elif hostname:
+            self.last_seen[hostname] = time.time()
+        self.tick()
+
+    def tick(self):
+        """Flush when the batch is full or the interval has elapsed, then look for lost workers."""
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+            self.check_workers()
+
+    def flush(self):
+        """
+        Apply the buffered task events. Returns the number of rows updated.
+
+        Most tasks create their Task row once running, after task-started was
+        sent: events of unknown ids are kept for a while for a later flush.
+        """
+        entries, self.pending = self.pending, {}
+        self.last_flush = time.monotonic()
+        if not entries:
+            return 0
+
+        changed = {}
+        found = set()
+        for task in Task.objects.filter(task_id__in=list(entries)).only(
+            "pk", "task_id", "status", "worker", "error", "result"
+        ):
+            found.add(task.task_id)
+            # a sharded parent returns long before its shards: the chord callback closes it
+            if task.status not in ACTIVE_STATUSES or task.awaits_subtasks():
+                continue
+            update = entries[task.task_id]["fields"]
+            fields = tuple(name for name, value in update.items() if getattr(task, name) != value)
+            for name in fields:
+                setattr(task, name, update[name])
+            if fields:
+                changed.setdefault(fields, []).append(task)
+
+        for task_id, entry in entries.items():
+            if task_id not in found and time.monotonic() - entry["since"] < self.worker_lost_after:
+                newer = self.pending.get(task_id)
+                if newer:
+                    entry = {"fields": {**entry["fields"], **newer["fields"]}, "since": entry["since"]}
+                self.pending[task_id] = entry
+
+        for fields, tasks in changed.items():
+            Task.objects.bulk_update(tasks, list(fields))
+            for task in tasks:
+                publish_task_event(task)
+        return sum(len(tasks) for tasks in changed.values())
+
+    def lost_workers(self):
+        """Workers that ran an active task and have not been heard from for worker_lost_after seconds."""
+        now = time.time()
+        workers = (
+            orphanable_tasks().filter(worker__isnull=False)
+            .values_list("worker", flat=True).distinct()
+        )
+        return [
+            hostname for hostname in workers
+            if now - self.last_seen.get(hostname, self.started_at) > self.worker_lost_after
+        ]
+
+    def check_workers(self):
+        lost = self.lost_workers()
+        if lost:
+            self.orphan_worker_tasks(lost, f"No heartbeat from worker for {self.worker_lost_after}s")
+
+    def orphan_worker_tasks(self, hostnames, reason):
+        count = orphan_tasks(
+            orphanable_tasks().filter(worker__in=hostnames).only(
+                "pk", "task_id", "status", "error", "error_type"
+            ),
+            reason,
+        )
+        if count:
+            logger.warning(f"{count} task(s) of {', '.join(hostnames)} marked as orphaned: {reason}")
+        return count
+
+    def run(self):
+        """Consume events until interrupted."""
+        wakeup = True
+        with self.app.connection_for_read() as connection:
+            receiver = self.app.events.Receiver(connection, handlers=self.handlers())
+            while True:
+                try:
+                    # ask the workers for a heartbeat on the first connection, then just listen
+                    for _ in receiver.itercapture(limit=None, timeout=self.flush_interval, wakeup=wakeup):
+                        wakeup = False
+                except socket.timeout:
+                    pass
+                wakeup = False
+                self.flush()
+                self.check_workers()
@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .events import publish_task_event
+from .models import Task
+
+
+@receiver(post_save, sender=Task)
+def publish_task_progress(sender, instance, **kwargs):
+    """Every saved progress step of a task is pushed to its event stream once committed."""
+    transaction.on_commit(lambda: publish_task_event(instance))
@@ -1,4 +1,221 @@
-from celery import shared_task
-from .models import Task
+import json
+import logging
+import os
+import traceback
+import uuid
 
-# As tasks foram removidas pois não estavam sendo utilizadas
\ No newline at end of file
+from celery import current_app, shared_task
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .events import publish_task_event
+from .models import ACTIVE_STATUSES, Task
+from utils.export import EXPORT_FILE_EXTENSIONS, write_export_file
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TASK_TYPE = "export_data"
+
+# Tasks reconciled per run of sync_task_statuses
+SYNC_BATCH_SIZE = 500
+
+
+def _to_query_dict(query_params):
+    query_dict = QueryDict(mutable=True)
+    for key, values in (query_params or {}).items():
+        query_dict.setlist(key, values if isinstance(values, list) else [values])
+    return query_dict
+
+
+def queue_export(request, builder, repository):
+    """
+    Register an export Task and dispatch export_data_task for it.
+
+    Args:
+        request: DRF request of the export view (body and querystring are forwarded)
+        builder: Dotted path of the function turning (data, query_params) into an ExportPlan
+        repository: Label stored on the Task (e.g. 'GitHub')
+
+    Returns:
+        Payload for the 202 response
+    """
+    task_id = str(uuid.uuid4())
+    Task.objects.create(
+        task_id=task_id,
+        operation=f"Export queued ({repository})",
+        repository=repository,
+        type=EXPORT_TASK_TYPE,
+        status="PENDING",
+    )
+
+    data = request.data.dict() if isinstance(request.data, QueryDict) else dict(request.data)
+    export_data_task.apply_async(
+        args=[builder, data, dict(request.query_params.lists())],
+        task_id=task_id,
+    )
+
+    return {
+        "task_id": task_id,
+        "message": "Export scheduled",
+        "status_endpoint": request.build_absolute_uri(reverse("task-status", args=[task_id])),
+        "download_url": request.build_absolute_uri(reverse("task-download", args=[task_id])),
+    }
+
+
+@shared_task(bind=True)
+def export_data_task(self, builder, data, query_params=None):
+    """
+    Write an export to a compressed file in EXPORT_DIRECTORY.
+
+    Rows are read with a server-side cursor and written as they arrive, so the
+    worker's memory does not grow with the export size. Progress is stored in
+    Task.result['progress'] while the file is being written.
+    """
+    task_id = self.request.id or str(uuid.uuid4())
+    task_obj, _ = Task.objects.get_or_create(
+        task_id=task_id,
+        defaults={
+            "operation": "Export",
+            "repository": "export",
+            "type": EXPORT_TASK_TYPE,
+        },
+    )
+    task_obj.status = "STARTED"
+    task_obj.date_init = timezone.now()
+    task_obj.save(update_fields=["status", "date_init"])
+
+    try:
+        plan = import_string(builder)(data, _to_query_dict(query_params))
+        total = plan.queryset.count()
+
+        file_name = f"{plan.filename_base}_{task_id}.{EXPORT_FILE_EXTENSIONS[plan.format_type]}"
+        os.makedirs(settings.EXPORT_DIRECTORY, exist_ok=True)
+        path = os.path.join(settings.EXPORT_DIRECTORY, file_name)
+
+        def progress(rows):
+            return {
+                "rows": rows,
+                "total": total,
+                "percent": round(rows * 100 / total, 1) if total else 100.0,
+            }
+
+        def report(rows):
+            task_obj.result = {"progress": progress(rows)}
+            task_obj.date_last_update = timezone.now()
+            Task.objects.filter(pk=task_obj.pk).update(
+                result=task_obj.result,
+                date_last_update=task_obj.date_last_update,
+            )
+            publish_task_event(task_obj)
+
+        task_obj.operation = f"Exporting {total} rows to {file_name}"
+        task_obj.result = {"progress": progress(0)}
+        task_obj.save(update_fields=["operation", "result"])
+
+        rows = write_export_file(plan.queryset, plan.fields, plan.format_type, path, on_progress=report)
+
+        result_payload = {
+            "operation": "export_data",
+            "repository": task_obj.repository,
+            "file": file_name,
+            "format": plan.format_type,
+            "rows": rows,
+            "size_bytes": os.path.getsize(path),
+            "progress": progress(rows),
+            "status": "success",
+        }
+
+        task_obj.status = "COMPLETED"
+        task_obj.operation = f"Export completed: {file_name}"
+        task_obj.date_end = timezone.now()
+        task_obj.result = result_payload
+        task_obj.save(update_fields=["status", "operation", "date_end", "result"])
+
+        return result_payload
+
+    except Exception as e:
+        logger.error(f"Export task {task_id} failed: {e}", exc_info=True)
+        result_payload = {
+            "operation": "export_data",
+            "repository": task_obj.repository,
+            "status": "error",
+            "message": str(e),
+            "traceback": traceback.format_exc(),
+        }
+        task_obj.status = "FAILURE"
+        task_obj.error = str(e)
+        task_obj.error_type = "EXPORT_FAILED"
+        task_obj.result = result_payload
+        task_obj.save(update_fields=["status", "error", "error_type", "result"])
+        # let Celery record the failure too, so its state agrees with the row
+        raise
+
+
+def reconcile_task(task, state, result):
+    """
+    Apply a Celery state to a Task row. Returns the changed field names.
+
+    Only PENDING/STARTED rows change: a status the task wrote itself
+    (COMPLETED, FAILURE with its error) is final, as in TaskEventConsumer.
+    PENDING is also what Celery reports for unknown ids, so it never
+    overwrites a recorded status, and a parent waiting on its subtasks is
+    left to them.
+    """
+    if task.status not in ACTIVE_STATUSES or state in (task.status, "PENDING") or task.awaits_subtasks():
+        return []
+
+    task.status = state
+    changed = ["status"]
+    if state == "SUCCESS" and not task.result:
+        task.result = json.loads(json.dumps(result, cls=DjangoJSONEncoder))
+        changed.append("result")
+    elif state == "FAILURE":
+        task.error = str(result)
+        changed.append("error")
+    return changed
+
+
+@shared_task(name="jobs.sync_task_statuses", ignore_result=True)
+def sync_task_statuses(batch_size=SYNC_BATCH_SIZE):
+    """
+    Periodic reconciliation of PENDING/STARTED tasks with their Celery state.
+
+    Runs from beat (CELERY_BEAT_SCHEDULE), so listing tasks never polls
+    Celery. Changed rows are written with one bulk update per field set and
+    published to the task event streams.
+
+    Returns:
+        int: Number of tasks updated
+    """
+    tasks = list(
+        Task.objects.filter(status__in=ACTIVE_STATUSES)
+        .only("pk", "task_id", "status", "result", "error")
+        .order_by("created_at")[:batch_size]
+    )
+
+    changed = {}
+    for task in tasks:
+        try:
+            async_result = AsyncResult(task.task_id, app=current_app)
+            fields = reconcile_task(task, async_result.state, async_result.result)
+        except Exception as e:
+            logger.warning(f"Could not read the Celery state of task {task.task_id}: {e}")
+            continue
+        if fields:
+            changed.setdefault(tuple(fields), []).append(task)
+
+    for fields, rows in changed.items():
+        Task.objects.bulk_update(rows, fields)
+        # bulk_update sends no post_save: tell the event streams directly
+        for task in rows:
+            publish_task_event(task)
+
+    updated = sum(len(rows) for rows in changed.values())
+    if updated:
+        logger.info(f"Task statuses reconciled: {updated} of {len(tasks)} active tasks changed")
+    return updated
@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import TaskStatusView, TaskListView, RestartCollectionView
+from .views import TaskStatusView, TaskListView, TaskDownloadView, TaskEventsView, RestartCollectionView
 
 urlpatterns = [
     path('', TaskListView.as_view(), name='task-list'),
     path('tasks/<str:task_id>/', TaskStatusView.as_view(), name='task-status'),
+    path('tasks/<str:task_id>/download/', TaskDownloadView.as_view(), name='task-download'),
+    path('tasks/<str:task_id>/events/', TaskEventsView.as_view(), name='task-events'),
+    path('events/', TaskEventsView.as_view(), name='task-events-all'),
     path('restart-collection/<str:task_id>/', RestartCollectionView.as_view(), name='restart-collection'),
 ]
@@ -4,11 +4,19 @@
 from celery.result import AsyncResult
 from celery import current_app
 from rest_framework import generics
+from rest_framework.pagination import PageNumberPagination
+from django_filters.rest_framework import DjangoFilterBackend
+from .events import stream_task_events
 from .models import Task
 from .serializers import TaskSerializer
+from .tasks import EXPORT_TASK_TYPE, reconcile_task
 import logging
 import json
-from datetime import datetime, timedelta
+import os
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from datetime import datetime
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from django.utils.module_loading import import_string
 
@@ -22,62 +30,47 @@ def default(self, obj):
             return obj.isoformat()
         return super().default(obj)
 
+class TaskPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
 class TaskListView(generics.ListAPIView):
-    queryset = Task.objects.all().order_by('-created_at')
+    """
+    Paginated, read-only listing of the Task table.
+
+    Statuses are not polled from Celery here: jobs.tasks.sync_task_statuses
+    reconciles them in the background.
+    """
+    # the serialized columns only: result/params payloads can be large
+    queryset = Task.objects.only(
+        'task_id', 'operation', 'repository', 'created_at', 'status', 'error'
+    ).order_by('-created_at')
     serializer_class = TaskSerializer
-    
+    pagination_class = TaskPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'type', 'repository']
+
     @extend_schema(
         summary="List all tasks",
         tags=['Jobs'],
+        parameters=[
+            OpenApiParameter(name='page', type=int, description='Page number'),
+            OpenApiParameter(name='page_size', type=int, description='Tasks per page (default 50, max 500)'),
+            OpenApiParameter(name='status', type=str, description='Only tasks with this status'),
+            OpenApiParameter(name='type', type=str, description='Only tasks of this type'),
+        ],
         responses={
             200: OpenApiResponse(
                 response=TaskSerializer(many=True),
-                description="List of tasks with their current status"
+                description="Page of tasks with their current status"
             )
         },
-        description='Get a list of all tasks with their current status'
+        description='Get a page of tasks, newest first, with the status last recorded for each'
     )
     def get(self, request, *args, **kwargs):
-        # Get all tasks from the database
-        tasks = self.get_queryset()
-        
-        # Update the status of all pending tasks
-        for task in tasks:
-            if task.status in ['PENDING', 'STARTED']:
-                logger.info(f"Updating status of pending task: {task.task_id}")
-                try:
-                    # Get the task result from Celery
-                    task_result = AsyncResult(task.task_id, app=current_app)
-                    
-                    # If the status has changed, update in the database
-                    if task_result.state != task.status:
-                        logger.info(f"Task status {task.task_id} changed from {task.status} to {task_result.state}")
-                        task.status = task_result.state
-                        
-                        # If the task completed successfully, save the result
-                        if task_result.state == 'SUCCESS':
-                            # Convert the result to JSON using the custom encoder
-                            result_json = json.dumps(task_result.result, cls=DateTimeEncoder)
-                            task.result = json.loads(result_json)
-                            logger.info(f"Task completed successfully: {task.task_id}")
-                        # If the task failed, save the error
-                        elif task_result.state == 'FAILURE':
-                            task.error = str(task_result.result)
-                            logger.error(f"Task failed: {task.task_id}, error: {task.error}")
-                        
-                        # Save changes to the database
-                        task.save()
-                        logger.info(f"Task status updated in database: {task.task_id}, new status: {task.status}")
-                except Exception as e:
-                    logger.error(f"Error updating task status {task.task_id}: {str(e)}", exc_info=True)
-        
-        # Serialize the tasks
-        serializer = self.get_serializer(tasks, many=True)
-        
-        return Response({
-            "count": tasks.count(),
-            "results": serializer.data
-        }, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
 class TaskStatusView(APIView):
     @extend_schema(
@@ -116,34 +109,26 @@ def get(self, request, task_id):
             task_result = AsyncResult(task_id, app=current_app)
             logger.info(f"Task state in Celery: {task_result.state}")
             
-            # Update the task status in the database
-            task.status = task_result.state
-            
-            # If the task completed successfully, save the result
-            if task_result.state == 'SUCCESS':
-                # Convert the result to JSON using the custom encoder
-                result_json = json.dumps(task_result.result, cls=DateTimeEncoder)
-                task.result = json.loads(result_json)
-                logger.info(f"Task completed successfully: {task_id}")
-            # If the task failed, save the error
-            elif task_result.state == 'FAILURE':
-                task.error = str(task_result.result)
-                logger.error(f"Task failed: {task_id}, error: {task.error}")
-            
-            # Save changes to the database
-            task.save()
-            logger.info(f"Task status updated in database: {task_id}, new status: {task.status}")
+            # Only write the row when Celery knows something new about it
+            changed = reconcile_task(task, task_result.state, task_result.result)
+            if changed:
+                task.save(update_fields=changed)
+                logger.info(f"Task status updated in database: {task_id}, new status: {task.status}")
             
-            # Prepare the response
+            # Prepare the response; a parent waiting on its subtasks reports its row
             response_data = {
                 "task_id": task_id,
-                "status": task_result.state,
+                "status": task.status if task.awaits_subtasks() else task_result.state,
                 "error": str(task_result.result) if task_result.state == 'FAILURE' else None
             }
             
             # Add the result only if the task completed successfully
-            if task_result.state == 'SUCCESS':
+            if response_data["status"] == 'SUCCESS':
                 response_data["result"] = task_result.result
+
+            # Export jobs keep their progress on the task row
+            if isinstance(task.result, dict) and "progress" in task.result:
+                response_data["progress"] = task.result["progress"]
             
             return Response(response_data, status=status.HTTP_200_OK)
             
@@ -252,9 +237,88 @@ def delete(self, request, task_id):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class EventStreamRenderer(BaseRenderer):
+    """Lets EventSource clients (Accept: text/event-stream) through content negotiation."""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DateTimeEncoder)
+
+
+class TaskEventsView(APIView):
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    @extend_schema(
+        summary="Stream task progress (server-sent events)",
+        tags=['Jobs'],
+        parameters=[
+            OpenApiParameter(name='task_id', type=str, location=OpenApiParameter.PATH, required=False,
+                             description='Task to follow; the stream ends when it finishes'),
+            OpenApiParameter(name='task_id', type=str, location=OpenApiParameter.QUERY, many=True, required=False,
+                             description='On /jobs/events/: tasks to follow (repeatable); none follows every task'),
+        ],
+        responses={
+            200: OpenApiResponse(description="text/event-stream of `task` events (status, operation, progress, cursor)"),
+            404: OpenApiResponse(description="Task not found"),
+        },
+        description='Push-based alternative to polling the task status: progress saved by the miners is '
+                    'published through Redis and forwarded as server-sent events.'
+    )
+    def get(self, request, task_id=None):
+        task_ids = [task_id] if task_id else request.query_params.getlist('task_id')
+        if task_id and not Task.objects.filter(task_id=task_id).exists():
+            return Response({"error": "Task not found", "task_id": task_id}, status=status.HTTP_404_NOT_FOUND)
+
+        response = StreamingHttpResponse(stream_task_events(task_ids or None), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # nginx must not buffer the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class TaskDownloadView(APIView):
+    @extend_schema(
+        summary="Download export file",
+        tags=['Jobs'],
+        parameters=[
+            OpenApiParameter(name='task_id', type=str, location=OpenApiParameter.PATH, description='Export task ID'),
+        ],
+        responses={
+            200: OpenApiResponse(description="Compressed export file"),
+            404: OpenApiResponse(description="Task or file not found"),
+            409: OpenApiResponse(description="Export not finished yet"),
+        },
+        description='Download the file written by an asynchronous export job'
+    )
+    def get(self, request, task_id):
+        try:
+            task = Task.objects.get(task_id=task_id, type=EXPORT_TASK_TYPE)
+        except Task.DoesNotExist:
+            return Response({"error": "Export task not found", "task_id": task_id}, status=status.HTTP_404_NOT_FOUND)
+
+        # gated on the written file, not on the row status that status polls may rewrite
+        result = task.result if isinstance(task.result, dict) else {}
+        file_name = result.get("file")
+        if result.get("status") != "success" or not file_name:
+            return Response({
+                "error": "Export not finished yet",
+                "task_id": task_id,
+                "status": task.status,
+                "progress": result.get("progress"),
+            }, status=status.HTTP_409_CONFLICT)
+
+        path = os.path.join(settings.EXPORT_DIRECTORY, os.path.basename(file_name))
+        if not os.path.isfile(path):
+            return Response({"error": "Export file no longer available", "task_id": task_id}, status=status.HTTP_404_NOT_FOUND)
+
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=os.path.basename(path))
+
+
 class RestartCollectionView(APIView):
     @extend_schema(
-        summary="Restart collection from last progress + 1 day",
+        summary="Restart collection from its cursor (day and page), else last progress + 1 day",
         tags=["Jobs"],
         parameters=[
             OpenApiParameter(name='task_id', type=str, location=OpenApiParameter.PATH, description='Task ID to restart')
@@ -275,6 +339,12 @@ def post(self, request, task_id):
             logger.error(f"Task not found: {task_id}")
             return Response({"error": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        if task_obj.type == EXPORT_TASK_TYPE:
+            return Response(
+                {"error": "Export tasks cannot be restarted. Request a new export instead."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         # Check if task can be restarted
         current_status = (getattr(task_obj, "status", "") or "").upper()
         if current_status == "SUCCESS":
@@ -283,12 +353,8 @@ def post(self, request, task_id):
                 status=status.HTTP_409_CONFLICT
             )
 
-        # Calculate resume_from = date_last_update + 1 day; fallback to date_init
-        resume_from = getattr(task_obj, "date_last_update", None)
-        if resume_from:
-            resume_from = (resume_from + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
-            resume_from = getattr(task_obj, "date_init", None)
+        # Cursor day, else the day after date_last_update, else date_init
+        resume_from = task_obj.resume_from()
 
         # Route to appropriate restart handler based on task type
         task_type = getattr(task_obj, "type", "")
@@ -332,6 +398,7 @@ def post(self, request, task_id):
             "message": "Restart scheduled",
             "celery_task_id": async_result.id,
             "resume_from": resume_from.isoformat() if resume_from else None,
+            "resume_cursor": task_obj.cursor,
             "status_endpoint": request.build_absolute_uri(f"/api/jobs/tasks/{task_obj.task_id}/"),
             "db_task_pk": task_obj.id
         }, status=status.HTTP_202_ACCEPTED)
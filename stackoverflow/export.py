@@ -1,64 +1,55 @@
-import csv
-import json
-from io import StringIO
-
-from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 from stackoverflow.models import StackQuestion
 from .serializers import ExportStackoverflowDataSerializer
+from jobs.tasks import queue_export
+from utils.export import ExportError, ExportPlan, streaming_export_response
 
 
-class ExportStackoverflowCSVView(APIView):
-    def post(self, request):
-        serializer = ExportStackoverflowDataSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+def build_export(data, query_params=None):
+    """Validate an export request and build its queryset (also used by the async export job)."""
+    serializer = ExportStackoverflowDataSerializer(data=data)
+    if not serializer.is_valid():
+        raise ExportError(serializer.errors)
 
-        ids = serializer.validated_data.get("ids", [])
-        min_score = serializer.validated_data.get("min_score")
-        format_type = serializer.validated_data.get("format", "csv")
+    ids = serializer.validated_data.get("ids", [])
+    min_score = serializer.validated_data.get("min_score")
+    format_type = serializer.validated_data.get("format", "csv")
 
-        queryset = StackQuestion.objects.all()
-        if ids:
-            queryset = queryset.filter(question_id__in=ids)
-        if min_score is not None:
-            queryset = queryset.filter(score__gte=min_score)
+    queryset = StackQuestion.objects.all()
+    if ids:
+        queryset = queryset.filter(question_id__in=ids)
+    if min_score is not None:
+        queryset = queryset.filter(score__gte=min_score)
 
-        if not queryset.exists():
-            return Response({"error": "No data found to export"}, status=status.HTTP_404_NOT_FOUND)
+    if not queryset.exists():
+        raise ExportError("No data found to export", status.HTTP_404_NOT_FOUND)
 
-        data = []
-        for q in queryset:
-            data.append({
-                "question_id": q.question_id,
-                "title": q.title,
-                "score": q.score,
-                "creation_date": q.creation_date,
-                "link": q.link
-            })
+    return ExportPlan(
+        queryset=queryset,
+        fields=["question_id", "title", "score", "creation_date", "link"],
+        format_type=format_type,
+        filename_base="stackoverflow_export",
+        run_async=serializer.validated_data["run_async"],
+    )
 
-        filename = "stackoverflow_export.csv" if format_type == "csv" else "stackoverflow_export.json"
 
+class ExportStackoverflowCSVView(APIView):
+    def post(self, request):
         try:
-            if format_type == "csv":
-                buffer = StringIO()
-                writer = csv.DictWriter(buffer, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
-
-                response = HttpResponse(buffer.getvalue(), content_type='text/csv')
-            else:
-                response = HttpResponse(
-                    json.dumps(data, indent=2, default=str),
-                    content_type='application/json'
-                )
+            plan = build_export(request.data)
+        except ExportError as e:
+            return Response(e.payload, status=e.status_code)
 
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            response['Access-Control-Expose-Headers'] = 'Content-Disposition'
-            return response
+        if plan.run_async:
+            return Response(
+                queue_export(request, "stackoverflow.export.build_export", "Stack Overflow"),
+                status=status.HTTP_202_ACCEPTED,
+            )
 
+        try:
+            return streaming_export_response(plan.queryset, plan.fields, plan.format_type, plan.filename_base)
         except Exception as e:
             return Response({"error": f"Export failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
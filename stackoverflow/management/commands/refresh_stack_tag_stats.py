@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from stackoverflow.stats import refresh_tag_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-tag daily counters of the Stack Overflow dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', help='First day (YYYY-MM-DD); default: the first stored question')
+        parser.add_argument('--end-date', help='Last day (YYYY-MM-DD); default: the last stored question')
+
+    def handle(self, *args, **options):
+        written = refresh_tag_stats(options['start_date'], options['end_date'])
+        self.stdout.write(f"{written} (tag, day) rows refreshed")
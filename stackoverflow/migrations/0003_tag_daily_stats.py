@@ -0,0 +1,40 @@
+# Generated by Django 5.1.8 on 2026-10-19 05:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_tag_stats(apps, schema_editor):
+    """Compute the counters of the questions mined before the table existed."""
+    from stackoverflow.stats import refresh_tag_stats
+
+    refresh_tag_stats()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stackoverflow', '0002_stackquestion_search_vector_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StackTagDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(blank=True, default='', max_length=255)),
+                ('day', models.DateField()),
+                ('questions', models.IntegerField(default=0)),
+                ('answers', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+                ('users', models.IntegerField(default=0)),
+                ('last_mined', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'stack_tag_daily_stats',
+                'constraints': [models.UniqueConstraint(fields=('tag', 'day'), name='stack_tag_daily_stats_tag_day')],
+            },
+        ),
+        migrations.RunPython(backfill_tag_stats, migrations.RunPython.noop),
+    ]
@@ -1,28 +1,31 @@
 import requests
-from datetime import datetime, timezone as dt_timezone, timedelta
+from datetime import date, datetime, timezone as dt_timezone, timedelta
 import time
 import logging
-from stackoverflow.models import StackQuestion, StackUser, StackAnswer, StackTag, StackComment
-from django.utils import timezone
+from django.db.models import F, Min
 from jobs.models import Task
-from stackoverflow.utils import epoch_to_dt
+from stackoverflow.models import StackQuestion
+from utils.metrics import MinerMetrics
 from .safe_api_call import safe_api_call
+from .writer import StackPageWriter
 
 logger = logging.getLogger(__name__)
 
+# Progress kinds and the log level they are emitted at; page-level chatter is DEBUG
+LOG_LEVELS = {
+    "info": logging.INFO, "success": logging.INFO, "system": logging.INFO,
+    "warning": logging.WARNING, "error": logging.ERROR,
+    "fetch": logging.DEBUG, "save": logging.DEBUG, "process": logging.DEBUG,
+}
 
-def log_progress(message: str, level: str = "info", task_obj: Task = None):
+
+def log_progress(message: str, level: str = "info", task_obj: Task = None, persist: bool = True):
     """
-    Show feedback in the terminal and, if a task_obj is provided,
-    persist the progress message to the database for the frontend.
+    Log a progress message and, if a task_obj is provided (and persist is
+    set), store it as the task's operation for the frontend.
     """
-    emojis = {
-        "info": "ℹ️", "success": "✅", "warning": "🟡", "error": "❌",
-        "system": "⚙️", "fetch": "🔎", "save": "💾", "process": "🔄"
-    }
-    terminal_message = f"[StackOverflow] {emojis.get(level, '➡️ ')} {message}"
-    print(terminal_message, flush=True)
-    if task_obj:
+    logger.log(LOG_LEVELS.get(level, logging.INFO), "[StackOverflow] %s", message)
+    if task_obj and persist and task_obj.operation != message:
         task_obj.operation = message
         task_obj.save(update_fields=["operation"])
 
@@ -81,132 +84,9 @@ def update_task_progress_date(task_obj: Task, completed_date: str) -> None:
         task_obj.date_last_update = completed_datetime
         task_obj.save(update_fields=["date_last_update"])
 
-        print(f"[StackOverflow] 📅 Progress tracked: Completed scraping for {completed_date}", flush=True)
-    except Exception as e:
-        print(f"[StackOverflow] ⚠️ Warning: Could not update progress date: {str(e)}", flush=True)
-
-
-def create_or_update_user(user_id, user_data):
-    stack_user = None
-    try:
-        stack_user, created = StackUser.objects.get_or_create(
-            user_id=user_id,
-            defaults={
-                'display_name': user_data.get('display_name'),
-                'reputation': user_data.get('reputation', 0),
-                'profile_image': user_data.get('profile_image'),
-                'user_type': user_data.get('user_type'),
-                'is_employee': user_data.get('is_employee', False),
-                'creation_date': epoch_to_dt(user_data.get('creation_date')),
-                'last_access_date': epoch_to_dt(user_data.get('last_access_date')),
-                'last_modified_date': epoch_to_dt(user_data.get('last_modified_date')),
-                'link': user_data.get('link'),
-                'accept_rate': user_data.get('accept_rate'),
-                'about_me': user_data.get('about_me'),
-                'location': user_data.get('location'),
-                'website_url': user_data.get('website_url'),
-                'account_id': user_data.get('account_id'),
-                # REMOVIDOS: badge_counts / collectives (não existem mais no model)
-                'view_count': user_data.get('view_count', 0),
-                'down_vote_count': user_data.get('down_vote_count', 0),
-                'up_vote_count': user_data.get('up_vote_count', 0),
-                'answer_count': user_data.get('answer_count', 0),
-                'question_count': user_data.get('question_count', 0),
-                'reputation_change_year': user_data.get('reputation_change_year', 0),
-                'reputation_change_quarter': user_data.get('reputation_change_quarter', 0),
-                'reputation_change_month': user_data.get('reputation_change_month', 0),
-                'reputation_change_week': user_data.get('reputation_change_week', 0),
-                'reputation_change_day': user_data.get('reputation_change_day', 0),
-                'time_mined': None
-            }
-        )
-
-        if not created:
-            stack_user.display_name = user_data.get('display_name', stack_user.display_name)
-            stack_user.reputation = user_data.get('reputation', stack_user.reputation)
-            stack_user.profile_image = user_data.get('profile_image', stack_user.profile_image)
-            stack_user.user_type = user_data.get('user_type', stack_user.user_type)
-            stack_user.is_employee = user_data.get('is_employee', stack_user.is_employee)
-            stack_user.creation_date = epoch_to_dt(user_data.get('creation_date')) or stack_user.creation_date
-            stack_user.last_access_date = epoch_to_dt(user_data.get('last_access_date')) or stack_user.last_access_date
-            stack_user.last_modified_date = epoch_to_dt(user_data.get('last_modified_date')) or stack_user.last_modified_date
-            stack_user.link = user_data.get('link', stack_user.link)
-            stack_user.accept_rate = user_data.get('accept_rate', stack_user.accept_rate)
-            stack_user.about_me = user_data.get('about_me', stack_user.about_me)
-            stack_user.location = user_data.get('location', stack_user.location)
-            stack_user.website_url = user_data.get('website_url', stack_user.website_url)
-            stack_user.account_id = user_data.get('account_id', stack_user.account_id)
-            # REMOVIDOS: badge_counts / collectives (não existem mais no model)
-            stack_user.view_count = user_data.get('view_count', stack_user.view_count)
-            stack_user.down_vote_count = user_data.get('down_vote_count', stack_user.down_vote_count)
-            stack_user.up_vote_count = user_data.get('up_vote_count', stack_user.up_vote_count)
-            stack_user.answer_count = user_data.get('answer_count', stack_user.answer_count)
-            stack_user.question_count = user_data.get('question_count', stack_user.question_count)
-            stack_user.reputation_change_year = user_data.get('reputation_change_year', stack_user.reputation_change_year)
-            stack_user.reputation_change_quarter = user_data.get('reputation_change_quarter', stack_user.reputation_change_quarter)
-            stack_user.reputation_change_month = user_data.get('reputation_change_month', stack_user.reputation_change_month)
-            stack_user.reputation_change_week = user_data.get('reputation_change_week', stack_user.reputation_change_week)
-            stack_user.reputation_change_day = user_data.get('reputation_change_day', stack_user.reputation_change_day)
-            stack_user.time_mined = None
-            stack_user.save()
-
+        logger.debug("[StackOverflow] Progress tracked: completed scraping for %s", completed_date)
     except Exception as e:
-        logger.error(f"Error processing StackUser with ID {user_data}: {e}")
-    return stack_user
-
-
-def create_answer(answer_data, question, owner):
-    answer, _ = StackAnswer.objects.get_or_create(
-        answer_id=answer_data.get('answer_id'),
-        defaults={
-            'question': question,
-            'body': answer_data.get('body'),
-            'score': answer_data.get('score', 0),
-            'comment_count': answer_data.get('comment_count', 0),
-            'up_vote_count': answer_data.get('up_vote_count', 0),
-            'down_vote_count': answer_data.get('down_vote_count', 0),
-            'is_accepted': answer_data.get('is_accepted', False),
-            'creation_date': epoch_to_dt(answer_data.get('creation_date')),
-            'content_license': answer_data.get('content_license'),
-            'last_activity_date': epoch_to_dt(answer_data.get('last_activity_date')),
-            'owner': owner,
-            'share_link': answer_data.get('share_link'),
-            'body_markdown': answer_data.get('body_markdown'),
-            'link': answer_data.get('link'),
-            'title': answer_data.get('title'),
-            'time_mined': timezone.now(),
-        }
-    )
-    return answer
-
-
-def create_comment(comment_data, parent, owner):
-    """
-    Create or fetch a StackComment and attach it to a question or answer,
-    based on the 'parent' instance type.
-    """
-    question_obj = parent if isinstance(parent, StackQuestion) else None
-    answer_obj = parent if isinstance(parent, StackAnswer) else None
-
-    comment, _ = StackComment.objects.get_or_create(
-        comment_id=comment_data.get('comment_id'),
-        defaults={
-            'post_type': comment_data.get('post_type'),
-            'post_id': comment_data.get('post_id'),
-            'body': comment_data.get('body'),
-            'score': comment_data.get('score', 0),
-            'creation_date': epoch_to_dt(comment_data.get('creation_date')),
-            'content_license': comment_data.get('content_license'),
-            'edited': comment_data.get('edited', False),
-            'owner': owner,
-            'body_markdown': comment_data.get('body_markdown'),
-            'link': comment_data.get('link'),
-            'time_mined': timezone.now(),
-            'question': question_obj,
-            'answer': answer_obj,
-        }
-    )
-    return comment
+        logger.warning("[StackOverflow] Could not update progress date: %s", e)
 
 
 def make_question_serializable(question_data, stack_user, question_tags):
@@ -240,6 +120,88 @@ def make_question_serializable(question_data, stack_user, question_tags):
     }
 
 
+# Adaptive windows: aim for about this many questions per window...
+WINDOW_TARGET = 1000
+# ...and never span more days than this in one window
+MAX_WINDOW_DAYS = 366
+
+# Built-in Stack Exchange filter returning only the `total` of a query
+TOTAL_FILTER = 'total'
+QUESTION_FILTER = '!2xWEp6FHz8hT56C1LBQjFx25D4Dzmr*3(8D4ngdB5g'
+
+
+def _apply_filters(params, filters, is_advanced, task_obj=None):
+    """Copy the user filters supported by the endpoint into the request params."""
+    if not filters:
+        return
+
+    if filters.get("min") is not None:
+        params["min"] = filters["min"]
+    if filters.get("max") is not None:
+        params["max"] = filters["max"]
+
+    # intitle/title behavior
+    if filters.get("intitle"):
+        if is_advanced:
+            params["title"] = filters["intitle"]  # advanced uses `title`
+        else:
+            params["intitle"] = filters["intitle"]  # /questions supports `intitle`
+
+    if is_advanced:
+        # Advanced-only filters (safe to apply here)
+        for k in ("accepted", "answers", "views", "closed", "migrated", "user"):
+            if filters.get(k) is not None:
+                params[k] = filters[k]
+
+        nottagged = _normalize_tag_value(filters.get("nottagged"))
+        if nottagged:
+            params["nottagged"] = nottagged
+    else:
+        # Default endpoint does NOT support these reliably; ignore + warn
+        unsupported_keys = []
+        for k in ("accepted", "answers", "views", "closed", "migrated", "user", "nottagged"):
+            if filters.get(k) is not None and filters.get(k) != "":
+                unsupported_keys.append(k)
+        if unsupported_keys:
+            log_progress(
+                f"Ignoring unsupported filters on default endpoint: {unsupported_keys}. "
+                f"Use /collect/advanced/ for these.",
+                "warning",
+                task_obj=task_obj
+            )
+
+    log_progress(f"Applying filters: {filters}", "info", task_obj=task_obj)
+
+
+def _window_timestamps(first_day, last_day):
+    """fromdate/todate covering the whole days first_day..last_day."""
+    return (
+        int(datetime.combine(first_day, datetime.min.time()).timestamp()),
+        int(datetime.combine(last_day, datetime.max.time()).timestamp()),
+    )
+
+
+def save_cursor(task_obj, **cursor):
+    """Record the window and next page being collected, so a restart resumes on that page."""
+    if task_obj:
+        task_obj.save_cursor(**cursor)
+
+
+def count_questions(base_url: str, params: dict):
+    """Number of questions matching params (one call with the `total` filter), or None on failure."""
+    data = safe_api_call(base_url, {**params, 'filter': TOTAL_FILTER, 'page': 1})
+    if not data or "error_id" in data or data.get("total") is None:
+        return None
+    return int(data["total"])
+
+
+def next_window_days(window_days: int, total: int) -> int:
+    """Days of the next window, sized from the density just observed."""
+    if not total:
+        return min(window_days * 2, MAX_WINDOW_DAYS)
+    return max(1, min(window_days * WINDOW_TARGET // total, MAX_WINDOW_DAYS))
+
+
 def fetch_questions(
     site: str,
     start_date: str,
@@ -252,10 +214,18 @@ def fetch_questions(
     tags=None,
     filters=None,
     mode: str = "default",
+    resume: dict = None,
 ):
     """
     Fetch questions from Stack Overflow with user-friendly feedback.
 
+    The range is walked in windows of whole days sized from the API `total`:
+    sparse queries are covered by a few wide windows, dense ones by windows
+    of about WINDOW_TARGET questions (one day at the least). Each finished
+    window is checkpointed at its last day; inside a window, Task.cursor holds
+    the window and the next page, and `resume` (such a cursor) restarts the
+    first window on that page.
+
     mode:
       - "default": uses /questions (basic mining)
       - "advanced": uses /search/advanced (filters like accepted/views/answers/etc.)
@@ -265,7 +235,7 @@ def fetch_questions(
     base_url = "https://api.stackexchange.com/2.3/search/advanced" if is_advanced \
         else "https://api.stackexchange.com/2.3/questions"
 
-    # convert start/end to date objects so we can iterate day-by-day
+    # convert start/end to date objects so windows can be planned in whole days
     start_dt = datetime.strptime(start_date, '%Y-%m-%d').date()
     end_dt = datetime.strptime(end_date, '%Y-%m-%d').date()
 
@@ -278,234 +248,248 @@ def fetch_questions(
 
     questions = []
     total_processed = 0
+    metrics = MinerMetrics("stackoverflow", logger=logger, mode=mode, task=task_obj.pk if task_obj else None)
+
+    base_params = {
+        'site': site,
+        'pagesize': min(page_size, 100),
+        # iterate within a window from oldest -> newest so finishing means "all older or equal to its last day"
+        'order': 'asc',
+        'sort': 'creation',
+        'key': api_key,
+        'access_token': access_token
+    }
+    if tagged:
+        base_params['tagged'] = tagged
+    _apply_filters(base_params, filters, is_advanced, task_obj=task_obj)
 
-    # iterate day-by-day and paginate inside each day to get a reliable per-day checkpoint
     current_day = start_dt
-    while current_day <= end_dt:
-        day_start_ts = int(datetime.combine(current_day, datetime.min.time()).timestamp())
-        day_end_ts = int(datetime.combine(current_day, datetime.max.time()).timestamp())
+    window_days = MAX_WINDOW_DAYS
+    # a cursor only applies when resuming at its own window
+    if not resume or resume.get("day") != start_dt.isoformat():
+        resume = None
 
-        log_progress(f" Day {current_day.isoformat()}: fetching…", "fetch", task_obj=task_obj)
+    while current_day <= end_dt:
+        if resume:
+            last_day = min(date.fromisoformat(resume.get("last_day") or resume["day"]), end_dt)
+        else:
+            last_day = min(current_day + timedelta(days=window_days - 1), end_dt)
+        span = (last_day - current_day).days + 1
+        window = current_day.isoformat() if span == 1 else f"{current_day.isoformat()}..{last_day.isoformat()}"
+        fromdate, todate = _window_timestamps(current_day, last_day)
 
         params = {
-            'site': site,
-            'fromdate': day_start_ts,
-            'todate': day_end_ts,
-            'page': 1,
-            'pagesize': min(page_size, 100),
-            # iterate within the day from oldest -> newest so finishing means "all older or equal to this day"
-            'order': 'asc',
-            'sort': 'creation',
-            'filter': '!2xWEp6FHz8hT56C1LBQjFx25D4Dzmr*3(8D4ngdB5g',
-            'key': api_key,
-            'access_token': access_token
+            **base_params, 'fromdate': fromdate, 'todate': todate,
+            'page': resume.get("page", 1) if resume else 1, 'filter': QUESTION_FILTER,
         }
 
-        if tagged:
-            params['tagged'] = tagged
-
-        has_more = True
-        day_aborted = False
+        # size multi-day windows before fetching them; a single day (or a resumed window) is fetched whatever its size
+        window_total = None
+        if span > 1 and not resume:
+            window_total = count_questions(base_url, params)
+            if window_total is None:
+                log_progress(f"Could not size {window}; falling back to one day", "warning", task_obj=task_obj)
+                window_days = 1
+                continue
+            if window_total > WINDOW_TARGET:
+                window_days = next_window_days(span, window_total)
+                continue
+
+        resume = None
+        log_progress(f" Window {window}: fetching…", "fetch", task_obj=task_obj, persist=False)
+
+        has_more = window_total != 0
+        window_aborted = False
+        window_processed = 0
 
         while has_more:
             try:
-                log_progress(
-                    f"Fetching page {params['page']} for {current_day.isoformat()}...",
-                    "fetch",
-                    task_obj=task_obj
-                )
-
-                # -------------------------
-                # Apply filters (behavior depends on endpoint mode)
-                # -------------------------
-                # (1) advanced endpoint requires `q`
-                if not is_advanced:
-                    params.pop("q", None)
-
-
-                # (2) clean filter keys that might "stick" across pages/days
-                for k in ("min", "max", "title", "accepted", "answers", "views",
-                          "closed", "migrated", "user", "nottagged"):
-                    params.pop(k, None)
-
-
-                if filters:
-                    if filters.get("min") is not None:
-                        params["min"] = filters["min"]
-                    if filters.get("max") is not None:
-                        params["max"] = filters["max"]
-
-                    # intitle/title behavior
-                    if filters.get("intitle"):
-                        if is_advanced:
-                            params["title"] = filters["intitle"]  # advanced uses `title`
-                        else:
-                            params["intitle"] = filters["intitle"]  # /questions supports `intitle`
-
-                    if is_advanced:
-                        # Advanced-only filters (safe to apply here)
-                        if filters.get("accepted") is not None:
-                            params["accepted"] = filters["accepted"]
-                        if filters.get("answers") is not None:
-                            params["answers"] = filters["answers"]
-                        if filters.get("views") is not None:
-                            params["views"] = filters["views"]
-                        if filters.get("closed") is not None:
-                            params["closed"] = filters["closed"]
-                        if filters.get("migrated") is not None:
-                            params["migrated"] = filters["migrated"]
-                        if filters.get("user") is not None:
-                            params["user"] = filters["user"]
-
-                        nottagged = _normalize_tag_value(filters.get("nottagged"))
-                        if nottagged:
-                            params["nottagged"] = nottagged
-                    else:
-                        # Default endpoint does NOT support these reliably; ignore + warn
-                        unsupported_keys = []
-                        for k in ("accepted", "answers", "views", "closed", "migrated", "user", "nottagged"):
-                            if filters.get(k) is not None and filters.get(k) != "":
-                                unsupported_keys.append(k)
-                        if unsupported_keys:
-                            log_progress(
-                                f"Ignoring unsupported filters on default endpoint: {unsupported_keys}. "
-                                f"Use /collect/advanced/ for these.",
-                                "warning",
-                                task_obj=task_obj
-                            )
-
-                    log_progress(f"Applying filters: {filters}", "info", task_obj=task_obj)
-
-                # DEBUG FILTERS (TEMP)
-                logger.warning("[SO][DEBUG] endpoint=%s", base_url)
-                logger.warning("[SO][DEBUG] params=%s", params)
-
-                data = safe_api_call(base_url, params)
+                with metrics.timer("api_call"):
+                    data = safe_api_call(base_url, params)
+                metrics.incr("api_calls")
 
                 if not data:
-                    log_progress("API call failed or quota too low. Aborting.", "error", task_obj=task_obj)
-                    day_aborted = True
+                    metrics.incr("errors")
+                    log_progress("API call failed or every key is out of quota. Aborting.", "error", task_obj=task_obj)
+                    window_aborted = True
                     break
 
                 if "error_id" in data:
+                    metrics.incr("errors")
                     log_progress(
                         f"API returned an error: {data.get('error_message', 'Unknown error')}",
                         "error",
                         task_obj=task_obj
                     )
-                    day_aborted = True
+                    window_aborted = True
                     break
 
+                metrics.gauge("quota_remaining", data.get("quota_remaining"))
                 items = data.get("items", [])
                 if not items:
                     if params["page"] == 1:
-                        log_progress(f" Day {current_day.isoformat()}: no questions.", "warning", task_obj=task_obj)
+                        log_progress(f" Window {window}: no questions.", "warning", task_obj=task_obj)
                     break
 
-                log_progress(f"🔄 {len(items)} questions (page {params['page']}) — saving…", "process", task_obj=task_obj)
-
-                # if this is the first page for the day, capture a "best effort" total
-                if params.get("page", 1) == 1:
-                    day_total = data.get("total", None)
-                    day_total = day_total if day_total is not None else "?"
-                    day_processed = 0
-
+                # best effort total for progress: the sized total, else what the page reports
+                window_total = window_total if window_total is not None else data.get("total", "?")
 
+                writer = StackPageWriter()
                 for item in items:
-                    # owner
-                    owner_data = item.get('owner', {})
-                    owner_id = owner_data.get('user_id')
-                    stack_user = create_or_update_user(owner_id, owner_data) if owner_id else None
-                    question_tags = item.get('tags', [])
-
-                    q_payload = {
-                        'question_id': item['question_id'],
-                        'title': item.get('title'),
-                        'body': item.get('body'),
-                        'creation_date': epoch_to_dt(item.get('creation_date')),
-                        'score': item.get('score', 0),
-                        'view_count': item.get('view_count', 0),
-                        'answer_count': item.get('answer_count', 0),
-                        'comment_count': item.get('comment_count', 0),
-                        'up_vote_count': item.get('up_vote_count', 0),
-                        'down_vote_count': item.get('down_vote_count', 0),
-                        'is_answered': item.get('is_answered', False),
-                        'accepted_answer_id': item.get('accepted_answer_id'),
-                        'owner': stack_user,
-                        'share_link': item.get('share_link'),
-                        'body_markdown': item.get('body_markdown'),
-                        'link': item.get('link'),
-                        'favorite_count': item.get('favorite_count', 0),
-                        'content_license': item.get('content_license', None),
-                        'last_activity_date': epoch_to_dt(item.get('last_activity_date')),
-                        'time_mined': timezone.now(),
-                    }
-
-                    stack_question, created = StackQuestion.objects.get_or_create(
-                        question_id=q_payload['question_id'],
-                        defaults=q_payload
-                    )
-
-                    # comments
-                    for comment in item.get('comments', []) or []:
-                        c_owner = comment.get('owner', {})
-                        c_owner_id = c_owner.get('user_id')
-                        c_user = create_or_update_user(c_owner_id, c_owner) if c_owner_id else None
-                        create_comment(comment, stack_question, c_user)
-
-                    # answers + answer comments
-                    if item.get('is_answered'):
-                        for answer in item.get('answers', []) or []:
-                            a_owner = answer.get('owner', {})
-                            a_owner_id = a_owner.get('user_id')
-                            a_user = create_or_update_user(a_owner_id, a_owner) if a_owner_id else None
-                            stack_answer = create_answer(answer, stack_question, a_user)
-
-                            for a_comment in answer.get('comments', []) or []:
-                                ac_owner = a_comment.get('owner', {})
-                                ac_owner_id = ac_owner.get('user_id')
-                                ac_user = create_or_update_user(ac_owner_id, ac_owner) if ac_owner_id else None
-                                create_comment(a_comment, stack_answer, ac_user)
-
-                    # tags
-                    tag_objs = []
-                    for tag_name in question_tags:
-                        tag_obj, _ = StackTag.objects.get_or_create(name=tag_name)
-                        tag_objs.append(tag_obj)
-                    stack_question.tags.set(tag_objs)
-
-                    # count only after persisted
-                    total_processed += 1
-                    day_processed += 1
-
-                    # per-day processing logs: include the day for context and progress
-                    title_preview = item.get('title', 'Untitled')[:60]
-                    log_progress(f"[{current_day.isoformat()}] [{day_processed}/{day_total}] Processing: '{title_preview}...'", "save", task_obj=task_obj)
-
-                    questions.append(make_question_serializable(q_payload, stack_user, question_tags))
+                    q_payload = writer.add_question(item)
+                    questions.append(make_question_serializable(q_payload, q_payload['owner'], item.get('tags', [])))
+
+                # users, questions, answers, comments and tag links: one upsert per table
+                with metrics.timer("page_write"):
+                    writer.flush()
+
+                total_processed += len(items)
+                window_processed += len(items)
+                metrics.incr("pages")
+                metrics.incr("items", len(items))
+                metrics.event(
+                    "page", window=window, page=params["page"], items=len(items),
+                    quota_remaining=data.get("quota_remaining"), backoff=data.get("backoff"),
+                )
+                # one progress update per page for the frontend
+                log_progress(f"[{window}] {window_processed}/{window_total} questions saved", "save", task_obj=task_obj)
 
                 has_more = data.get('has_more', False)
                 if has_more:
                     params['page'] += 1
-                    log_progress("➡️ Moving to the next page…", "info", task_obj=task_obj)
+                    save_cursor(task_obj, day=current_day.isoformat(), last_day=last_day.isoformat(), page=params['page'])
                     time.sleep(1)
 
             except Exception as e:
+                metrics.incr("errors")
                 log_progress(f"An unexpected error occurred: {str(e)}", "error", task_obj=task_obj)
-                day_aborted = True
+                window_aborted = True
                 break
 
-        # checkpoint the day only if we didn't abort (i.e., we finished all pages for that day)
-        if not day_aborted:
+        # checkpoint the window's last day only if we didn't abort (i.e., we finished all its pages)
+        if not window_aborted:
             try:
-                update_task_progress_date(task_obj, current_day.isoformat())
+                update_task_progress_date(task_obj, last_day.isoformat())
+                save_cursor(task_obj)
             except Exception:
                 # already handled/logged inside update_task_progress_date
                 pass
 
-        current_day = current_day + timedelta(days=1)
+        window_days = next_window_days(span, window_processed)
+        current_day = last_day + timedelta(days=1)
 
+    metrics.summary()
     log_progress(f"Collection finished. {total_processed} questions processed in total.", "success", task_obj=task_obj)
     # update the task's last processed date (mark the period as completed)
     update_task_progress_date(task_obj, end_date)
     return questions
+
+
+# Question ids per /questions/{ids} call (API maximum)
+REFRESH_BATCH_SIZE = 100
+# Re-read activity slightly before the last sync so nothing falls between two runs
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def get_last_sync(questions):
+    """
+    Time since which every given stored question may have unseen activity:
+    the oldest time one of them was mined (minus REFRESH_OVERLAP), or None
+    when one was never mined.
+    """
+    if questions.filter(time_mined__isnull=True).exists():
+        return None
+    last = questions.aggregate(last=Min('time_mined'))['last']
+    return last - REFRESH_OVERLAP if last else None
+
+
+def refresh_questions(
+    site: str,
+    api_key: str,
+    access_token: str,
+    since: datetime = None,
+    task_obj=None,
+    tags=None,
+    start_date: str = None,
+    end_date: str = None,
+):
+    """
+    Refresh stored questions that had activity since the last sync.
+
+    Stored question ids (optionally limited to tags and a creation date range)
+    are sent 100 at a time to /questions/{ids} with sort=activity and min=since,
+    so the API only returns questions with new activity. Those are upserted with
+    their answers, comments and tags. Without `since`, each batch uses the
+    oldest time_mined of its questions.
+
+    Returns:
+        dict: questions checked, questions refreshed and the `since` used
+    """
+    questions = StackQuestion.objects.all()
+    tag_names = [t for t in (_normalize_tag_value(tags) or "").split(";") if t]
+    if tag_names:
+        questions = questions.filter(tags__name__in=tag_names).distinct()
+    if start_date:
+        questions = questions.filter(creation_date__date__gte=start_date)
+    if end_date:
+        questions = questions.filter(creation_date__date__lte=end_date)
+
+    # Without an explicit `since`, each batch asks for the activity since its
+    # own oldest time_mined: ids are batched by time_mined, so questions mined
+    # by a recent collection do not hide the activity of older ones.
+    per_batch_since = since is None
+    since = since or get_last_sync(questions)
+    stored = list(
+        questions.order_by(F('time_mined').asc(nulls_first=True), 'question_id')
+        .values_list('question_id', 'time_mined')
+    )
+    question_ids = [question_id for question_id, _ in stored]
+    log_progress(
+        f"Refreshing {len(question_ids)} stored questions with activity since {since.isoformat() if since else 'ever'}",
+        "system", task_obj=task_obj
+    )
+
+    metrics = MinerMetrics("stackoverflow", logger=logger, mode="refresh", task=task_obj.pk if task_obj else None)
+    checked = refreshed = 0
+    for offset in range(0, len(question_ids), REFRESH_BATCH_SIZE):
+        batch = question_ids[offset:offset + REFRESH_BATCH_SIZE]
+        batch_since = since
+        if per_batch_since:
+            # the first row of the batch is its oldest; a question never mined takes everything
+            oldest = stored[offset][1]
+            batch_since = oldest - REFRESH_OVERLAP if oldest else None
+        params = {
+            'site': site,
+            'pagesize': REFRESH_BATCH_SIZE,
+            'sort': 'activity',
+            'order': 'desc',
+            'filter': QUESTION_FILTER,
+            'key': api_key,
+            'access_token': access_token,
+        }
+        if batch_since:
+            params['min'] = int(batch_since.timestamp())
+
+        with metrics.timer("api_call"):
+            data = safe_api_call(f"https://api.stackexchange.com/2.3/questions/{';'.join(map(str, batch))}", params)
+        metrics.incr("api_calls")
+        if not data or "error_id" in data:
+            raise RuntimeError(
+                (data or {}).get('error_message') or "API call failed or every key is out of quota"
+            )
+
+        writer = StackPageWriter()
+        for item in data.get('items', []):
+            writer.add_question(item)
+        with metrics.timer("page_write"):
+            written = writer.flush()
+        refreshed += written
+        checked += len(batch)
+        metrics.incr("items", written)
+        metrics.gauge("quota_remaining", data.get("quota_remaining"))
+        metrics.event("batch", checked=checked, refreshed=written, quota_remaining=data.get("quota_remaining"))
+        log_progress(f"🔄 {checked}/{len(question_ids)} checked, {refreshed} refreshed", "process", task_obj=task_obj)
+
+    metrics.summary()
+    log_progress(f"Refresh finished. {refreshed} of {checked} questions had new activity.", "success", task_obj=task_obj)
+    return {"checked": checked, "refreshed": refreshed, "since": since.isoformat() if since else None}
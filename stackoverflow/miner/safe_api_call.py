@@ -1,80 +1,115 @@
+import re
 import requests
 import time
 import logging
 
+from utils.metrics import redact_text
+from .token_manager import get_quota_manager
+
 logger = logging.getLogger(__name__)
 
+# Errors meaning the key or access token itself was rejected
+CREDENTIAL_ERRORS = {"key_required", "invalid_access_token", "access_denied", "access_token_compromised"}
+
+THROTTLE_WAIT = re.compile(r"available in (\d+) seconds")
+
+
+def _response_json(response):
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
 
 def safe_api_call(
     url: str,
     params: dict,
     max_retries: int = 5,
     backoff_base: int = 2,
-    max_backoff: int = 30
+    max_backoff: int = 30,
+    quota_manager=None,
 ) -> dict | None:
     """
     Makes a safe GET request to the Stack Exchange API with retry and backoff.
 
+    The key and access token are chosen per attempt by the quota manager
+    (the configured STACK_API_KEYS, or the ones in `params` when none are
+    configured), which routes the call to the key with the most quota left.
+
     Handles:
-      - HTTP 429 (rate limit)
-      - API JSON "backoff" field (must wait)
-      - API JSON "error_id"/"error_name" (throttle_violation, etc.)
-      - network timeouts / connection errors
-      - low quota early abort
+      - HTTP 429 and throttle_violation: the key is backed off and the call retried on another
+      - API JSON "backoff" field: recorded for the key, respected before its next call
+      - rejected keys/tokens: removed from rotation, the call retried on another
+      - temporarily_unavailable, network timeouts / connection errors
+      - low quota: the key is skipped until the daily reset
 
     Returns:
         dict | None: Parsed JSON if successful, None on unrecoverable failure
+        or once every key is out of quota
     """
+    manager = quota_manager or get_quota_manager(params.get("key"), params.get("access_token"))
     retries = 0
     backoff = backoff_base
 
     while retries < max_retries:
+        credential = manager.acquire()
+        if credential is None:
+            logger.error("Every Stack Exchange key is out of quota until the daily reset.")
+            return None
+
+        cred_id, api_key, access_token = credential
+        call_params = {**params, "key": api_key}
+        if access_token:
+            call_params["access_token"] = access_token
+        else:
+            call_params.pop("access_token", None)
+
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = requests.get(url, params=call_params, timeout=10)
 
-            # Some SE API errors are 200 with error_id, but keep HTTP checks too.
             if response.status_code == 429:
-                logger.warning(f"Rate limited (HTTP 429). Retrying in {backoff}s...")
-                time.sleep(backoff)
+                logger.warning(f"Rate limited (HTTP 429) on key {cred_id}. Backing it off for {backoff}s...")
+                manager.back_off(cred_id, backoff)
                 backoff = min(backoff * 2, max_backoff)
                 retries += 1
                 continue
 
-            response.raise_for_status()
-            data = response.json()
-
-            # If API explicitly asks to back off, we MUST respect it.
-            api_backoff = data.get("backoff")
-            if api_backoff is not None:
-                try:
-                    wait_s = int(api_backoff)
-                    logger.warning(f"API requested backoff: waiting {wait_s}s...")
-                    time.sleep(wait_s)
-                except Exception:
-                    # If weird value, fallback to local backoff policy
-                    logger.warning(f"API backoff value not parseable: {api_backoff}")
-
-            # API-level error handling (often comes as HTTP 200)
+            # API errors carry an error_id body, often with a 4xx/5xx status
+            data = _response_json(response)
+            if not data or "error_id" not in data:
+                response.raise_for_status()
+            if data is None:
+                raise ValueError("Response is not JSON")
+
+            manager.record(cred_id, data)
+
             if "error_id" in data:
                 error_name = data.get("error_name")
-                error_message = data.get("error_message")
+                error_message = data.get("error_message") or ""
+
+                if error_name == "throttle_violation":
+                    match = THROTTLE_WAIT.search(error_message)
+                    wait_s = int(match.group(1)) if match else backoff
+                    logger.warning(f"API error {error_name} on key {cred_id}: backing it off for {wait_s}s")
+                    manager.back_off(cred_id, wait_s)
+                    backoff = min(backoff * 2, max_backoff)
+                    retries += 1
+                    continue
 
-                # Retry-worthy errors
-                if error_name in {"throttle_violation", "temporarily_unavailable"}:
+                if error_name == "temporarily_unavailable":
                     logger.warning(f"API error {error_name}: {error_message}. Retrying in {backoff}s...")
                     time.sleep(backoff)
                     backoff = min(backoff * 2, max_backoff)
                     retries += 1
                     continue
 
-                # Non-retry (bad params / invalid token / etc.)
-                logger.error(f"API error {error_name}: {error_message}")
-                return None
+                if error_name in CREDENTIAL_ERRORS:
+                    manager.disable(cred_id)
+                    retries += 1
+                    continue
 
-            # Log and abort early if quota is dangerously low (your original behavior)
-            quota = data.get("quota_remaining")
-            if quota is not None and quota < 50:
-                logger.warning(f"Quota remaining is low: {quota}")
+                # Non-retry (bad params / etc.)
+                logger.error(f"API error {error_name}: {error_message}")
                 return None
 
             return data
@@ -82,28 +117,21 @@ def safe_api_call(
         except requests.exceptions.HTTPError as e:
             status = e.response.status_code if e.response is not None else None
 
-            if status == 429:
-                logger.warning(f"Rate limited (HTTP 429). Retrying in {backoff}s...")
-                time.sleep(backoff)
-                backoff = min(backoff * 2, max_backoff)
-                retries += 1
-                continue
-
             if status == 400:
-                logger.error(f"Bad request (HTTP 400): {e}")
+                logger.error(f"Bad request (HTTP 400): {redact_text(e)}")
                 return None
 
-            logger.error(f"HTTP error {status}: {e}")
+            logger.error(f"HTTP error {status}: {redact_text(e)}")
             return None
 
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            logger.warning(f"Connection issue: {e}. Retrying in {backoff}s...")
+            logger.warning(f"Connection issue: {redact_text(e)}. Retrying in {backoff}s...")
             time.sleep(backoff)
             backoff = min(backoff * 2, max_backoff)
             retries += 1
 
         except Exception as e:
-            logger.exception(f"Unexpected error during API call: {e}")
+            logger.exception(f"Unexpected error during API call: {redact_text(e)}")
             return None
 
     logger.error(f"Failed to get a valid response from {url} after {max_retries} attempts.")
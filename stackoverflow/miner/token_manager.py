@@ -1,56 +1,132 @@
-import os
-import requests
-from typing import Dict
-
-class TokenManager:
-    def __init__(self, base_url: str):
-        self.base_url = base_url
-        self.tokens = self._load_tokens()
-        self.current_token_index = 0
-        self.current_token = self.tokens[0] if self.tokens else None
-        
-    def _load_tokens(self) -> list:
-        """Load tokens from environment variables"""
-        tokens_str = os.getenv("STACK_TOKENS", "")
-        if not tokens_str:
-            raise Exception("No STACK_TOKENS found in environment variables")
-        
-        tokens = [token.strip() for token in tokens_str.split(",") if token.strip()]
-        if not tokens:
-            raise Exception("No valid tokens found after processing")
-            
-        print(f"{len(tokens)} tokens loaded")
-        return tokens
-    
-    def get_current_token(self) -> Dict[str, str]:
-        """Get the current token configuration"""
-        return {
-            'key': self.current_token,
-            'access_token': os.getenv("STACK_ACCESS_TOKEN")
-        }
-    
-    def rotate_token(self) -> None:
-        """Rotate to the next available token"""
-        self.current_token_index = (self.current_token_index + 1) % len(self.tokens)
-        self.current_token = self.tokens[self.current_token_index]
-        print(f"Rotated to token {self.current_token_index + 1}/{len(self.tokens)}")
-    
-    def check_quota(self, response: requests.Response) -> bool:
-        """Check if we need to rotate token based on remaining quota"""
-        remaining = response.headers.get('quota-remaining')
-        if remaining and int(remaining) < 100:
-            print(f"Low quota remaining ({remaining}). Rotating token...")
-            self.rotate_token()
-            return True
-        return False
-    
-    def verify_token(self) -> bool:
-        """Verify if the current token is valid"""
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Calls a key keeps in reserve; below this it is skipped until the daily reset
+QUOTA_RESERVE = 50
+
+# Daily quota assumed for a key the API has not reported on yet
+DEFAULT_QUOTA = 10000
+
+
+def credential_id(api_key: str, access_token: str) -> str:
+    """Stable, non-reversible id of a key/token pair, safe for cache keys and logs."""
+    return hashlib.sha256(f"{api_key}:{access_token}".encode()).hexdigest()[:16]
+
+
+def _seconds_to_quota_reset() -> int:
+    """Stack Exchange quotas reset at midnight UTC."""
+    now = datetime.now(dt_timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=dt_timezone.utc)
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+def configured_credentials() -> list:
+    """
+    Key/token pairs from settings.
+
+    STACK_API_KEYS and STACK_ACCESS_TOKENS are paired by position; a single
+    access token is shared by every key.
+    """
+    keys = list(getattr(settings, "STACK_API_KEYS", None) or [])
+    tokens = list(getattr(settings, "STACK_ACCESS_TOKENS", None) or [])
+    if not keys:
+        return []
+    if len(tokens) <= 1:
+        tokens = (tokens or [None]) * len(keys)
+    return list(zip(keys, tokens))
+
+
+class QuotaManager:
+    """
+    Spreads Stack Exchange calls over several API keys/access tokens.
+
+    The quota_remaining and backoff reported by each response are stored per
+    credential in the shared cache (Redis), so every worker routes its next
+    call to the credential with the most headroom. A credential whose quota
+    runs low, or that is throttled, is skipped until it recovers.
+    """
+
+    def __init__(self, credentials):
+        self.credentials = {}
+        for api_key, access_token in credentials:
+            if api_key:
+                self.credentials[credential_id(api_key, access_token)] = (api_key, access_token)
+
+    def _state_key(self, cred_id: str) -> str:
+        return f"stackoverflow:quota:{cred_id}"
+
+    def _states(self) -> dict:
         try:
-            url = f"{self.base_url}/info"
-            params = self.get_current_token()
-            response = requests.get(url, params=params)
-            return response.status_code == 200
+            stored = cache.get_many([self._state_key(c) for c in self.credentials])
         except Exception as e:
-            print(f"Error verifying token: {str(e)}")
-            return False 
\ No newline at end of file
+            logger.warning(f"Cache unavailable, quota state not shared: {e}")
+            stored = {}
+        return {c: stored.get(self._state_key(c)) or {} for c in self.credentials}
+
+    def _update(self, cred_id: str, **changes) -> None:
+        state = self._states().get(cred_id, {})
+        state.update(changes)
+        try:
+            cache.set(self._state_key(cred_id), state, _seconds_to_quota_reset())
+        except Exception as e:
+            logger.warning(f"Cache unavailable, quota of {cred_id} not stored: {e}")
+
+    def acquire(self):
+        """
+        Pick the credential with the most quota left, waiting out API backoffs.
+
+        Returns:
+            tuple | None: (credential id, api_key, access_token), or None when
+            every credential has used up its quota for the day
+        """
+        now = time.time()
+        usable = []
+        for cred_id, state in self._states().items():
+            quota = state.get("quota_remaining", DEFAULT_QUOTA)
+            if quota >= QUOTA_RESERVE and not state.get("invalid"):
+                usable.append((state.get("backoff_until", 0), -quota, cred_id))
+        if not usable:
+            return None
+
+        ready = [u for u in usable if u[0] <= now]
+        if ready:
+            cred_id = min(ready, key=lambda u: u[1])[2]
+        else:
+            backoff_until, _, cred_id = min(usable)
+            logger.warning(f"All Stack Exchange keys are backing off; waiting {backoff_until - now:.0f}s for {cred_id}...")
+            time.sleep(backoff_until - now)
+        return (cred_id, *self.credentials[cred_id])
+
+    def record(self, cred_id: str, data: dict) -> None:
+        """Store the quota and backoff reported by a response."""
+        changes = {}
+        if data.get("quota_remaining") is not None:
+            changes["quota_remaining"] = int(data["quota_remaining"])
+        if data.get("backoff") is not None:
+            try:
+                changes["backoff_until"] = time.time() + int(data["backoff"])
+            except (TypeError, ValueError):
+                logger.warning(f"API backoff value not parseable: {data['backoff']}")
+        if changes:
+            self._update(cred_id, **changes)
+
+    def back_off(self, cred_id: str, seconds: float) -> None:
+        """Keep a throttled credential out of rotation for `seconds`."""
+        self._update(cred_id, backoff_until=time.time() + seconds)
+
+    def disable(self, cred_id: str) -> None:
+        """Take a rejected key/token out of rotation until the next quota reset."""
+        logger.error(f"Stack Exchange credential {cred_id} rejected; removed from rotation")
+        self._update(cred_id, invalid=True)
+
+
+def get_quota_manager(api_key: str = None, access_token: str = None) -> QuotaManager:
+    """Manager over the configured credentials, or over the given pair when none are configured."""
+    return QuotaManager(configured_credentials() or [(api_key, access_token)])
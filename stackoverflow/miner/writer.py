@@ -0,0 +1,205 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from stackoverflow.models import StackQuestion, StackUser, StackAnswer, StackTag, StackComment, StackQuestionTag
+from stackoverflow.utils import epoch_to_dt
+
+# Shallow user fields copied as-is from API payloads
+USER_FIELDS = (
+    'display_name', 'reputation', 'profile_image', 'user_type', 'is_employee', 'link',
+    'accept_rate', 'about_me', 'location', 'website_url', 'account_id', 'view_count',
+    'down_vote_count', 'up_vote_count', 'answer_count', 'question_count',
+    'reputation_change_year', 'reputation_change_quarter', 'reputation_change_month',
+    'reputation_change_week', 'reputation_change_day',
+)
+USER_DATE_FIELDS = ('creation_date', 'last_access_date', 'last_modified_date')
+
+
+def _fields_except_pk(model):
+    """Concrete columns refreshed when a row already exists."""
+    return [f.name for f in model._meta.concrete_fields if not f.primary_key and not f.generated]
+
+
+class StackPageWriter:
+    """
+    Collects the questions of one API page (with owners, answers, comments and
+    tags) and writes them with one bulk upsert per table, in one transaction.
+
+    Users are deduplicated in memory. An existing user only has the fields
+    present in the payload updated, as owner objects are partial.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.questions = {}
+        self.answers = {}
+        self.comments = {}
+        self.tags = set()
+        self.question_tags = {}
+
+    def add_user(self, user_data):
+        user_id = (user_data or {}).get('user_id')
+        if not user_id:
+            return None
+        values = self.users.setdefault(user_id, {})
+        for name in USER_FIELDS:
+            if name in user_data:
+                values[name] = user_data[name]
+        for name in USER_DATE_FIELDS:
+            value = epoch_to_dt(user_data.get(name))
+            if value:
+                values[name] = value
+        return user_id
+
+    def get_user(self, user_id):
+        """Unsaved StackUser with the values collected for user_id (None when unknown)."""
+        if user_id not in self.users:
+            return None
+        return StackUser(user_id=user_id, **self.users[user_id])
+
+    def add_comment(self, comment_data, question_id=None, answer_id=None):
+        comment_id = comment_data.get('comment_id')
+        self.comments[comment_id] = StackComment(
+            comment_id=comment_id,
+            post_type=comment_data.get('post_type'),
+            post_id=comment_data.get('post_id'),
+            body=comment_data.get('body'),
+            score=comment_data.get('score', 0),
+            creation_date=epoch_to_dt(comment_data.get('creation_date')),
+            content_license=comment_data.get('content_license'),
+            edited=comment_data.get('edited', False),
+            owner_id=self.add_user(comment_data.get('owner')),
+            body_markdown=comment_data.get('body_markdown'),
+            link=comment_data.get('link'),
+            time_mined=timezone.now(),
+            question_id=question_id,
+            answer_id=answer_id,
+        )
+
+    def add_answer(self, answer_data, question_id):
+        answer_id = answer_data.get('answer_id')
+        self.answers[answer_id] = StackAnswer(
+            answer_id=answer_id,
+            question_id=question_id,
+            body=answer_data.get('body'),
+            score=answer_data.get('score', 0),
+            comment_count=answer_data.get('comment_count', 0),
+            up_vote_count=answer_data.get('up_vote_count', 0),
+            down_vote_count=answer_data.get('down_vote_count', 0),
+            is_accepted=answer_data.get('is_accepted', False),
+            creation_date=epoch_to_dt(answer_data.get('creation_date')),
+            content_license=answer_data.get('content_license'),
+            last_activity_date=epoch_to_dt(answer_data.get('last_activity_date')),
+            owner_id=self.add_user(answer_data.get('owner')),
+            share_link=answer_data.get('share_link'),
+            body_markdown=answer_data.get('body_markdown'),
+            link=answer_data.get('link'),
+            title=answer_data.get('title'),
+            time_mined=timezone.now(),
+        )
+        for comment in answer_data.get('comments', []) or []:
+            self.add_comment(comment, answer_id=answer_id)
+
+    def add_question(self, item):
+        """
+        Queue a question item of the API and everything embedded in it.
+
+        Returns:
+            dict: The question payload (model field values, owner as an unsaved StackUser)
+        """
+        question_id = item['question_id']
+        owner_id = self.add_user(item.get('owner'))
+
+        payload = {
+            'question_id': question_id,
+            'title': item.get('title'),
+            'body': item.get('body'),
+            'creation_date': epoch_to_dt(item.get('creation_date')),
+            'score': item.get('score', 0),
+            'view_count': item.get('view_count', 0),
+            'answer_count': item.get('answer_count', 0),
+            'comment_count': item.get('comment_count', 0),
+            'up_vote_count': item.get('up_vote_count', 0),
+            'down_vote_count': item.get('down_vote_count', 0),
+            'is_answered': item.get('is_answered', False),
+            'accepted_answer_id': item.get('accepted_answer_id'),
+            'share_link': item.get('share_link'),
+            'body_markdown': item.get('body_markdown'),
+            'link': item.get('link'),
+            'favorite_count': item.get('favorite_count', 0),
+            'content_license': item.get('content_license', None),
+            'last_activity_date': epoch_to_dt(item.get('last_activity_date')),
+            'time_mined': timezone.now(),
+        }
+        self.questions[question_id] = StackQuestion(owner_id=owner_id, **payload)
+
+        for comment in item.get('comments', []) or []:
+            self.add_comment(comment, question_id=question_id)
+
+        if item.get('is_answered'):
+            for answer in item.get('answers', []) or []:
+                self.add_answer(answer, question_id)
+
+        tags = item.get('tags', []) or []
+        self.tags.update(tags)
+        self.question_tags[question_id] = set(tags)
+
+        return {**payload, 'owner': self.get_user(owner_id)}
+
+    def _write_users(self):
+        # Owners embedded in different objects may carry different fields:
+        # one upsert per field set, each updating only what it carries.
+        groups = defaultdict(list)
+        for user_id, values in self.users.items():
+            groups[tuple(sorted(values))].append(StackUser(user_id=user_id, time_mined=None, **values))
+        for fields, users in groups.items():
+            StackUser.objects.bulk_create(
+                users, update_conflicts=True,
+                unique_fields=['user_id'], update_fields=[*fields, 'time_mined'],
+            )
+
+    def _write_question_tags(self):
+        """Make each question's tag rows match its current tags, like tags.set()."""
+        existing = defaultdict(dict)
+        for pk, question_id, tag_id in StackQuestionTag.objects.filter(
+            question_id__in=list(self.question_tags)
+        ).values_list('pk', 'question_id', 'tag_id'):
+            existing[question_id][tag_id] = pk
+
+        stale = [
+            pk for question_id, rows in existing.items()
+            for tag_id, pk in rows.items() if tag_id not in self.question_tags[question_id]
+        ]
+        if stale:
+            StackQuestionTag.objects.filter(pk__in=stale).delete()
+
+        StackQuestionTag.objects.bulk_create([
+            StackQuestionTag(question_id=question_id, tag_id=tag)
+            for question_id, tags in self.question_tags.items()
+            for tag in tags if tag not in existing[question_id]
+        ], ignore_conflicts=True)
+
+    def flush(self):
+        """Write the queued rows and reset the writer. Returns the number of questions written."""
+        if not self.questions:
+            return 0
+
+        with transaction.atomic():
+            self._write_users()
+            StackTag.objects.bulk_create([StackTag(name=name) for name in self.tags], ignore_conflicts=True)
+            for model, rows, pk in (
+                (StackQuestion, self.questions, 'question_id'),
+                (StackAnswer, self.answers, 'answer_id'),
+                (StackComment, self.comments, 'comment_id'),
+            ):
+                model.objects.bulk_create(
+                    rows.values(), update_conflicts=True,
+                    unique_fields=[pk], update_fields=_fields_except_pk(model),
+                )
+            self._write_question_tags()
+
+        written = len(self.questions)
+        self.__init__()
+        return written
@@ -1,6 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils import timezone
 
+from utils.search import search_vector_field
+
 
 class StackUser(models.Model):
     user_id = models.BigIntegerField(primary_key=True)
@@ -70,8 +73,13 @@ class StackQuestion(models.Model):
 
     tags = models.ManyToManyField('StackTag', through='StackQuestionTag')
 
+    search_vector = search_vector_field(('title', 'A'), ('body', 'B'))
+
     class Meta:
         db_table = 'stack_question'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='stack_question_search_gin'),
+        ]
 
 
 class StackAnswer(models.Model):
@@ -194,3 +202,26 @@ class Meta:
 #     class Meta:
 #         db_table = 'stack_tag_synonym'
 #         unique_together = ('tag', 'synonym')
+
+
+class StackTagDailyStats(models.Model):
+    """
+    Dashboard counters of the questions created on one (UTC) day with one tag,
+    with their answers, comments and distinct users. Rows with an empty tag
+    count every question of the day once. Refreshed by the collection tasks
+    (see stackoverflow.stats).
+    """
+    tag = models.CharField(max_length=255, blank=True, default='')
+    day = models.DateField()
+    questions = models.IntegerField(default=0)
+    answers = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+    users = models.IntegerField(default=0)
+    last_mined = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'stack_tag_daily_stats'
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'day'], name='stack_tag_daily_stats_tag_day'),
+        ]
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import StackUser, StackQuestion, StackAnswer, StackComment, StackTag
 from .utils import StackDateTimeHandler
+from utils.expand import ExpandableFieldsMixin
 
 
 class StackUserSerializer(serializers.ModelSerializer):
@@ -22,13 +23,15 @@ def get_last_modified_date_formatted(self, obj):
         return StackDateTimeHandler.format_date(obj.last_modified_date)
 
 
-class StackTagSerializer(serializers.ModelSerializer):
+class StackTagSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = StackTag
         fields = "__all__"
+        # Every question id carrying the tag; one query per tag, so opt-in only
+        expandable_fields = ["questions"]
 
 
-class StackQuestionSerializer(serializers.ModelSerializer):
+class StackQuestionSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     owner = StackUserSerializer(read_only=True)
     tags = StackTagSerializer(many=True, read_only=True)
 
@@ -37,7 +40,7 @@ class StackQuestionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = StackQuestion
-        fields = "__all__"
+        exclude = ["search_vector"]
 
     def get_creation_date_formatted(self, obj):
         return StackDateTimeHandler.format_date(obj.creation_date)
@@ -46,8 +49,11 @@ def get_last_activity_date_formatted(self, obj):
         return StackDateTimeHandler.format_date(obj.last_activity_date)
 
 
-class StackAnswerSerializer(serializers.ModelSerializer):
+class StackAnswerSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     owner = StackUserSerializer(read_only=True)
+    question_id = serializers.IntegerField(read_only=True)
+    # Full question (with its owner and tags) only with ?expand=question;
+    # select_related("owner", "question__owner") and prefetch "question__tags" then.
     question = StackQuestionSerializer(read_only=True)
 
     creation_date_formatted = serializers.SerializerMethodField()
@@ -56,6 +62,7 @@ class StackAnswerSerializer(serializers.ModelSerializer):
     class Meta:
         model = StackAnswer
         fields = "__all__"
+        expandable_fields = ["question"]
 
     def get_creation_date_formatted(self, obj):
         return StackDateTimeHandler.format_date(obj.creation_date)
@@ -78,7 +85,7 @@ def get_creation_date_formatted(self, obj):
 
 
 class ExportStackoverflowDataSerializer(serializers.Serializer):
-    format = serializers.ChoiceField(choices=["csv", "json"], default="csv")
+    format = serializers.ChoiceField(choices=["csv", "json", "ndjson", "parquet", "arrow"], default="csv")
     ids = serializers.ListField(
         child=serializers.IntegerField(),
         required=False,
@@ -88,3 +95,7 @@ class ExportStackoverflowDataSerializer(serializers.Serializer):
         required=False,
         help_text="Filtrar perguntas com score mínimo",
     )
+    run_async = serializers.BooleanField(
+        default=False,
+        help_text="Gera o arquivo em segundo plano e retorna o id da tarefa",
+    )
@@ -0,0 +1,148 @@
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import StackTagDailyStats
+
+# Tag of the rows counting every question of a day, whatever its tags
+ALL_TAGS = ''
+
+# One pass over the questions of the range: every question, answer and comment
+# becomes an event on its question's creation day, grouped per (tag, day) and
+# per day. Distinct counts keep a question with several tags from being
+# counted twice in the per-day rows.
+STATS_SQL = """
+WITH q AS (
+    SELECT question_id, (creation_date AT TIME ZONE 'UTC')::date AS day, owner_id, time_mined
+    FROM stack_question
+    WHERE creation_date IS NOT NULL {where}
+),
+events AS (
+    SELECT q.question_id, q.day, q.time_mined, 'q' AS kind, q.question_id AS object_id, q.owner_id AS user_id
+    FROM q
+    UNION ALL
+    SELECT q.question_id, q.day, q.time_mined, 'a', a.answer_id, a.owner_id
+    FROM q JOIN stack_answer a ON a.question_id = q.question_id
+    UNION ALL
+    SELECT q.question_id, q.day, q.time_mined, 'c', c.comment_id, c.owner_id
+    FROM q JOIN stack_comment c ON c.question_id = q.question_id
+    UNION ALL
+    SELECT q.question_id, q.day, q.time_mined, 'c', c.comment_id, c.owner_id
+    FROM q JOIN stack_answer a ON a.question_id = q.question_id JOIN stack_comment c ON c.answer_id = a.answer_id
+)
+SELECT
+    qt.tag_id,
+    GROUPING(qt.tag_id),
+    e.day,
+    COUNT(DISTINCT e.object_id) FILTER (WHERE e.kind = 'q'),
+    COUNT(DISTINCT e.object_id) FILTER (WHERE e.kind = 'a'),
+    COUNT(DISTINCT e.object_id) FILTER (WHERE e.kind = 'c'),
+    COUNT(DISTINCT e.user_id),
+    MAX(e.time_mined)
+FROM events e
+LEFT JOIN stack_question_tag qt ON qt.question_id = e.question_id
+GROUP BY GROUPING SETS ((qt.tag_id, e.day), (e.day))
+"""
+
+
+# Distinct owners of the questions of a range (optionally of one tag) and of
+# their answers and comments. Not materialized: a distinct count over a range
+# cannot be added up from per-day counts.
+USERS_SQL = """
+WITH q AS (
+    SELECT question_id, owner_id
+    FROM stack_question
+    WHERE creation_date IS NOT NULL {where}
+)
+SELECT COUNT(DISTINCT user_id) FROM (
+    SELECT owner_id AS user_id FROM q
+    UNION ALL
+    SELECT a.owner_id FROM q JOIN stack_answer a ON a.question_id = q.question_id
+    UNION ALL
+    SELECT c.owner_id FROM q JOIN stack_comment c ON c.question_id = q.question_id
+    UNION ALL
+    SELECT c.owner_id FROM q JOIN stack_answer a ON a.question_id = q.question_id
+    JOIN stack_comment c ON c.answer_id = a.answer_id
+) users
+"""
+
+
+def _as_date(value):
+    """Day of a date, datetime or 'YYYY-MM-DD...' string (None stays None)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _day_range_filter(start_day, end_day):
+    """SQL condition and parameters selecting questions created on the (UTC) days start_day..end_day."""
+    where, params = "", []
+    if start_day:
+        where += " AND creation_date >= %s"
+        params.append(datetime.combine(start_day, time.min, tzinfo=dt_timezone.utc))
+    if end_day:
+        where += " AND creation_date < %s"
+        params.append(datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=dt_timezone.utc))
+    return where, params
+
+
+def count_users(tag=None, start_date=None, end_date=None):
+    """
+    Distinct users who asked, answered or commented on the questions created
+    on the days start_date..end_date, matched by day like the daily counters.
+    """
+    where, params = _day_range_filter(_as_date(start_date), _as_date(end_date))
+    if tag:
+        where += " AND question_id IN (SELECT question_id FROM stack_question_tag WHERE tag_id = %s)"
+        params.append(tag)
+
+    with connection.cursor() as cursor:
+        cursor.execute(USERS_SQL.format(where=where), params)
+        return cursor.fetchone()[0]
+
+
+def refresh_tag_stats(start_date=None, end_date=None):
+    """
+    Recompute StackTagDailyStats for the days start_date..end_date (inclusive;
+    either bound may be None for an open range).
+
+    Rows are upserted on (tag, day); rows of the range that no longer have
+    questions are deleted. Runs as one aggregate query plus the write.
+
+    Returns:
+        int: Number of (tag, day) rows written
+    """
+    start_day, end_day = _as_date(start_date), _as_date(end_date)
+    where, params = _day_range_filter(start_day, end_day)
+
+    with connection.cursor() as cursor:
+        cursor.execute(STATS_SQL.format(where=where), params)
+        results = cursor.fetchall()
+
+    now = timezone.now()
+    rows = [
+        StackTagDailyStats(
+            tag=ALL_TAGS if all_tags else tag, day=day, questions=questions, answers=answers,
+            comments=comments, users=users, last_mined=last_mined, updated_at=now,
+        )
+        for tag, all_tags, day, questions, answers, comments, users, last_mined in results
+        # untagged questions only count in the per-day rows
+        if all_tags or tag is not None
+    ]
+
+    stale = StackTagDailyStats.objects.filter(updated_at__lt=now)
+    if start_day:
+        stale = stale.filter(day__gte=start_day)
+    if end_day:
+        stale = stale.filter(day__lte=end_day)
+
+    with transaction.atomic():
+        StackTagDailyStats.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['tag', 'day'],
+            update_fields=['questions', 'answers', 'comments', 'users', 'last_mined', 'updated_at'],
+        )
+        stale.delete()
+    return len(rows)
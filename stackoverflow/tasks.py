@@ -1,12 +1,20 @@
-from celery import shared_task
+from celery import chord, shared_task
 from django.conf import settings
-from jobs.models import Task
+from jobs.models import AWAITING_SUBTASKS, Task
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime, timezone as dt_timezone
+import logging
 import uuid
 import traceback
 
-from .miner.question_fetcher import fetch_questions
+from .miner.question_fetcher import fetch_questions, refresh_questions, update_task_progress_date
+from .stats import refresh_tag_stats
+from .utils import split_date_range
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the parallel fetchers of one sharded collection
+MAX_SHARDS = 16
 
 
 def _reuse_or_create_task(self, *, defaults, task_pk=None):
@@ -15,7 +23,9 @@ def _reuse_or_create_task(self, *, defaults, task_pk=None):
             **defaults,
             "task_id": getattr(getattr(self, "request", None), "id", None),
         }
+        # a restart keeps the original range start and parameters
         update_data.pop("date_init", None)
+        update_data.pop("params", None)
 
         updated = Task.objects.filter(pk=task_pk).update(**update_data)
         if updated:
@@ -25,8 +35,50 @@ def _reuse_or_create_task(self, *, defaults, task_pk=None):
     return Task.objects.get_or_create(task_id=task_id, defaults=defaults)
 
 
+def _refresh_stats(start_date, end_date):
+    """Bring the dashboard counters of the collected days up to date; a failure only costs freshness."""
+    try:
+        refresh_tag_stats(start_date, end_date)
+    except Exception as e:
+        logger.warning(f"Could not refresh tag statistics for {start_date} to {end_date}: {e}")
+
+
+def _start_shards(task_obj, ranges, tags, filters, mode):
+    """
+    Fan a collection out to one subtask per date range; merge_question_shards
+    closes the parent task once every shard has finished.
+    """
+    header = [
+        collect_questions_task.s(
+            start_date=shard_start, end_date=shard_end, tags=tags, filters=filters, mode=mode,
+            parent_pk=task_obj.pk,
+        )
+        for shard_start, shard_end in ranges
+    ]
+    chord(header)(merge_question_shards.s(parent_pk=task_obj.pk))
+
+    task_obj.operation = f"🔀 Collecting in {len(ranges)} parallel shards"
+    task_obj.result = {
+        "operation": "collect_questions",
+        "repository": "stackoverflow",
+        "status": AWAITING_SUBTASKS,
+        "shards": [list(r) for r in ranges],
+    }
+    task_obj.save(update_fields=["operation", "result"])
+    return task_obj.result
+
+
 @shared_task(bind=True)
-def collect_questions_task(self, start_date: str, end_date: str, tags=None, filters=None, mode: str = "default", task_pk=None):
+def collect_questions_task(self, start_date: str, end_date: str, tags=None, filters=None, mode: str = "default", task_pk=None,
+                           shards: int = 1, parent_pk=None, resume=None):
+    """
+    Collect questions created between start_date and end_date.
+
+    With shards > 1 the range is split into contiguous day ranges collected
+    concurrently by subtasks, each with its own Task and day checkpoints.
+    parent_pk marks such a subtask. `resume` is the Task.cursor a restart
+    continues from.
+    """
     task_obj = None
 
     try:
@@ -38,13 +90,22 @@ def collect_questions_task(self, start_date: str, end_date: str, tags=None, filt
             "operation": operation_log,
             "repository": "Stack Overflow",
             "status": "STARTED",
-            "type": "stackoverflow_question_collection",
+            "type": "stackoverflow_question_collection_shard" if parent_pk else "stackoverflow_question_collection",
             "date_init": start_date,
             "date_end": end_date,
+            "params": {
+                "start_date": start_date, "end_date": end_date, "tags": tags, "filters": filters,
+                "mode": mode, "shards": shards, "parent_pk": parent_pk,
+            },
         }
 
         task_obj, _ = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
 
+        if shards and shards > 1:
+            ranges = split_date_range(start_date, end_date, min(shards, MAX_SHARDS))
+            if len(ranges) > 1:
+                return _start_shards(task_obj, ranges, tags, filters, mode)
+
         fetch_questions(
             site="stackoverflow",
             start_date=start_date,
@@ -55,7 +116,9 @@ def collect_questions_task(self, start_date: str, end_date: str, tags=None, filt
             tags=tags,
             filters=filters,
             mode=mode,
+            resume=resume,
         )
+        _refresh_stats(start_date, end_date)
 
         result_payload = {
             "operation": "collect_questions",
@@ -65,6 +128,7 @@ def collect_questions_task(self, start_date: str, end_date: str, tags=None, filt
             "tags": tags,
             "filters": filters,
             "mode": mode,
+            "parent_pk": parent_pk,
             "status": "success",
         }
 
@@ -93,6 +157,7 @@ def collect_questions_task(self, start_date: str, end_date: str, tags=None, filt
             "tags": tags,
             "filters": filters,
             "mode": mode,
+            "parent_pk": parent_pk,
             "status": "error",
             "code": code,
             "message": msg,
@@ -119,32 +184,133 @@ def collect_questions_task(self, start_date: str, end_date: str, tags=None, filt
         return result_payload
 
 
+@shared_task(bind=True, name="stackoverflow.merge_question_shards")
+def merge_question_shards(self, results, parent_pk):
+    """
+    Chord callback of a sharded collection: merge the shard results into the parent Task.
+
+    The parent checkpoint only advances over the shards completed from the
+    start of the range, so a restart never skips an unfinished shard.
+    """
+    task_obj = Task.objects.get(pk=parent_pk)
+    results = [r or {} for r in results or []]
+    failed = [r for r in results if r.get("status") != "success"]
+
+    checkpoint = None
+    for r in results:
+        if r.get("status") != "success":
+            break
+        checkpoint = r.get("end_date")
+    if checkpoint:
+        update_task_progress_date(task_obj, checkpoint)
+
+    task_obj.status = "FAILURE" if failed else "COMPLETED"
+    task_obj.operation = (
+        f"{len(failed)} of {len(results)} shards failed" if failed
+        else f"Completed Stack Overflow question collection in {len(results)} shards."
+    )
+    task_obj.result = {**(task_obj.result or {}), "status": "error" if failed else "success", "shard_results": results}
+    update_fields = ["status", "operation", "result"]
+    if failed:
+        task_obj.error = "; ".join(str(r.get("message")) for r in failed)
+        task_obj.error_type = failed[0].get("code")
+        update_fields += ["error", "error_type"]
+    task_obj.save(update_fields=update_fields)
+    return task_obj.result
+
+
+@shared_task(bind=True)
+def refresh_questions_task(self, tags=None, since=None, start_date=None, end_date=None, task_pk=None):
+    """
+    Re-fetch stored questions with activity since `since` (ISO datetime,
+    default: the last sync) and upsert their fields, answers and comments.
+    """
+    task_obj = None
+    result_payload = {
+        "operation": "refresh_questions",
+        "repository": "stackoverflow",
+        "tags": tags,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+    try:
+        defaults = {
+            "operation": "🔄 Refreshing stored questions with new activity",
+            "repository": "Stack Overflow",
+            "status": "STARTED",
+            "type": "stackoverflow_question_refresh",
+            "date_init": start_date,
+            "date_end": end_date,
+            "params": {"tags": tags, "since": since, "start_date": start_date, "end_date": end_date},
+        }
+        task_obj, _ = _reuse_or_create_task(self, defaults=defaults, task_pk=task_pk)
+
+        since_dt = datetime.fromisoformat(since) if since else None
+        if since_dt and timezone.is_naive(since_dt):
+            since_dt = timezone.make_aware(since_dt, dt_timezone.utc)
+
+        summary = refresh_questions(
+            site="stackoverflow",
+            api_key=settings.STACK_API_KEY,
+            access_token=settings.STACK_ACCESS_TOKEN,
+            since=since_dt,
+            task_obj=task_obj,
+            tags=tags,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        _refresh_stats(start_date, end_date)
+        result_payload.update(summary, status="success")
+
+        task_obj.status = "COMPLETED"
+        task_obj.operation = f"Refreshed {summary['refreshed']} of {summary['checked']} stored questions."
+        task_obj.result = result_payload
+        task_obj.save(update_fields=["status", "operation", "result"])
+        return result_payload
+
+    except Exception as e:
+        result_payload.update(status="error", code="UNEXPECTED_EXCEPTION", message=str(e),
+                              traceback=traceback.format_exc())
+        if task_obj:
+            task_obj.status = "FAILURE"
+            task_obj.error_type = "UNEXPECTED_EXCEPTION"
+            task_obj.error = str(e)
+            task_obj.operation = str(e)
+            task_obj.result = result_payload
+            task_obj.save(update_fields=["status", "error_type", "error", "operation", "result"])
+        return result_payload
+
+
 @shared_task(bind=True, name="stackoverflow.restart_collection")
 def restart_collection(self, task_pk: str):
+    """
+    Restart a collection with the parameters it was started with, from its
+    cursor (window and page) or from the day after its last completed day.
+    """
     task_obj = Task.objects.get(pk=task_pk)
     collect_type = (task_obj.type or "").strip().lower()
-
-    tags = getattr(task_obj, "tags", None)
-    filters = getattr(task_obj, "filters", None)
-    mode = getattr(task_obj, "mode", "default")
+    params = task_obj.params or {}
 
     if collect_type.startswith("stackoverflow_question_collection"):
+        resume_from = task_obj.resume_from()
         end_date = task_obj.date_end
-        base = task_obj.date_last_update or getattr(task_obj, "date_init", None)
-        start_date = (base + timedelta(days=1)) if base else None
-
-        if isinstance(start_date, datetime) and timezone.is_naive(start_date):
-            start_date = timezone.make_aware(
-                start_date, timezone.get_current_timezone()
-            )
 
-        start_date_str = start_date.date().isoformat() if start_date else None
-        end_date_str = end_date.date().isoformat() if end_date else None
+        start_date_str = resume_from.date().isoformat() if resume_from else params.get("start_date")
+        end_date_str = end_date.date().isoformat() if end_date else params.get("end_date")
 
         new_id = collect_questions_task.apply_async(
-            args=[start_date_str, end_date_str, tags, filters, mode],
-            kwargs={"task_pk": task_pk},
+            args=[start_date_str, end_date_str, params.get("tags"), params.get("filters"), params.get("mode", "default")],
+            kwargs={
+                "task_pk": task_pk,
+                "shards": params.get("shards", 1),
+                "parent_pk": params.get("parent_pk"),
+                "resume": task_obj.cursor,
+            },
         ).id
+    elif collect_type.startswith("stackoverflow_question_refresh"):
+        # a refresh is idempotent: it is simply run again
+        new_id = refresh_questions_task.apply_async(kwargs={**params, "task_pk": task_pk}).id
     else:
         return {"status": "FAILURE", "error": f"Unknown task type: {collect_type}"}
 
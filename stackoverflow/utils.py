@@ -1,4 +1,4 @@
-from datetime import datetime, timezone as dt_timezone
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from typing import Optional, Union
 
 from django.utils import timezone
@@ -63,6 +63,27 @@ def validate_date_range(start_date: Optional[datetime], end_date: Optional[datet
     if start_date and end_date and start_date > end_date:
         raise ValueError("Start date must be before end date")
 
+def split_date_range(start_date: str, end_date: str, shards: int) -> list:
+    """
+    Split an inclusive YYYY-MM-DD range into at most `shards` contiguous ranges of whole days.
+
+    Returns:
+        list[tuple[str, str]]: (start, end) pairs covering the range, oldest first
+    """
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    days = (end - start).days + 1
+    shards = max(1, min(shards, days))
+    size, extra = divmod(days, shards)
+
+    ranges = []
+    for index in range(shards):
+        shard_end = start + timedelta(days=size + (1 if index < extra else 0) - 1)
+        ranges.append((start.isoformat(), shard_end.isoformat()))
+        start = shard_end + timedelta(days=1)
+    return ranges
+
+
 class StackDateTimeHandler:
     epoch_to_dt = staticmethod(epoch_to_dt)
     parse_date = staticmethod(parse_date)
@@ -75,5 +96,6 @@ class StackDateTimeHandler:
     "parse_date",
     "format_date",
     "validate_date_range",
+    "split_date_range",
     "StackDateTimeHandler",
 ]
@@ -1,15 +1,17 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 import logging
+from datetime import datetime
 from celery import chain
 from rest_framework.decorators import action
 
-from ..tasks import collect_questions_task  # repopulate_users_task is deprecated
+from ..tasks import collect_questions_task, refresh_questions_task, MAX_SHARDS  # repopulate_users_task is deprecated
 from drf_spectacular.utils import extend_schema  # For API documentation
 
 # Available operations
 OPERATIONS = {
     "collect_questions": {"name": "Collect Questions", "dependencies": []},
+    "refresh_questions": {"name": "Refresh Questions With New Activity", "dependencies": []},
     # Deprecated / disabled:
     # "repopulate_users": {"name": "Enrich User Data", "dependencies": ["collect_questions"]},
 }
@@ -51,17 +53,34 @@ class StackOverflowViewSet(viewsets.ViewSet):
                     "options": {
                         "type": "array",
                         "items": {"type": "string"},
-                        "description": "List of operations to perform (e.g., ['collect_questions']).",
+                        "description": (
+                            "List of operations to perform: 'collect_questions' and/or 'refresh_questions' "
+                            "(re-fetch stored questions with activity since the last sync)."
+                        ),
                     },
                     "start_date": {
                         "type": "string",
                         "format": "date",
-                        "description": "Required if 'collect_questions' is among options.",
+                        "description": (
+                            "Required if 'collect_questions' is among options. "
+                            "For 'refresh_questions', optionally limits the refresh by creation date."
+                        ),
                     },
                     "end_date": {
                         "type": "string",
                         "format": "date",
-                        "description": "Required if 'collect_questions' is among options.",
+                        "description": (
+                            "Required if 'collect_questions' is among options. "
+                            "For 'refresh_questions', optionally limits the refresh by creation date."
+                        ),
+                    },
+                    "since": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": (
+                            "Optional, 'refresh_questions' only. Activity lower bound; "
+                            "defaults to the last sync of the refreshed questions."
+                        ),
                     },
                     "tags": {
                         "description": "Optional. Tags filter. Accepts 'python;django' or ['python','django'].",
@@ -79,6 +98,15 @@ class StackOverflowViewSet(viewsets.ViewSet):
                         "description": "Optional. Mining mode: 'default' or 'advanced'.",
                         "enum": ["default", "advanced"],
                     },
+                    "shards": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_SHARDS,
+                        "description": (
+                            "Optional. Split the date range into this many parallel fetchers, "
+                            "each checkpointed separately (default 1)."
+                        ),
+                    },
                 },
                 "required": ["options"],
             }
@@ -169,13 +197,24 @@ def advanced(self, request):
     # Private Methods
     def _build_task_chain(self, options: list, data: dict, mode: str = "default"):
         """
-        Builds a Celery task chain based on the requested operations.
-        Currently supports only 'collect_questions'.
+        Builds a Celery task chain based on the requested operations
+        ('collect_questions', then 'refresh_questions').
         """
         start_date = data.get("start_date")
         end_date = data.get("end_date")
         tags = data.get("tags")
         filters = data.get("filters")
+        shards = data.get("shards", 1)
+        since = data.get("since")
+
+        if isinstance(shards, bool) or not isinstance(shards, int) or not 1 <= shards <= MAX_SHARDS:
+            raise ValueError(f'The "shards" field must be an integer between 1 and {MAX_SHARDS}.')
+
+        if since is not None:
+            try:
+                datetime.fromisoformat(since)
+            except (TypeError, ValueError):
+                raise ValueError('The "since" field must be an ISO 8601 datetime.')
 
         # Minimal validation: filters must be a dict and only contain allowed keys
         if filters is not None:
@@ -198,6 +237,7 @@ def _build_task_chain(self, options: list, data: dict, mode: str = "default"):
                 tags=tags,
                 filters=filters,
                 mode=mode,
+                shards=shards,
             ),
         }
 
@@ -208,6 +248,11 @@ def _build_task_chain(self, options: list, data: dict, mode: str = "default"):
                 return None
             ordered_tasks.append(task_map["collect_questions"])
 
+        if "refresh_questions" in execution_plan:
+            ordered_tasks.append(refresh_questions_task.si(
+                tags=tags, since=since, start_date=start_date, end_date=end_date,
+            ))
+
         if not ordered_tasks:
             return None
 
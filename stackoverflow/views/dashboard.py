@@ -1,14 +1,15 @@
 import logging
 
-from django.db.models import Count, Min, Max, Q
-from django.db.models.functions import TruncDay, TruncMonth, TruncYear
+from django.db.models import Count, Min, Max, Q, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncYear
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ..models import StackQuestion, StackAnswer, StackComment, StackUser, StackTag
+from ..models import StackQuestion, StackAnswer, StackComment, StackTagDailyStats
+from ..stats import ALL_TAGS, count_users
 from ..utils import StackDateTimeHandler
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,10 @@ def validate(self, data):
     tags=["StackOverflow"],
     summary="Dashboard statistics",
     description="Provides statistics about Stack Overflow questions, answers, comments and users. "
-                "If a tag is provided, returns detailed stats for that tag.",
+                "If a tag is provided, returns detailed stats for that tag. "
+                "Served from per-tag daily counters refreshed by the collection tasks: dates are matched by "
+                "(UTC) day of question creation. users_count is the number of distinct users who asked, "
+                "answered or commented on the questions of the range.",
     parameters=[
         OpenApiParameter(
             name="tag",
@@ -117,47 +121,38 @@ def get(self, request):
         except ValueError as exc:
             return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        question_filters = {}
+        stats = StackTagDailyStats.objects.all()
         if start_date:
-            question_filters["creation_date__gte"] = start_date
+            stats = stats.filter(day__gte=start_date.date())
         if end_date:
-            question_filters["creation_date__lte"] = end_date
-        if tag:
-            question_filters["tags__name"] = tag
-
-        questions_qs = StackQuestion.objects.filter(**question_filters).distinct()
+            stats = stats.filter(day__lte=end_date.date())
 
-        answers_qs = StackAnswer.objects.filter(question__in=questions_qs).distinct()
-        comments_qs = StackComment.objects.filter(
-            Q(question__in=questions_qs) | Q(answer__question__in=questions_qs)
-        ).distinct()
-
-        users_qs = StackUser.objects.filter(
-            Q(questions__in=questions_qs) | Q(answers__in=answers_qs) | Q(comments__in=comments_qs)
-        ).distinct()
-
-        latest_time_mined = questions_qs.order_by("-time_mined").first()
-        time_mined = StackDateTimeHandler.format_date(latest_time_mined.time_mined) if latest_time_mined else None
+        totals = stats.filter(tag=tag or ALL_TAGS).aggregate(
+            questions_count=Coalesce(Sum("questions"), 0),
+            answers_count=Coalesce(Sum("answers"), 0),
+            comments_count=Coalesce(Sum("comments"), 0),
+            last_mined=Max("last_mined"),
+        )
+        last_mined = totals.pop("last_mined")
+        # distinct users do not add up over days: counted over the whole range
+        totals["users_count"] = count_users(tag, start_date, end_date)
 
         response_data = {
             "tag": tag,
-            "questions_count": questions_qs.count(),
-            "answers_count": answers_qs.count(),
-            "comments_count": comments_qs.count(),
-            "users_count": users_qs.count(),
-            "time_mined": time_mined,
+            **totals,
+            "time_mined": StackDateTimeHandler.format_date(last_mined) if last_mined else None,
         }
 
         if not tag:
             tag_counts = (
-                questions_qs.values("tags__name")
-                .annotate(count=Count("tags__name"))
-                .exclude(tags__name__isnull=True)
-                .order_by("-count")
+                stats.exclude(tag=ALL_TAGS)
+                .values("tag")
+                .annotate(count=Sum("questions"))
+                .order_by("-count", "tag")
             )
             response_data["tags_count"] = tag_counts.count()
             response_data["top_tags"] = [
-                {"name": entry["tags__name"], "count": entry["count"]} for entry in tag_counts[:10]
+                {"name": entry["tag"], "count": entry["count"]} for entry in tag_counts[:10]
             ]
         else:
             response_data["tags_count"] = None
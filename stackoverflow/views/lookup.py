@@ -1,10 +1,13 @@
+from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
 
 from ..models import StackQuestion
 from ..serializers import StackQuestionSerializer
+from utils.search import FullTextSearchFilter
+from utils.expand import ExpandableViewMixin, fields_parameter
 
 
 class StandardPagination(PageNumberPagination):
@@ -14,22 +17,34 @@ class StandardPagination(PageNumberPagination):
     max_page_size = 1000
 
 
-class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[fields_parameter()]),
+    retrieve=extend_schema(parameters=[fields_parameter()]),
+)
+class QuestionViewSet(ExpandableViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows questions to be viewed
     with support for filtering, text search, and ordering.
     """
-    queryset = StackQuestion.objects.all()
     serializer_class = StackQuestionSerializer
 
     pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
 
     # Fields for exact match filtering (e.g., ?is_answered=true)
     filterset_fields = ['is_answered', 'owner__user_id', 'tags__name']
 
-    # Fields for text search (e.g., ?search=api)
+    # Fields for text search (e.g., ?search=api); ranked full-text search over title/body
     search_fields = ['title', 'body']
 
     # Fields for sorting results (e.g., ?ordering=-score)
     ordering_fields = ['score', 'view_count', 'answer_count', 'creation_date']
+
+    def get_queryset(self):
+        # Owner is joined and tags fetched in one query, only when rendered
+        queryset = StackQuestion.objects.all()
+        if self.wants_field('owner'):
+            queryset = queryset.select_related('owner')
+        if self.wants_field('tags'):
+            queryset = queryset.prefetch_related('tags')
+        return queryset
@@ -51,7 +51,14 @@ if not User.objects.filter(username='${DJANGO_SUPERUSER_USERNAME}').exists():
 # Start the server
 if [ "$IS_DEBUG" = "False" ]; then
     echo "Starting Django server with gunicorn (IS_DEBUG=False)..."
-    gunicorn dataminer_api.wsgi:application --bind 0.0.0.0:8000
+    # Threaded workers: an open task event stream (/api/jobs/.../events/) holds one
+    # thread, not a whole worker, for up to TASK_EVENTS_MAX_SECONDS (kept below
+    # GUNICORN_TIMEOUT in settings)
+    gunicorn dataminer_api.wsgi:application --bind 0.0.0.0:8000 \
+        --worker-class gthread \
+        --workers "${GUNICORN_WORKERS:-2}" \
+        --threads "${GUNICORN_THREADS:-32}" \
+        --timeout "${GUNICORN_TIMEOUT:-120}"
 else
     echo "Starting Django development server (IS_DEBUG=True)..."
     python manage.py runserver 0.0.0.0:8000
@@ -347,6 +347,160 @@ def test_commit_by_sha_missing_fields_returns_400(self):
         r = self.client.post(url, {'repo_name': self.meta.repository}, format='json')
         self.assertEqual(r.status_code, status.HTTP_400_BAD_REQUEST, getattr(r,'data',r.content))
 
+    # Full-text search
+    def test_commit_list_full_text_search(self):
+        """
+        [Scenario]: Searching commits by message.
+        [What It Tests]: The `search=` parameter uses the stored tsvector (stemmed match).
+        [How It Tests]: Creates a second commit and searches for a word form not present verbatim.
+        [Expected Result]: Only the matching commit is returned, without the search_vector column.
+        """
+        GitHubCommit.objects.create(
+            repository=self.meta,
+            repository_name=self.meta.repository,
+            sha="f" * 40,
+            message="Fix crashing login form",
+            date=timezone.now(),
+            time_mined=timezone.now(),
+        )
+        url = reverse('github:commit-list')
+        r = self.client.get(url, {'search': 'crash'})
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        self.assertEqual([c['sha'] for c in r.data['results']], ["f" * 40])
+        self.assertNotIn('search_vector', r.data['results'][0])
+
+    # Prefetch plan and expand=/fields=
+    def test_commit_list_expand_and_fields(self):
+        """
+        [Scenario]: Listing commits with and without heavy nested relations.
+        [What It Tests]: diff/methods only appear with expand=, and the query count does not grow per commit.
+        [How It Tests]: Adds commits with files, then compares payloads and counts queries.
+        [Expected Result]: Constant number of queries; fields= limits top-level keys.
+        """
+        for i in range(5):
+            commit = GitHubCommit.objects.create(
+                repository=self.meta, sha=f"{i}" * 40, message="more", date=timezone.now(), author=self.author
+            )
+            mf = GitHubModifiedFile.objects.create(
+                commit=commit, filename=f"f{i}.py", change_type="M", diff="+x", added_lines=1, deleted_lines=0
+            )
+            GitHubMethod.objects.create(modified_file=mf, name="bar")
+        url = reverse('github:commit-list')
+
+        # count, commits (+authors), files
+        with self.assertNumQueries(3):
+            r = self.client.get(url)
+        file_data = r.data['results'][0]['modified_files'][0]
+        self.assertNotIn('diff', file_data)
+        self.assertNotIn('methods', file_data)
+
+        # + methods
+        with self.assertNumQueries(4):
+            r = self.client.get(url, {'expand': 'diff,methods'})
+        first = next(c for c in r.data['results'] if c['sha'] == self.commit.sha)
+        self.assertEqual(first['modified_files'][0]['diff'], "---")
+        self.assertEqual(first['modified_files'][0]['methods'][0]['name'], "def foo()")
+
+        with self.assertNumQueries(2):
+            r = self.client.get(url, {'fields': 'sha,message'})
+        self.assertEqual(set(r.data['results'][0]), {'sha', 'message'})
+
+        r = self.client.get(reverse('github:commit-detail', args=[self.commit.sha]))
+        self.assertIn('methods', r.data['modified_files'][0])
+
+    # Streaming export
+    def test_export_streams_json_and_ndjson(self):
+        """
+        [Scenario]: Exporting commits as JSON array and NDJSON.
+        [What It Tests]: Export responses are streamed and decode to the stored rows.
+        [How It Tests]: Posts to the export endpoint and joins the streaming content.
+        [Expected Result]: Both formats contain the commit, FKs exported as ids.
+        """
+        import json
+        url = reverse('github:export-data')
+
+        r = self.client.post(url, {'table': 'githubcommit', 'format': 'json'}, format='json')
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        self.assertTrue(r.streaming)
+        rows = json.loads(b"".join(r.streaming_content))
+        self.assertEqual(rows[0]['sha'], self.commit.sha)
+        self.assertEqual(rows[0]['author'], self.author.id)
+        self.assertNotIn('search_vector', rows[0])
+
+        r = self.client.post(url, {'table': 'githubcommit', 'format': 'ndjson', 'fields': ['sha', 'message']}, format='json')
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        lines = b"".join(r.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{'sha': self.commit.sha, 'message': 'Initial commit'}])
+
+    def test_export_parquet_and_arrow_have_typed_columns(self):
+        """
+        [Scenario]: Exporting commits as Parquet and as an Arrow IPC file.
+        [What It Tests]: Columnar exports keep integer, timestamp and text types.
+        [How It Tests]: Reads the streamed bytes back with pyarrow.
+        [Expected Result]: One row with typed id/author/date columns.
+        """
+        import io
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        url = reverse('github:export-data')
+
+        r = self.client.post(url, {'table': 'githubcommit', 'format': 'parquet'}, format='json')
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        table = pq.read_table(io.BytesIO(b"".join(r.streaming_content)))
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(table.schema.field('author').type, pa.int64())
+        self.assertEqual(table.schema.field('date').type, pa.timestamp('us', tz='UTC'))
+        self.assertEqual(table.column('sha').to_pylist(), [self.commit.sha])
+
+        r = self.client.post(url, {'table': 'githubcommit', 'format': 'arrow', 'fields': ['id', 'sha']}, format='json')
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        table = pa.ipc.open_file(io.BytesIO(b"".join(r.streaming_content))).read_all()
+        self.assertEqual(table.to_pylist(), [{'id': self.commit.id, 'sha': self.commit.sha}])
+
+    @patch('celery.app.task.Task.request')
+    @patch('jobs.tasks.export_data_task.apply_async')
+    def test_export_async_job_writes_compressed_file(self, mock_apply_async, mock_request):
+        """
+        [Scenario]: Requesting an export with run_async=true.
+        [What It Tests]: The view schedules a job, the job writes a gzip file and the jobs API serves it.
+        [How It Tests]: Captures the dispatched args, runs the task body into a temp EXPORT_DIRECTORY, then downloads.
+        [Expected Result]: 202 with task id, COMPLETED task with progress, downloadable NDJSON.gz.
+        """
+        import gzip
+        import json
+        import tempfile
+        from django.test import override_settings
+        from jobs.tasks import export_data_task
+
+        r = self.client.post(
+            reverse('github:export-data'),
+            {'table': 'githubcommit', 'format': 'ndjson', 'fields': ['sha'], 'run_async': True},
+            format='json'
+        )
+        self.assertEqual(r.status_code, status.HTTP_202_ACCEPTED)
+        task_id = r.data['task_id']
+        self.assertEqual(Task.objects.get(task_id=task_id).status, 'PENDING')
+        call = mock_apply_async.call_args
+
+        with tempfile.TemporaryDirectory() as export_dir, override_settings(EXPORT_DIRECTORY=export_dir):
+            mock_request.id = call.kwargs['task_id']
+            export_data_task.run(*call.kwargs['args'])
+
+            task = Task.objects.get(task_id=task_id)
+            self.assertEqual(task.status, 'COMPLETED')
+            self.assertEqual(task.result['progress'], {'rows': 1, 'total': 1, 'percent': 100.0})
+
+            # clients poll the status URL of the 202 response before downloading
+            with patch('jobs.views.AsyncResult') as mock_async_result:
+                mock_async_result.return_value.state = 'SUCCESS'
+                mock_async_result.return_value.result = task.result
+                self.assertEqual(self.client.get(reverse('task-status', args=[task_id])).status_code, status.HTTP_200_OK)
+
+            r = self.client.get(reverse('task-download', args=[task_id]))
+            self.assertEqual(r.status_code, status.HTTP_200_OK)
+            content = gzip.decompress(b"".join(r.streaming_content)).decode()
+            self.assertEqual(json.loads(content), {'sha': self.commit.sha})
+
 
 class GitHubTasksTests(APITestCase):
     """
@@ -482,7 +636,7 @@ def test_fetch_issues_logic(self, mock_request, mock_reuse, mock_miner_cls):
         # Assert
         mock_miner_cls.assert_called_once_with()
         miner.get_repository_metadata.assert_called_once_with("pandas-dev/pandas")
-        miner.get_issues.assert_called_once_with("pandas-dev/pandas", start, end, "basic", task_obj)
+        miner.get_issues.assert_called_once_with("pandas-dev/pandas", start, end, "basic", task_obj, start_page=1)
 
         states = [c.kwargs["state"] for c in mock_state.call_args_list]
         self.assertIn("STARTED", states)
@@ -539,7 +693,7 @@ def test_fetch_pull_requests_logic(self, mock_request, mock_reuse, mock_miner_cl
         mock_miner_cls.assert_called_once_with()
         miner.get_repository_metadata.assert_called_once_with("pandas-dev/pandas")
         miner.get_pull_requests.assert_called_once_with(
-            "pandas-dev/pandas", start, end, "basic", task_obj
+            "pandas-dev/pandas", start, end, "basic", task_obj, start_page=1
         )
 
 
@@ -716,6 +870,10 @@ def test_restart_collection_commits_success(self, mock_fetch_commits, mock_task)
         task_obj.type = "github_commits"
         task_obj.date_end = datetime(2025, 1, 31)
         task_obj.date_last_update = datetime(2025, 1, 1)
+        # created before parameters were stored: everything comes from type and dates
+        task_obj.params = None
+        task_obj.cursor = None
+        task_obj.resume_from.return_value = datetime(2025, 1, 2)
         mock_task.objects.get.return_value = task_obj
 
         mock_task_id = str(uuid.uuid4())
@@ -2,8 +2,15 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from unittest.mock import patch, MagicMock
+import gzip
+import io
+import json
 import uuid
+from datetime import datetime, timezone as dt_timezone
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils import timezone
+import pyarrow.parquet as pq
 
 #run tests on docker using: docker compose exec web python manage.py test
 
@@ -86,10 +93,10 @@ def test_start_jira_collection_success(self, mock_task):
         """
         url = reverse('collect-jira-issues')
         data = {'projects': [{'jira_domain': 'test.atlassian.net', 'project_key': 'PROJ'}]}
-        mock_task.delay.return_value = MagicMock(id=str(uuid.uuid4()))
+        mock_task.apply_async.return_value = MagicMock(id=str(uuid.uuid4()))
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
-        mock_task.delay.assert_called_once()
+        mock_task.apply_async.assert_called_once()
 
     def test_lookup_issues_list_and_content(self):
         """
@@ -143,6 +150,78 @@ def test_all_dashboard_and_utility_endpoints_return_ok(self):
                 self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+    def test_dashboard_counts_are_scoped_to_the_project(self):
+        """
+        [Scenario]: Dashboard for one project while other projects and users exist.
+        [What it tests]: Every count, users included, is scoped to the project's issues.
+        [How it tests]: Adds an unrelated project, issue and user, then requests the project dashboard.
+        [Expected result]: Counts only cover PROJ, computed in a fixed handful of queries.
+        """
+        other_user = JiraUser.objects.create(
+            accountId='user-999', displayName='Other', emailAddress='o@user.com',
+            active=True, timeZone='UTC', accountType='atlassian'
+        )
+        other = JiraProject.objects.create(id='20002', key='OTH', name='Other', simplified=False, projectTypeKey='software')
+        other_issue = JiraIssue.objects.create(
+            issue_id='900', issue_key='OTH-1', project=other, summary='Other', status='Done',
+            created=timezone.now(), updated=timezone.now(), creator=other_user
+        )
+        JiraComment.objects.create(issue=other_issue, body="x", created=timezone.now(), updated=timezone.now())
+        self.sprint.issues.add(self.issue2)
+
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('dashboard'), {'project_id': self.project.id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['issues_count'], 2)
+        self.assertEqual(response.data['comments_count'], 1)
+        self.assertEqual(response.data['commits_count'], 1)
+        self.assertEqual(response.data['sprints_count'], 1)
+        self.assertEqual(response.data['users_count'], 1)
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.data['issues_count'], 3)
+        self.assertEqual(response.data['users_count'], 2)
+
+    def test_export_issues_filtered_by_issue_type_with_joined_column(self):
+        """
+        [Scenario]: Exporting issues of one issue type.
+        [What it tests]: issue_type filters through JiraIssueType and is exported as a joined column.
+        [How it tests]: Streams jiraissue as NDJSON with issue_type=Bug.
+        [Expected result]: Only the Bug issue is exported, keyed by issue_id, with its issuetype.
+        """
+        response = self.client.post(
+            reverse('jira-export-data'), {"table": "jiraissue", "issue_type": "Bug", "format": "ndjson"}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([(r["issue_id"], r["issuetype"]) for r in rows], [("123", "Bug")])
+
+    def test_export_history_items_gzipped_and_columnar(self):
+        """
+        [Scenario]: Exporting a table other than jiraissue.
+        [What it tests]: History items stream with their issue joined, gzipped or as Parquet.
+        [How it tests]: Requests CSV with compress=true, then Parquet filtered by project_key.
+        [Expected result]: A gzip CSV with the issue column; a Parquet file with one row.
+        """
+        url = reverse('jira-export-data')
+        response = self.client.post(url, {"table": "jirahistoryitem", "format": "csv", "compress": True}, format='json')
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('jirahistoryitem_export.csv.gz', response["Content-Disposition"])
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        self.assertTrue(lines[0].endswith(",issue,created"))
+        self.assertIn("In Progress,", lines[1])
+        self.assertIn(",123,", lines[1])
+
+        response = self.client.post(
+            url, {"table": "jirahistoryitem", "format": "parquet", "project_key": "PROJ"}, format='json'
+        )
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(table.column("issue").to_pylist(), ["123"])
+
+        response = self.client.post(url, {"table": "jirauser", "format": "json", "issue_type": "Bug"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 class JiraApiValidationTests(APITestCase):
     """
     Test suite focused on API robustness, validating
@@ -226,7 +305,9 @@ def test_collect_jira_issues_task_logic_success(
             )
 
         # Assert
-        miner.collect_jira_issues.assert_called_once_with("PROJ", ["Bug"], None, None)
+        miner.collect_jira_issues.assert_called_once_with(
+            "PROJ", ["Bug"], None, None, incremental=False, updated_since=None
+        )
 
         states = [c.kwargs["state"] for c in spy_state.call_args_list]
         self.assertIn("STARTED", states)
@@ -271,3 +352,285 @@ def test_collect_jira_issues_task_invalid_token(self, mock_reuse, mock_jira_mine
         self.assertEqual(task_obj.error_type, "NO_VALID_JIRA_TOKEN")
         self.assertIn("Invalid token", task_obj.error)
         self.assertEqual(res["code"], "NO_VALID_JIRA_TOKEN")
+
+
+def _jira_response(payload, status_code=200):
+    response = MagicMock(status_code=status_code, text="")
+    response.json.return_value = payload
+    return response
+
+    @patch("jira.tasks.collect_jira_issues_task.delay")
+    def test_restart_resumes_from_the_cursor_with_stored_parameters(self, mock_delay):
+        """
+        [Scenario]: An incremental Bug/Story collection stopped after writing issues created at 2024-01-05 14:30.
+        [What it tests]: restart_collection replays issue types and the incremental window from Task.params.
+        [How it tests]: Runs the restart handler on a Task holding params and cursor, capturing the dispatch.
+        [Expected result]: The collection restarts at the cursor minute with the original parameters.
+        """
+        from jira.tasks import restart_collection
+        task = Task.objects.create(
+            task_id="jira-restart", operation="", repository="test.atlassian.net/PROJ", status="FAILURE",
+            type="jira_issues", date_last_update=datetime(2024, 1, 4, tzinfo=dt_timezone.utc),
+            cursor={"day": "2024-01-05", "page": 7, "created": "2024-01-05 14:30"},
+            params={"issuetypes": ["Bug", "Story"], "incremental": True, "updated_since": "2023-12-01T00:00:00+00:00"},
+        )
+        mock_delay.return_value.id = "new-id"
+
+        with patch.object(restart_collection, "update_state"):
+            restart_collection.run(task.pk)
+
+        kwargs = mock_delay.call_args.kwargs
+        self.assertEqual(kwargs["start_date"], "2024-01-05 14:30")
+        self.assertEqual(kwargs["issuetypes"], ["Bug", "Story"])
+        self.assertEqual((kwargs["incremental"], kwargs["updated_since"]), (True, "2023-12-01T00:00:00+00:00"))
+
+
+def _bulk_issue(issue_id, key, created="2024-01-02T10:00:00.000+0000"):
+    user = {"accountId": "acc-1", "displayName": "Ann"}
+    return {
+        "id": issue_id,
+        "key": key,
+        "fields": {
+            "project": {"id": "10001", "key": "PROJ", "name": "Test Project", "projectTypeKey": "software"},
+            "creator": user, "reporter": user, "assignee": None,
+            "created": created, "updated": created,
+            "status": {"name": "Done"}, "priority": {"name": "High"},
+            "summary": f"Issue {key}", "description": None,
+            "issuetype": {"name": "Bug"},
+            "comment": {"total": 1, "comments": [{
+                "id": f"{issue_id}1", "author": user, "body": {"content": [{"text": "hi"}]},
+                "created": created, "updated": created,
+            }]},
+        },
+        "changelog": {"total": 1, "histories": [{
+            "id": f"{issue_id}2", "author": user, "created": created,
+            "items": [{"field": "status", "fieldtype": "jira", "fromString": "To Do", "toString": "Done"}],
+        }]},
+    }
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class JiraMinerTests(APITestCase):
+    """Exercises JiraMiner against a faked Jira REST API."""
+
+    def setUp(self):
+        cache.clear()
+
+    def _miner(self):
+        with patch.object(JiraMiner, "verify_token"):
+            return JiraMiner("test.atlassian.net")
+
+    @patch("jira.miner.requests")
+    def test_collect_reuses_bulkfetch_payload(self, mock_requests):
+        """
+        [Scenario]: Collecting a page of issues.
+        [What it tests]: Comments, history, activity and checklist come from the bulkfetch payload.
+        [How it tests]: Fakes search/bulkfetch; GETs only answer field metadata and dev-status.
+        [Expected result]: No per-issue comment/changelog/issue GETs; rows are stored.
+        """
+        issues = [_bulk_issue("501", "PROJ-1"), _bulk_issue("502", "PROJ-2")]
+
+        def post(url, **kwargs):
+            if url.endswith("/search/jql"):
+                return _jira_response({"issues": [{"id": "501"}, {"id": "502"}], "isLast": True})
+            if url.endswith("/issue/bulkfetch"):
+                self.assertEqual(kwargs["json"]["expand"], ["changelog"])
+                return _jira_response({"issues": issues})
+            return _jira_response({"count": 2})
+
+        def get(url, **kwargs):
+            if url.endswith("/rest/api/3/field"):
+                return _jira_response([])
+            self.assertIn("/rest/dev-status/", url)
+            return _jira_response({"detail": []})
+
+        mock_requests.post.side_effect = post
+        mock_requests.get.side_effect = get
+
+        result = self._miner().collect_jira_issues("PROJ", [])
+
+        self.assertEqual(result["total_issues"], 2)
+        dev_status_calls = [c for c in mock_requests.get.call_args_list if "dev-status" in c.args[0]]
+        self.assertEqual(len(dev_status_calls), 2)
+        self.assertIn("issueId=501", dev_status_calls[0].args[0])
+        self.assertEqual(JiraComment.objects.filter(issue_id="501").count(), 1)
+        self.assertEqual(JiraHistoryItem.objects.filter(history__issue_id="502", field="status").count(), 1)
+        self.assertEqual(JiraActivityLog.objects.filter(issue_id="501").count(), 1)
+
+    @patch("jira.miner.requests")
+    def test_collect_twice_upserts_without_duplicates(self, mock_requests):
+        """
+        [Scenario]: The same range is collected twice.
+        [What it tests]: Page rows are upserted on their natural keys.
+        [How it tests]: Runs collect_jira_issues twice over the same faked page, the child issue listed before its parent.
+        [Expected result]: Row counts do not change on the second run; updated values are applied.
+        """
+        child = _bulk_issue("601", "PROJ-3")
+        child["fields"]["parent"] = {"id": "602"}
+        issues = [child, _bulk_issue("602", "PROJ-4")]
+
+        def post(url, **kwargs):
+            if url.endswith("/search/jql"):
+                return _jira_response({"issues": [{"id": "601"}, {"id": "602"}], "isLast": True})
+            if url.endswith("/issue/bulkfetch"):
+                return _jira_response({"issues": issues})
+            return _jira_response({"count": 2})
+
+        mock_requests.post.side_effect = post
+        mock_requests.get.side_effect = lambda url, **kwargs: _jira_response(
+            [] if url.endswith("/field") else {"detail": []}
+        )
+
+        models = (JiraIssue, JiraComment, JiraHistoryItem, JiraActivityLog, JiraUser)
+        self._miner().collect_jira_issues("PROJ", [])
+        counts = [m.objects.count() for m in models]
+
+        issues[1]["fields"]["status"] = {"name": "Reopened"}
+        self._miner().collect_jira_issues("PROJ", [])
+
+        self.assertEqual([m.objects.count() for m in models], counts)
+        self.assertEqual(JiraActivityLog.objects.filter(issue_id="601").count(), 1)
+        self.assertEqual(JiraIssue.objects.get(issue_id="601").parent_issue_id, "602")
+        self.assertEqual(JiraIssue.objects.get(issue_id="602").status, "Reopened")
+
+    @patch("jira.miner.requests")
+    def test_incremental_sync_pages_changelog_from_last_history(self, mock_requests):
+        """
+        [Scenario]: Incremental sync of an issue whose embedded changelog is truncated.
+        [What it tests]: JQL selects issues by `updated`; only new changelog entries are fetched and stored.
+        [How it tests]: Stores the issue and its first history entry, then syncs with a truncated changelog.
+        [Expected result]: `updated >=` in JQL, changelog paged from the stored entry, new entries upserted.
+        """
+        JiraProject.objects.create(id="10001", key="PROJ", name="Test Project", simplified=False, projectTypeKey="software")
+        stored = JiraIssue.objects.create(
+            issue_id="701", issue_key="PROJ-7", project_id="10001", summary="Issue PROJ-7", status="To Do",
+            created="2024-01-02T10:00:00Z", updated="2024-03-01T12:00:00Z",
+        )
+        JiraHistory.objects.create(id=7011, issue=stored, created="2024-01-02T10:00:00Z")
+
+        issue = _bulk_issue("701", "PROJ-7")
+        issue["changelog"] = {"total": 3, "histories": []}
+
+        def change(history_id, to):
+            return {"id": str(history_id), "author": {"displayName": "Ann"}, "created": "2024-03-02T10:00:00.000+0000",
+                    "items": [{"field": "status", "fieldtype": "jira", "fromString": "To Do", "toString": to}]}
+
+        def post(url, **kwargs):
+            if url.endswith("/search/jql"):
+                self.assertIn('AND updated >= "2024-03-01 11:55"', kwargs["json"]["jql"])
+                return _jira_response({"issues": [{"id": "701"}], "isLast": True})
+            if url.endswith("/issue/bulkfetch"):
+                return _jira_response({"issues": [issue]})
+            return _jira_response({"count": 1})
+
+        def get(url, **kwargs):
+            if url.endswith("/PROJ-7/changelog"):
+                self.assertEqual(kwargs["params"]["startAt"], 0)
+                return _jira_response({"values": [change(7011, "To Do"), change(7012, "Doing"), change(7013, "Done")],
+                                       "total": 3, "isLast": True})
+            return _jira_response([] if url.endswith("/field") else {"detail": []})
+
+        mock_requests.post.side_effect = post
+        mock_requests.get.side_effect = get
+
+        result = self._miner().collect_jira_issues("PROJ", [], incremental=True)
+
+        self.assertEqual(result["updated_since"], "2024-03-01T11:55:00+00:00")
+        self.assertEqual(
+            sorted(JiraHistory.objects.filter(issue_id="701").values_list("id", flat=True)), [7011, 7012, 7013]
+        )
+        self.assertEqual(JiraActivityLog.objects.filter(issue_id="701").count(), 2)
+
+    @patch("jira.miner.update_task_progress_date")
+    @patch("jira.miner.requests")
+    def test_date_range_is_one_stream_with_day_checkpoints(self, mock_requests, mock_progress):
+        """
+        [Scenario]: Collecting a date range for a task.
+        [What it tests]: The range is read as one `created ASC` stream instead of one search per day.
+        [How it tests]: Fakes two search pages; records the progress checkpoints.
+        [Expected result]: One count and one stream; each completed day and finally the end date are checkpointed.
+        """
+        pages = [
+            ({"issues": [{"id": "801"}, {"id": "802"}], "nextPageToken": "p2", "isLast": False},
+             [_bulk_issue("801", "PROJ-81", created="2024-01-02T10:00:00.000+0000"),
+              _bulk_issue("802", "PROJ-82", created="2024-01-03T10:00:00.000+0000")]),
+            ({"issues": [{"id": "803"}], "isLast": True},
+             [_bulk_issue("803", "PROJ-83", created="2024-01-05T10:00:00.000+0000")]),
+        ]
+        searches = []
+
+        def post(url, **kwargs):
+            if url.endswith("/search/jql"):
+                searches.append(kwargs["json"])
+                return _jira_response(pages[len(searches) - 1][0])
+            if url.endswith("/issue/bulkfetch"):
+                return _jira_response({"issues": pages[len(searches) - 1][1]})
+            return _jira_response({"count": 3})
+
+        mock_requests.post.side_effect = post
+        mock_requests.get.side_effect = lambda url, **kwargs: _jira_response(
+            [] if url.endswith("/field") else {"detail": []}
+        )
+        task = Task.objects.create(task_id=str(uuid.uuid4()), operation="collect", repository="test/PROJ", type="jira_issues")
+
+        with patch.object(JiraMiner, "verify_token"):
+            miner = JiraMiner("test.atlassian.net", task_obj=task)
+        result = miner.collect_jira_issues("PROJ", [], "2024-01-01", "2024-01-10")
+
+        self.assertEqual(result["total_issues"], 3)
+        self.assertEqual(len(searches), 2)
+        self.assertTrue(searches[0]["jql"].endswith(
+            'created >= "2024-01-01 00:00" AND created <= "2024-01-10 23:59" ORDER BY created ASC'
+        ))
+        self.assertEqual(searches[1]["nextPageToken"], "p2")
+        counts = [c for c in mock_requests.post.call_args_list if c.args[0].endswith("/approximate-count")]
+        self.assertEqual(len(counts), 1)
+        self.assertEqual([c.args[1] for c in mock_progress.call_args_list], ["2024-01-02", "2024-01-04", "2024-01-10"])
+
+    @patch("jira.miner.requests")
+    def test_token_and_field_metadata_are_cached_per_domain(self, mock_requests):
+        """
+        [Scenario]: Several miners are created for the same domain.
+        [What it tests]: /myself and /field answers are reused from the shared cache.
+        [How it tests]: Builds two miners and reads the custom field mapping from both.
+        [Expected result]: One /myself and one /field call; the cached time zone is restored.
+        """
+        def get(url, **kwargs):
+            if url.endswith("/myself"):
+                return _jira_response({"accountId": "me", "timeZone": "America/Sao_Paulo"})
+            return _jira_response([{"id": "customfield_10020", "name": "Sprint"}, {"id": "summary", "name": "Summary"}])
+
+        mock_requests.get.side_effect = get
+
+        first = JiraMiner("test.atlassian.net")
+        second = JiraMiner("test.atlassian.net")
+
+        self.assertEqual(first.get_custom_fields_mapping(), {"customfield_10020": "Sprint"})
+        self.assertEqual(second.get_custom_fields_mapping(), {"customfield_10020": "Sprint"})
+        self.assertEqual(second.user_timezone, "America/Sao_Paulo")
+        urls = [c.args[0] for c in mock_requests.get.call_args_list]
+        self.assertEqual(sum(u.endswith("/myself") for u in urls), 1)
+        self.assertEqual(sum(u.endswith("/field") for u in urls), 1)
+
+    @patch("jira.miner.requests")
+    def test_rate_limited_request_honours_retry_after(self, mock_requests):
+        """
+        [Scenario]: Jira answers 429 with Retry-After.
+        [What it tests]: The shared domain throttle backs off for Retry-After, then the request is retried.
+        [How it tests]: First GET returns 429 (Retry-After: 0), second returns 200.
+        [Expected result]: The 200 response is returned after two calls.
+        """
+        from jira.utils import get_domain_throttle, retry_after_seconds
+
+        limited = _jira_response({}, status_code=429)
+        limited.headers = {"Retry-After": "0"}
+        mock_requests.get.side_effect = [limited, _jira_response({"ok": True})]
+        miner = self._miner()
+
+        with patch.object(get_domain_throttle(miner.jira_domain, 1), "back_off") as spy_back_off:
+            response = miner._get("https://test.atlassian.net/rest/api/3/myself")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_requests.get.call_count, 2)
+        spy_back_off.assert_called_once_with(0.0)
+        self.assertEqual(retry_after_seconds(MagicMock(headers={})), 60)
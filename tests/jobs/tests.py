@@ -0,0 +1,367 @@
+from unittest.mock import patch, MagicMock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs.models import Task
+
+
+class TaskListTests(APITestCase):
+    """Listing and background reconciliation of the Task table."""
+
+    def setUp(self):
+        for i in range(7):
+            Task.objects.create(
+                task_id=f"task-{i}", operation=f"op {i}", repository="repo", type="github_commits",
+                status="STARTED" if i % 2 else "COMPLETED", result={"payload": "x" * 1000},
+            )
+
+    @patch("jobs.tasks.AsyncResult")
+    def test_list_is_paginated_and_read_only(self, mock_async_result):
+        """
+        [Scenario]: Seven tasks, some still STARTED, are listed three per page.
+        [What it tests]: The listing is paginated, filterable and never polls Celery or writes.
+        [How it tests]: Lists pages and a status filter while capturing the queries.
+        [Expected result]: Pages of three with the total count; only SELECTs; AsyncResult untouched.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("task-list"), {"page_size": 3, "page": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 7)
+        self.assertEqual([t["task_id"] for t in response.data["results"]], ["task-3", "task-2", "task-1"])
+        self.assertTrue(all(q["sql"].startswith("SELECT") for q in queries))
+        self.assertNotIn('"jobs_task"."result"', " ".join(q["sql"] for q in queries))
+        mock_async_result.assert_not_called()
+
+        response = self.client.get(reverse("task-list"), {"status": "STARTED"})
+        self.assertEqual(response.data["count"], 3)
+
+    @patch("jobs.tasks.publish_task_event")
+    @patch("jobs.tasks.AsyncResult")
+    def test_sync_task_statuses_reconciles_active_tasks(self, mock_async_result, mock_publish):
+        """
+        [Scenario]: Three STARTED tasks: one succeeded, one failed, one unknown to Celery.
+        [What it tests]: The periodic job applies Celery states to active tasks only.
+        [How it tests]: Fakes AsyncResult per task id and runs sync_task_statuses.
+        [Expected result]: SUCCESS and FAILURE are recorded and published; PENDING does not overwrite STARTED.
+        """
+        from jobs.tasks import sync_task_statuses
+        states = {
+            "task-1": ("SUCCESS", {"status": "success"}),
+            "task-3": ("FAILURE", RuntimeError("boom")),
+            "task-5": ("PENDING", None),
+        }
+
+        def async_result(task_id, app=None):
+            state, result = states[task_id]
+            return MagicMock(state=state, result=result)
+        mock_async_result.side_effect = async_result
+
+        self.assertEqual(sync_task_statuses(), 2)
+
+        rows = {t.task_id: t for t in Task.objects.filter(task_id__in=states)}
+        self.assertEqual(rows["task-1"].status, "SUCCESS")
+        self.assertEqual(rows["task-1"].result, {"payload": "x" * 1000})  # the task's own result is kept
+        self.assertEqual((rows["task-3"].status, rows["task-3"].error), ("FAILURE", "boom"))
+        self.assertEqual(rows["task-5"].status, "STARTED")
+        self.assertEqual(sorted(c.args[0] for c in mock_async_result.call_args_list), ["task-1", "task-3", "task-5"])
+        self.assertEqual(
+            sorted((c.args[0].task_id, c.args[0].status) for c in mock_publish.call_args_list),
+            [("task-1", "SUCCESS"), ("task-3", "FAILURE")],
+        )
+
+
+    @patch("jobs.tasks.AsyncResult")
+    @patch("jobs.views.AsyncResult")
+    def test_finished_rows_keep_the_status_they_wrote(self, mock_view_async_result, mock_sync_async_result):
+        """
+        [Scenario]: A COMPLETED export and a sharded parent closed as FAILURE, whose Celery tasks both returned.
+        [What it tests]: Neither the status view nor sync_task_statuses replaces a final status with Celery's SUCCESS.
+        [How it tests]: Polls both rows with Celery reporting SUCCESS, then runs the periodic sync the same way.
+        [Expected result]: The rows stay COMPLETED and FAILURE with their error.
+        """
+        from jobs.tasks import sync_task_statuses
+        Task.objects.create(task_id="merged", operation="op", repository="Stack Overflow",
+                            type="stackoverflow_question_collection", status="FAILURE", error="1 of 2 shards failed")
+        for mock_async_result in (mock_view_async_result, mock_sync_async_result):
+            mock_async_result.return_value = MagicMock(state="SUCCESS", result={"status": "success"})
+
+        for task_id in ("task-0", "merged"):
+            self.assertEqual(self.client.get(reverse("task-status", args=[task_id])).status_code, status.HTTP_200_OK)
+        sync_task_statuses()
+
+        self.assertEqual(Task.objects.get(task_id="task-0").status, "COMPLETED")
+        merged = Task.objects.get(task_id="merged")
+        self.assertEqual((merged.status, merged.error), ("FAILURE", "1 of 2 shards failed"))
+
+class ExportTaskTests(APITestCase):
+    """Asynchronous export jobs as seen by Celery and by the jobs API."""
+
+    @patch("jobs.tasks.publish_task_event")
+    @patch("celery.app.task.Task.request")
+    def test_failed_export_raises_and_is_not_downloadable(self, mock_request, mock_publish):
+        """
+        [Scenario]: An export job fails, then the client polls its status and tries to download it.
+        [What it tests]: The failure is raised to Celery, and the row stays FAILURE and not downloadable.
+        [How it tests]: Runs the task with a builder that cannot be imported, then polls with Celery reporting FAILURE.
+        [Expected result]: The task raises; the row is FAILURE with EXPORT_FAILED and the download answers 409.
+        """
+        from jobs.tasks import export_data_task
+        mock_request.id = "export-failed"
+
+        with self.assertRaises(ImportError):
+            export_data_task.run("utils.missing.build_plan", {})
+
+        task = Task.objects.get(task_id="export-failed")
+        self.assertEqual((task.status, task.error_type, task.result["status"]), ("FAILURE", "EXPORT_FAILED", "error"))
+
+        with patch("jobs.views.AsyncResult") as mock_async_result:
+            mock_async_result.return_value.state = "FAILURE"
+            mock_async_result.return_value.result = ImportError("utils.missing")
+            self.assertEqual(self.client.get(reverse("task-status", args=["export-failed"])).status_code, status.HTTP_200_OK)
+
+        self.assertEqual(Task.objects.get(task_id="export-failed").status, "FAILURE")
+        r = self.client.get(reverse("task-download", args=["export-failed"]))
+        self.assertEqual(r.status_code, status.HTTP_409_CONFLICT)
+
+
+class TaskEventsTests(APITestCase):
+    """Task progress pushed through Redis pub/sub and streamed as server-sent events."""
+
+    def setUp(self):
+        self.task = Task.objects.create(
+            task_id="events-1", operation="Starting", repository="repo", type="jira_issues",
+            status="STARTED", result={"payload": "x" * 1000},
+        )
+
+    @patch("jobs.events.get_redis")
+    def test_saved_progress_is_published_once_committed(self, mock_get_redis):
+        """
+        [Scenario]: A miner saves a new operation on its task.
+        [What it tests]: The save is published on the task channel and the all-tasks channel, without the result.
+        [How it tests]: Fakes the Redis client and runs the on_commit callbacks of the save.
+        [Expected result]: Two publishes carrying the new operation and no result payload.
+        """
+        import json
+        pipe = mock_get_redis.return_value.pipeline.return_value
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.operation = "Page 3 saved"
+            self.task.save(update_fields=["operation"])
+
+        channels = [c.args[0] for c in pipe.publish.call_args_list]
+        self.assertEqual(channels, ["jobs:task:events-1", "jobs:tasks"])
+        event = json.loads(pipe.publish.call_args_list[0].args[1])
+        self.assertEqual((event["task_id"], event["status"], event["operation"]), ("events-1", "STARTED", "Page 3 saved"))
+        self.assertNotIn("result", event)
+        pipe.execute.assert_called_once()
+
+    @patch("jobs.events.get_redis")
+    def test_task_stream_forwards_events_until_the_task_finishes(self, mock_get_redis):
+        """
+        [Scenario]: A client follows a running task with EventSource.
+        [What it tests]: The stream sends the current state, then the published events, and ends on completion.
+        [How it tests]: Fakes the pub/sub messages and reads the streaming response.
+        [Expected result]: Snapshot, one progress event, the COMPLETED event, then the stream closes.
+        """
+        import json
+        pubsub = mock_get_redis.return_value.pubsub.return_value
+        pubsub.get_message.side_effect = [
+            None,
+            {"data": json.dumps({"task_id": "events-1", "status": "STARTED", "operation": "Page 2"}).encode()},
+            {"data": json.dumps({"task_id": "events-1", "status": "COMPLETED", "operation": "Done"}).encode()},
+        ]
+
+        response = self.client.get(reverse("task-events", args=["events-1"]), HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join(response.streaming_content).decode()
+
+        events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+        self.assertEqual([e["operation"] for e in events], ["Starting", "Page 2", "Done"])
+        pubsub.subscribe.assert_called_once_with("jobs:task:events-1")
+        pubsub.close.assert_called_once()
+
+    def test_stream_of_an_unknown_task_is_not_found(self):
+        """
+        [Scenario]: A client asks for the events of a task id that does not exist.
+        [What it tests]: The endpoint answers 404 instead of opening an endless stream.
+        [How it tests]: Requests the stream with an EventSource Accept header.
+        [Expected result]: HTTP 404.
+        """
+        response = self.client.get(reverse("task-events", args=["missing"]), HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@patch("jobs.monitor.publish_task_event")
+class TaskEventConsumerTests(APITestCase):
+    """Task rows kept in sync from Celery events, and orphan detection through worker heartbeats."""
+
+    def setUp(self):
+        from jobs.monitor import TaskEventConsumer
+        self.consumer = TaskEventConsumer(MagicMock(), flush_interval=3600, worker_lost_after=60)
+        for task_id, task_status in (("a", "PENDING"), ("b", "STARTED"), ("c", "COMPLETED")):
+            Task.objects.create(task_id=task_id, operation="op", repository="repo", type="github_commits", status=task_status)
+
+    def _statuses(self):
+        return dict(Task.objects.values_list("task_id", "status"))
+
+    def test_events_are_applied_in_one_batch(self, mock_publish):
+        """
+        [Scenario]: Workers report a start, a failure, a late success and an event for a row not created yet.
+        [What it tests]: Buffered events are written in one flush, only on active rows, and unknown ids are retried.
+        [How it tests]: Feeds event dicts to the consumer, flushes, then creates the missing row and flushes again.
+        [Expected result]: a STARTED on w1, b FAILURE with its exception, c untouched, d applied once it exists.
+        """
+        self.consumer.on_task_event({"type": "task-started", "uuid": "a", "hostname": "w1"})
+        self.consumer.on_task_event({"type": "task-failed", "uuid": "b", "hostname": "w1", "exception": "ValueError('x')"})
+        self.consumer.on_task_event({"type": "task-succeeded", "uuid": "c", "hostname": "w1"})
+        self.consumer.on_task_event({"type": "task-started", "uuid": "d", "hostname": "w2"})
+        self.assertEqual(self._statuses(), {"a": "PENDING", "b": "STARTED", "c": "COMPLETED"})
+
+        self.assertEqual(self.consumer.flush(), 2)
+        self.assertEqual(self._statuses(), {"a": "STARTED", "b": "FAILURE", "c": "COMPLETED"})
+        self.assertEqual(Task.objects.get(task_id="a").worker, "w1")
+        self.assertEqual(Task.objects.get(task_id="b").error, "ValueError('x')")
+        self.assertEqual(mock_publish.call_count, 2)
+
+        Task.objects.create(task_id="d", operation="op", repository="repo", type="jira_issues", status="STARTED")
+        self.assertEqual(self.consumer.flush(), 1)
+        self.assertEqual(Task.objects.get(task_id="d").worker, "w2")
+
+    def test_only_tasks_of_lost_workers_are_orphaned(self, mock_publish):
+        """
+        [Scenario]: Two workers run a task each; w1 goes silent, w2 keeps sending heartbeats; w3 shuts down.
+        [What it tests]: Orphans are detected per worker through heartbeats and worker-offline events.
+        [How it tests]: Records the tasks' workers, moves the clock past TASK_WORKER_LOST_AFTER for w1 only.
+        [Expected result]: The tasks of w1 and w3 fail as WORKER_LOST, the task of w2 keeps running.
+        """
+        from unittest.mock import patch as mock_patch
+        Task.objects.filter(task_id="a").update(status="STARTED", worker="w1")
+        Task.objects.filter(task_id="b").update(worker="w2")
+        Task.objects.create(task_id="e", operation="op", repository="repo", type="jira_issues", status="STARTED", worker="w3")
+
+        self.consumer.on_worker_event({"type": "worker-offline", "hostname": "w3"})
+        self.assertEqual(Task.objects.get(task_id="e").error_type, "WORKER_LOST")
+
+        now = self.consumer.started_at + 120
+        self.consumer.last_seen["w2"] = now - 5
+        with mock_patch("jobs.monitor.time.time", return_value=now):
+            self.consumer.check_workers()
+
+        self.assertEqual(self._statuses(), {"a": "FAILURE", "b": "STARTED", "c": "COMPLETED", "e": "FAILURE"})
+        self.assertEqual(Task.objects.get(task_id="a").error_type, "WORKER_LOST")
+
+    @patch("jobs.management.commands.reset_orphaned_tasks.live_task_ids")
+    def test_reset_orphaned_tasks_keeps_live_and_queued_tasks(self, mock_live_task_ids, mock_publish):
+        """
+        [Scenario]: The container restarts while task a is still queued and task b is lost.
+        [What it tests]: reset_orphaned_tasks only fails tasks unknown to live workers and the broker.
+        [How it tests]: Fakes the ids reported by live workers/queue and runs the command.
+        [Expected result]: b fails, a keeps waiting; nothing is reset when the broker cannot be reached.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+
+        mock_live_task_ids.side_effect = ConnectionError("broker down")
+        call_command("reset_orphaned_tasks", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(self._statuses(), {"a": "PENDING", "b": "STARTED", "c": "COMPLETED"})
+
+        mock_live_task_ids.side_effect = None
+        mock_live_task_ids.return_value = {"a"}
+        call_command("reset_orphaned_tasks", stdout=StringIO())
+        self.assertEqual(self._statuses(), {"a": "PENDING", "b": "FAILURE", "c": "COMPLETED"})
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CollectionLockTests(APITestCase):
+    """Deduplication of collection requests and serialization of overlapping ranges."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_identical_requests_are_coalesced(self):
+        """
+        [Scenario]: fetch_issues is requested twice for the same repository and range, then again once it finished.
+        [What it tests]: dispatch_collection returns the job already queued instead of sending a second one.
+        [How it tests]: Dispatches through a mocked task and marks the first job's Task as finished.
+        [Expected result]: One task sent for the two first requests, a new one after completion; other ranges are sent.
+        """
+        from jobs.locks import dispatch_collection
+        task = MagicMock()
+        task.name = "github.tasks.fetch_issues"
+        args = ["pandas-dev/pandas", "2025-01-01T00:00:00Z", "2025-01-31T00:00:00Z", "basic"]
+
+        first_id, coalesced = dispatch_collection(task, args=args)
+        self.assertFalse(coalesced)
+        self.assertEqual(dispatch_collection(task, args=list(args)), (first_id, True))
+        self.assertEqual(task.apply_async.call_count, 1)
+        self.assertEqual(task.apply_async.call_args.kwargs["task_id"], first_id)
+
+        other_id, coalesced = dispatch_collection(task, args=[*args[:3], "complex"])
+        self.assertFalse(coalesced)
+
+        Task.objects.create(task_id=first_id, operation="op", repository=args[0], type="github_issues_basic", status="SUCCESS")
+        new_id, coalesced = dispatch_collection(task, args=args)
+        self.assertFalse(coalesced)
+        self.assertNotIn(new_id, (first_id, other_id))
+        self.assertEqual(task.apply_async.call_count, 3)
+
+    def test_overlapping_ranges_are_serialized(self):
+        """
+        [Scenario]: Three collections of the same repository's issues; the first is later orphaned.
+        [What it tests]: CollectionLock only grants ranges overlapping no running one, and drops dead holders.
+        [How it tests]: Acquires January-March, February-April and April-May, then fails the first Task.
+        [Expected result]: February-April waits for the first until its Task fails; April-May runs at once.
+        """
+        from jobs.locks import CollectionLock
+        lock = CollectionLock("github", "pandas-dev/pandas", "issues")
+        Task.objects.create(task_id="a", operation="op", repository="pandas-dev/pandas", type="github_issues_basic", status="STARTED")
+
+        self.assertIsNone(lock.acquire("a", "2025-01-01", "2025-03-31T23:59:59Z"))
+        self.assertEqual(lock.acquire("b", "2025-02-01", "2025-04-30"), "a")
+        self.assertIsNone(lock.acquire("c", "2025-04-01", "2025-05-31"))
+        self.assertIsNone(CollectionLock("github", "pandas-dev/pandas", "commits").acquire("d", None, None))
+        self.assertEqual(lock.acquire("e", None, None), "a")
+
+        Task.objects.filter(task_id="a").update(status="FAILURE", error_type="WORKER_LOST")
+        self.assertEqual(lock.acquire("b", "2025-02-01", "2025-04-30"), "c")
+        lock.release("c")
+        self.assertIsNone(lock.acquire("b", "2025-02-01", "2025-04-30"))
+
+    def test_guarded_task_retries_while_busy_and_releases_when_done(self):
+        """
+        [Scenario]: A guarded collection starts while an overlapping one runs, then after it finished.
+        [What it tests]: collection_guard retries the task instead of running it, and frees the range afterwards.
+        [How it tests]: Decorates a function with a mocked bound task and holds its range with another id.
+        [Expected result]: First call raises the retry without running; second runs and leaves no lock or dedup key.
+        """
+        from jobs.locks import CollectionLock, collection_guard, request_key
+        body = MagicMock(return_value="done")
+
+        @collection_guard("jira", "issues", target=("jira_domain", "project_key"))
+        def collect(self, jira_domain, project_key, start_date=None, end_date=None):
+            return body(jira_domain, project_key)
+
+        task = MagicMock()
+        task.name = "jira.tasks.collect_jira_issues_task"
+        task.request.id = "new"
+        task.retry.return_value = RuntimeError("retry")
+        lock = CollectionLock("jira", "acme.atlassian.net/PROJ", "issues")
+        lock.acquire("running", "2025-01-01", None)
+
+        with self.assertRaisesMessage(RuntimeError, "retry"):
+            collect(task, "acme.atlassian.net", "PROJ", "2025-06-01")
+        body.assert_not_called()
+
+        lock.release("running")
+        cache.set(request_key(task.name, ["acme.atlassian.net", "PROJ", "2025-06-01"]), "new")
+        self.assertEqual(collect(task, "acme.atlassian.net", "PROJ", "2025-06-01"), "done")
+        self.assertIsNone(cache.get(request_key(task.name, ["acme.atlassian.net", "PROJ", "2025-06-01"])))
+        self.assertIsNone(lock.acquire("other", None, None))
@@ -1,4 +1,6 @@
 from django.urls import reverse
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 from unittest.mock import patch, MagicMock
@@ -103,6 +105,35 @@ def test_lookup_questions_list_and_content(self):
         self.assertEqual(question["title"], "How to test in Django?")
         self.assertEqual(question["owner"]["display_name"], "Test User")
 
+    def test_lookup_questions_full_text_search(self):
+        """Should match questions through the ranked full-text search on title/body."""
+        # Arrange
+        StackQuestion.objects.create(question_id=102, title="Parsing JSON in Rust", score=1)
+        url = reverse("stackoverflow-question-list")
+
+        # Act
+        response = self.client.get(url, {"search": "testing django"})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([q["question_id"] for q in response.data["results"]], [101])
+
+    def test_lookup_questions_query_count_and_fields(self):
+        """Should load owners and tags without per-question queries, and honour fields=."""
+        # Arrange
+        for i in range(5):
+            question = StackQuestion.objects.create(question_id=200 + i, title=f"Q{i}", score=i, owner=self.user)
+            question.tags.add(self.tag)
+        url = reverse("stackoverflow-question-list")
+
+        # Act / Assert: count, questions (+owner), tags
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.data["count"], 6)
+
+        response = self.client.get(url, {"fields": "question_id,title"})
+        self.assertEqual(set(response.data["results"][0]), {"question_id", "title"})
+
     def test_lookup_question_detail(self):
         """Should return details of a specific question."""
         # Arrange
@@ -115,6 +146,20 @@ def test_lookup_question_detail(self):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["question_id"], self.question.question_id)
 
+    def test_export_questions_csv_is_streamed(self):
+        """Should stream the CSV export with a header row and one line per question."""
+        # Arrange
+        url = reverse("stackoverflow_export_csv")
+
+        # Act
+        response = self.client.post(url, {"format": "csv"}, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "question_id,title,score,creation_date,link")
+        self.assertTrue(lines[1].startswith("101,How to test in Django?,10"))
+
     def test_lookup_question_not_found(self):
         """Should return 404 for non-existent question."""
         # Arrange
@@ -243,3 +288,521 @@ def test_collect_questions_task_without_request_id(self, mock_fetch_questions):
         task_obj = Task.objects.first()
         self.assertTrue(task_obj)
         self.assertEqual(task_obj.status, "COMPLETED")
+
+
+class StackOverflowFetcherTests(APITestCase):
+    """Persistence of fetched pages, against a faked Stack Exchange API."""
+
+    def _page(self):
+        owner = {"user_id": 1, "display_name": "Renamed", "reputation": 50}
+        answerer = {"user_id": 2, "display_name": "Answerer"}
+        return {
+            "has_more": False,
+            "items": [
+                {
+                    "question_id": 101, "title": "How to test in Django?", "score": 12, "tags": ["python", "testing"],
+                    "owner": owner, "is_answered": True, "creation_date": 1704189600,
+                    "comments": [{"comment_id": 1001, "post_id": 101, "post_type": "question", "body": "Which version?",
+                                  "owner": answerer, "content_license": "CC BY-SA 4.0", "link": "https://so/c/1001", "body_markdown": "Which version?"}],
+                    "answers": [{"answer_id": 2001, "body": "Use TestCase", "owner": answerer, "share_link": "https://so/a/2001",
+                                 "body_markdown": "Use TestCase", "link": "https://so/a/2001", "title": "How to test in Django?",
+                                 "comments": [{"comment_id": 1002, "post_id": 2001, "post_type": "answer", "body": "Thanks",
+                                               "owner": owner, "content_license": "CC BY-SA 4.0", "link": "https://so/c/1002", "body_markdown": "Thanks"}]}],
+                },
+                {"question_id": 102, "title": "Second", "tags": ["python"], "owner": owner, "creation_date": 1704193200},
+            ],
+        }
+
+    @patch("stackoverflow.miner.question_fetcher.safe_api_call")
+    def test_page_is_bulk_upserted(self, mock_api_call):
+        """
+        [Scenario]: A page of questions with answers, comments, shared owners and tags.
+        [What it tests]: The page is written with a fixed number of bulk statements and upserts existing rows.
+        [How it tests]: Pre-creates question 101 (tagged django) and its owner, then fetches the page twice.
+        [Expected result]: Rows are created once, updated on conflict, tags replaced, partial owners merged.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from stackoverflow.miner.question_fetcher import fetch_questions
+        from stackoverflow.models import StackAnswer, StackComment, StackQuestionTag
+
+        user = StackUser.objects.create(user_id=1, display_name="Test User", location="Rio")
+        question = StackQuestion.objects.create(question_id=101, title="Old title", owner=user, score=10)
+        question.tags.add(StackTag.objects.create(name="django"))
+        mock_api_call.return_value = self._page()
+
+        with CaptureQueriesContext(connection) as queries:
+            fetch_questions("stackoverflow", "2024-01-02", "2024-01-02", "key", "token")
+        self.assertLess(len(queries), 15)
+
+        fetch_questions("stackoverflow", "2024-01-02", "2024-01-02", "key", "token")
+
+        question.refresh_from_db()
+        self.assertEqual((question.title, question.score), ("How to test in Django?", 12))
+        self.assertEqual(sorted(question.tags.values_list("name", flat=True)), ["python", "testing"])
+        self.assertEqual(StackQuestionTag.objects.count(), 3)
+        self.assertEqual(StackAnswer.objects.get().question_id, 101)
+        self.assertEqual(
+            dict(StackComment.objects.values_list("comment_id", "answer_id")), {1001: None, 1002: 2001}
+        )
+        user.refresh_from_db()
+        self.assertEqual((user.display_name, user.reputation, user.location), ("Renamed", 50, "Rio"))
+        self.assertEqual(StackUser.objects.count(), 2)
+
+
+    @patch("stackoverflow.miner.question_fetcher.safe_api_call")
+    def test_pages_are_logged_without_credentials(self, mock_api_call):
+        """
+        [Scenario]: A page of two questions is collected with page-level logging enabled.
+        [What it tests]: Credentials never reach the logs and progress is written once per page, not per item.
+        [How it tests]: Captures the stackoverflow logs at DEBUG and counts the UPDATEs of the task's operation.
+        [Expected result]: No log line holds the key or token; one structured page record; one progress save.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from stackoverflow.miner.question_fetcher import fetch_questions
+        task = Task.objects.create(task_id="so-logs", operation="", repository="Stack Overflow")
+        mock_api_call.return_value = {**self._page(), "quota_remaining": 9000}
+
+        with self.assertLogs("stackoverflow", level="DEBUG") as logs, CaptureQueriesContext(connection) as queries:
+            fetch_questions("stackoverflow", "2024-01-02", "2024-01-02", "secret-key", "secret-token", task_obj=task)
+
+        output = "\n".join(logs.output)
+        self.assertNotIn("secret-key", output)
+        self.assertNotIn("secret-token", output)
+        pages = [r.miner for r in logs.records if getattr(r, "miner", {}).get("event") == "page"]
+        self.assertEqual([(p["page"], p["items"], p["quota_remaining"]) for p in pages], [(1, 2, 9000)])
+        operation_saves = [q for q in queries if q["sql"].startswith("UPDATE") and '"operation"' in q["sql"]]
+        self.assertEqual(len(operation_saves), 3)  # start, the page, finish
+
+    def test_redaction_of_params_and_messages(self):
+        """
+        [Scenario]: Request params and a requests exception message carrying a key and token.
+        [What it tests]: redact/redact_text mask credential values only.
+        [How it tests]: Redacts a params dict and an URL-bearing error message.
+        [Expected result]: key/access_token are masked, other values are kept.
+        """
+        from utils.metrics import redact, redact_text
+        self.assertEqual(
+            redact({"key": "k", "access_token": "t", "site": "stackoverflow"}),
+            {"key": "***", "access_token": "***", "site": "stackoverflow"},
+        )
+        self.assertEqual(
+            redact_text("400 Client Error for url: https://api/questions?key=abc&site=so&access_token=xyz"),
+            "400 Client Error for url: https://api/questions?key=***&site=so&access_token=***",
+        )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    STACK_API_KEYS=["key-a", "key-b"], STACK_ACCESS_TOKENS=["token-a", "token-b"],
+)
+class StackQuotaManagerTests(APITestCase):
+    """Routing of Stack Exchange calls over several keys."""
+
+    def setUp(self):
+        cache.clear()
+
+    def _response(self, payload, status_code=200):
+        response = MagicMock(status_code=status_code)
+        response.json.return_value = payload
+        return response
+
+    @patch("stackoverflow.miner.token_manager.time.sleep")
+    @patch("stackoverflow.miner.safe_api_call.requests.get")
+    def test_calls_rotate_to_the_key_with_most_quota(self, mock_get, mock_sleep):
+        """
+        [Scenario]: Two keys; the first runs low, then the second gets throttled.
+        [What it tests]: Each call goes to the key with the most headroom, and collection goes on past a low quota.
+        [How it tests]: Mocks requests.get and inspects the key sent on each call.
+        [Expected result]: Data is returned on low quota, a throttled key is waited out, exhaustion of all keys returns None.
+        """
+        from stackoverflow.miner.safe_api_call import safe_api_call
+
+        mock_get.side_effect = [
+            self._response({"items": [1], "quota_remaining": 10}),
+            self._response({"items": [2], "quota_remaining": 9000}),
+            self._response({"error_id": 502, "error_name": "throttle_violation",
+                            "error_message": "too many requests, more requests available in 600 seconds"}, 400),
+            self._response({"items": [3], "quota_remaining": 40}),
+        ]
+
+        self.assertEqual(safe_api_call("https://api/questions", {"page": 1})["items"], [1])
+        self.assertEqual(safe_api_call("https://api/questions", {"page": 2})["items"], [2])
+        # key-a is below its reserve, so the throttled key-b is waited out
+        self.assertEqual(safe_api_call("https://api/questions", {"page": 3})["items"], [3])
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 600, delta=5)
+        # both keys are now below their reserve
+        self.assertIsNone(safe_api_call("https://api/questions", {"page": 4}))
+
+        sent = [(c.kwargs["params"]["key"], c.kwargs["params"]["access_token"]) for c in mock_get.call_args_list]
+        self.assertEqual(sent, [("key-a", "token-a"), ("key-b", "token-b"), ("key-b", "token-b"), ("key-b", "token-b")])
+
+    @patch("stackoverflow.miner.safe_api_call.requests.get")
+    def test_rejected_key_is_replaced_within_the_call(self, mock_get):
+        """
+        [Scenario]: The first key is rejected by the API.
+        [What it tests]: The call is retried on the next key and the rejected one leaves the rotation.
+        [How it tests]: Mocks an access_denied error followed by a success.
+        [Expected result]: The call succeeds on key-b, and later calls go straight to key-b.
+        """
+        from stackoverflow.miner.safe_api_call import safe_api_call
+
+        mock_get.side_effect = [
+            self._response({"error_id": 403, "error_name": "access_denied", "error_message": "denied"}, 403),
+            self._response({"items": [], "quota_remaining": 100}),
+            self._response({"items": [], "quota_remaining": 99}),
+        ]
+
+        self.assertEqual(safe_api_call("https://api/questions", {"key": "ignored"})["items"], [])
+        safe_api_call("https://api/questions", {})
+
+        sent = [c.kwargs["params"]["key"] for c in mock_get.call_args_list]
+        self.assertEqual(sent, ["key-a", "key-b", "key-b"])
+
+
+class StackOverflowShardingTests(APITestCase):
+    """Sharded collections fanned out with a Celery chord."""
+
+    @patch("stackoverflow.tasks.chord")
+    @patch("celery.app.task.Task.request")
+    def test_range_is_split_into_shards_merged_by_a_chord(self, mock_task_request, mock_chord):
+        """
+        [Scenario]: A 10-day collection requested with 3 shards.
+        [What it tests]: The parent task fans out one subtask per contiguous day range, and the callback merges them.
+        [How it tests]: Captures the chord header, then runs the callback with one failed shard.
+        [Expected result]: Ranges cover the period without gaps; the parent checkpoints up to the first failed shard.
+        """
+        from stackoverflow.tasks import collect_questions_task, merge_question_shards
+        mock_task_request.id = str(uuid.uuid4())
+
+        result = collect_questions_task.run(
+            start_date="2025-01-01", end_date="2025-01-10", tags="django", shards=3
+        )
+
+        parent = Task.objects.get()
+        self.assertEqual(result["status"], "sharded")
+        header = mock_chord.call_args.args[0]
+        self.assertEqual(
+            [(sig.kwargs["start_date"], sig.kwargs["end_date"]) for sig in header],
+            [("2025-01-01", "2025-01-04"), ("2025-01-05", "2025-01-07"), ("2025-01-08", "2025-01-10")],
+        )
+        self.assertTrue(all(sig.kwargs["parent_pk"] == parent.pk and sig.kwargs["tags"] == "django" for sig in header))
+        mock_chord.return_value.assert_called_once()
+
+        merge_question_shards.run([
+            {"status": "success", "end_date": "2025-01-04"},
+            {"status": "error", "end_date": "2025-01-07", "code": "UNEXPECTED_EXCEPTION", "message": "boom"},
+            {"status": "success", "end_date": "2025-01-10"},
+        ], parent_pk=parent.pk)
+
+        parent.refresh_from_db()
+        self.assertEqual(parent.status, "FAILURE")
+        self.assertEqual(parent.date_last_update.date().isoformat(), "2025-01-04")
+        self.assertEqual(parent.error, "boom")
+
+    @patch("jobs.monitor.publish_task_event")
+    @patch("stackoverflow.tasks.chord")
+    @patch("celery.app.task.Task.request")
+    def test_sharded_parent_stays_running_until_its_shards_finish(self, mock_task_request, mock_chord, mock_publish):
+        """
+        [Scenario]: The parent of a sharded collection returns while its shards still run, then its worker goes away.
+        [What it tests]: The Celery SUCCESS of the parent is ignored by every reconciler until the chord callback runs.
+        [How it tests]: Feeds SUCCESS to reconcile_task, a task-succeeded event and a worker-offline event to the consumer.
+        [Expected result]: The parent stays STARTED, then merge_question_shards completes it.
+        """
+        from jobs.monitor import TaskEventConsumer
+        from jobs.tasks import reconcile_task
+        from stackoverflow.tasks import collect_questions_task, merge_question_shards
+        mock_task_request.id = str(uuid.uuid4())
+
+        collect_questions_task.run(start_date="2025-01-01", end_date="2025-01-10", shards=2)
+        parent = Task.objects.get()
+        self.assertEqual(parent.status, "STARTED")
+        self.assertEqual(reconcile_task(parent, "SUCCESS", {"status": "sharded"}), [])
+
+        consumer = TaskEventConsumer(MagicMock(), flush_interval=3600, worker_lost_after=60)
+        consumer.on_task_event({"type": "task-started", "uuid": parent.task_id, "hostname": "w1"})
+        consumer.on_task_event({"type": "task-succeeded", "uuid": parent.task_id, "hostname": "w1"})
+        consumer.flush()
+        consumer.on_worker_event({"type": "worker-offline", "hostname": "w1"})
+        parent.refresh_from_db()
+        self.assertEqual(parent.status, "STARTED")
+        mock_publish.assert_not_called()
+
+        merge_question_shards.run([
+            {"status": "success", "end_date": "2025-01-05"},
+            {"status": "success", "end_date": "2025-01-10"},
+        ], parent_pk=parent.pk)
+        parent.refresh_from_db()
+        self.assertEqual(parent.status, "COMPLETED")
+        self.assertFalse(parent.awaits_subtasks())
+
+
+class StackOverflowWindowTests(APITestCase):
+    """Adaptive window sizing of fetch_questions."""
+
+    def _fake_api(self, per_day):
+        """Fake API holding `per_day` questions a day; records the windows fetched."""
+        from datetime import datetime as dt
+        self.fetched = []
+
+        def call(url, params):
+            days = round((params["todate"] - params["fromdate"]) / 86400)
+            if params["filter"] == "total":
+                return {"total": days * per_day}
+            self.fetched.append((dt.fromtimestamp(params["fromdate"]).date(), dt.fromtimestamp(params["todate"]).date()))
+            return {"items": [], "has_more": False}
+        return call
+
+    @patch("stackoverflow.miner.question_fetcher.safe_api_call")
+    def test_sparse_tag_is_fetched_in_one_window(self, mock_api_call):
+        """
+        [Scenario]: A tag with a handful of questions a month, collected over two months.
+        [What it tests]: Sparse ranges are sized with one total call instead of one call per day.
+        [How it tests]: Fakes the API, counting the total and item calls.
+        [Expected result]: One sizing call, one fetch for the whole range, checkpoint at its last day.
+        """
+        from stackoverflow.miner.question_fetcher import fetch_questions
+        mock_api_call.side_effect = self._fake_api(per_day=0.1)
+        task = Task.objects.create(task_id="sparse", operation="", repository="Stack Overflow")
+
+        fetch_questions("stackoverflow", "2024-01-01", "2024-02-29", "key", "token", task_obj=task, tags="niche")
+
+        self.assertEqual(mock_api_call.call_count, 2)
+        self.assertEqual([(a.isoformat(), b.isoformat()) for a, b in self.fetched], [("2024-01-01", "2024-02-29")])
+        task.refresh_from_db()
+        self.assertEqual(task.date_last_update.date().isoformat(), "2024-02-29")
+
+    @patch("stackoverflow.miner.question_fetcher.safe_api_call")
+    def test_dense_tag_is_split_into_contiguous_windows(self, mock_api_call):
+        """
+        [Scenario]: A tag with 400 questions a day over ten days.
+        [What it tests]: Dense ranges are split into windows of at most WINDOW_TARGET questions.
+        [How it tests]: Fakes the API and inspects the windows that were fetched.
+        [Expected result]: Windows of whole days, each within the target, covering the range without gaps.
+        """
+        from datetime import timedelta
+        from stackoverflow.miner.question_fetcher import fetch_questions, WINDOW_TARGET
+        mock_api_call.side_effect = self._fake_api(per_day=400)
+
+        fetch_questions("stackoverflow", "2024-01-01", "2024-01-10", "key", "token", tags="python")
+
+        self.assertEqual(self.fetched[0][0].isoformat(), "2024-01-01")
+        self.assertEqual(self.fetched[-1][1].isoformat(), "2024-01-10")
+        for (_, prev_end), (start, _) in zip(self.fetched, self.fetched[1:]):
+            self.assertEqual(start, prev_end + timedelta(days=1))
+        self.assertTrue(all(((end - start).days + 1) * 400 <= WINDOW_TARGET for start, end in self.fetched))
+
+
+class StackOverflowRefreshTests(APITestCase):
+    """Incremental refresh of stored questions."""
+
+    @patch("stackoverflow.miner.question_fetcher.safe_api_call")
+    def test_changed_questions_are_refreshed_in_batches_of_ids(self, mock_api_call):
+        """
+        [Scenario]: 150 stored python questions, one of which got a new answer since the last sync.
+        [What it tests]: The refresh asks /questions/{ids} for activity since the last sync, 100 ids per call.
+        [How it tests]: Fakes the API returning the changed question for the batch that holds it.
+        [Expected result]: Two calls, sort=activity with min=since, and the changed question and its answer are upserted.
+        """
+        from datetime import datetime, timezone as tz
+        from stackoverflow.miner.question_fetcher import refresh_questions
+        from stackoverflow.models import StackAnswer
+
+        python = StackTag.objects.create(name="python")
+        owner = StackUser.objects.create(user_id=1, display_name="Owner")
+        for question_id in range(1, 151):
+            StackQuestion.objects.create(question_id=question_id, title=f"Q{question_id}", owner=owner, score=1)
+        for question in StackQuestion.objects.all():
+            question.tags.add(python)
+
+        def api(url, params):
+            if url.endswith(";150"):
+                return {"items": [{
+                    "question_id": 150, "title": "Q150", "score": 7, "tags": ["python"], "is_answered": True,
+                    "owner": {"user_id": 1},
+                    "answers": [{"answer_id": 9001, "body": "New", "owner": {"user_id": 1}, "share_link": "https://so/a",
+                                 "body_markdown": "New", "link": "https://so/a", "title": "Q150"}],
+                }]}
+            return {"items": []}
+        mock_api_call.side_effect = api
+        since = datetime(2025, 1, 1, tzinfo=tz.utc)
+
+        summary = refresh_questions("stackoverflow", "key", "token", since=since, tags=["python"])
+
+        self.assertEqual(summary["checked"], 150)
+        self.assertEqual(summary["refreshed"], 1)
+        self.assertEqual(mock_api_call.call_count, 2)
+        first_url, first_params = mock_api_call.call_args_list[0].args
+        self.assertEqual(len(first_url.rsplit("/", 1)[1].split(";")), 100)
+        self.assertEqual((first_params["sort"], first_params["min"]), ("activity", int(since.timestamp())))
+        self.assertEqual(StackQuestion.objects.get(question_id=150).score, 7)
+        self.assertEqual(StackAnswer.objects.get().question_id, 150)
+
+    @patch("stackoverflow.miner.question_fetcher.safe_api_call")
+    def test_questions_mined_earlier_keep_their_own_since(self, mock_api_call):
+        """
+        [Scenario]: Question 1 was mined in January, question 2 by a collection that just ran.
+        [What it tests]: The default since covers the oldest mined question instead of the latest.
+        [How it tests]: Refreshes with no since and batches of one id, then reads the min of each call.
+        [Expected result]: Question 1 is asked for activity since January, question 2 since its recent mining.
+        """
+        from datetime import datetime, timezone as tz
+        from django.utils import timezone
+        from stackoverflow.miner import question_fetcher
+        from stackoverflow.miner.question_fetcher import REFRESH_OVERLAP, get_last_sync, refresh_questions
+
+        owner = StackUser.objects.create(user_id=1, display_name="Owner")
+        january = datetime(2025, 1, 10, tzinfo=tz.utc)
+        recent = timezone.now()
+        StackQuestion.objects.create(question_id=2, title="Q2", owner=owner, score=1, time_mined=recent)
+        StackQuestion.objects.create(question_id=1, title="Q1", owner=owner, score=1, time_mined=january)
+        mock_api_call.return_value = {"items": []}
+
+        self.assertEqual(get_last_sync(StackQuestion.objects.all()), january - REFRESH_OVERLAP)
+        with patch.object(question_fetcher, "REFRESH_BATCH_SIZE", 1):
+            summary = refresh_questions("stackoverflow", "key", "token")
+
+        mins = {call.args[0].rsplit("/", 1)[1]: call.args[1]["min"] for call in mock_api_call.call_args_list}
+        self.assertEqual(mins, {
+            "1": int((january - REFRESH_OVERLAP).timestamp()),
+            "2": int((recent - REFRESH_OVERLAP).timestamp()),
+        })
+        self.assertEqual(summary["since"], (january - REFRESH_OVERLAP).isoformat())
+
+
+class StackOverflowRestartTests(APITestCase):
+    """Restarts replay the stored parameters from the stored cursor."""
+
+    @patch("stackoverflow.tasks.collect_questions_task.apply_async")
+    def test_restart_resumes_with_parameters_and_cursor(self, mock_apply_async):
+        """
+        [Scenario]: A tagged advanced collection stopped on page 3 of its 2024-01-05..2024-01-08 window.
+        [What it tests]: restart_collection replays tags, filters and mode, starting at the cursor window and page.
+        [How it tests]: Runs the restart handler on a Task holding params and cursor, capturing the dispatch.
+        [Expected result]: The collection is dispatched from 2024-01-05 with the original parameters and the cursor.
+        """
+        from datetime import datetime, timezone as tz
+        from stackoverflow.tasks import restart_collection
+        cursor = {"day": "2024-01-05", "last_day": "2024-01-08", "page": 3}
+        task = Task.objects.create(
+            task_id="so-restart", operation="", repository="Stack Overflow", status="FAILURE",
+            type="stackoverflow_question_collection",
+            date_init=datetime(2024, 1, 1, tzinfo=tz.utc), date_end=datetime(2024, 1, 31, tzinfo=tz.utc),
+            date_last_update=datetime(2024, 1, 4, tzinfo=tz.utc), cursor=cursor,
+            params={"tags": ["django"], "filters": {"accepted": True}, "mode": "advanced", "shards": 1},
+        )
+        mock_apply_async.return_value.id = "new-id"
+
+        restart_collection.run(task.pk)
+
+        call = mock_apply_async.call_args.kwargs
+        self.assertEqual(call["args"], ["2024-01-05", "2024-01-31", ["django"], {"accepted": True}, "advanced"])
+        self.assertEqual(call["kwargs"]["resume"], cursor)
+        self.assertEqual(call["kwargs"]["task_pk"], task.pk)
+
+    @patch("stackoverflow.miner.question_fetcher.time.sleep")
+    @patch("stackoverflow.miner.question_fetcher.safe_api_call")
+    def test_fetch_resumes_on_the_cursor_page(self, mock_api_call, _):
+        """
+        [Scenario]: fetch_questions is resumed with a cursor on page 3 of a four-day window.
+        [What it tests]: The window is not re-sized and paging starts at the cursor page; the cursor follows the pages.
+        [How it tests]: Fakes two pages of the API and records the cursor saved between them.
+        [Expected result]: Pages 3 and 4 of the same window are fetched, then the window is checkpointed and the cursor cleared.
+        """
+        from stackoverflow.miner.question_fetcher import fetch_questions
+        task = Task.objects.create(task_id="so-resume", operation="", repository="Stack Overflow")
+        cursors, calls = [], []
+
+        def api(url, params):
+            cursors.append(Task.objects.get(pk=task.pk).cursor)
+            calls.append(dict(params))
+            return {"items": [{"question_id": params["page"], "title": "Q"}], "has_more": params["page"] == 3}
+        mock_api_call.side_effect = api
+
+        fetch_questions("stackoverflow", "2024-01-05", "2024-01-08", "key", "token", task_obj=task,
+                        resume={"day": "2024-01-05", "last_day": "2024-01-08", "page": 3})
+
+        self.assertEqual([c["page"] for c in calls], [3, 4])
+        self.assertNotIn("total", [c["filter"] for c in calls])
+        self.assertEqual(cursors[1], {"day": "2024-01-05", "last_day": "2024-01-08", "page": 4})
+        task.refresh_from_db()
+        self.assertIsNone(task.cursor)
+        self.assertEqual(task.date_last_update.date().isoformat(), "2024-01-08")
+
+
+class StackOverflowDashboardStatsTests(APITestCase):
+    """Dashboard served from the materialized per-tag daily counters."""
+
+    def setUp(self):
+        from datetime import datetime, timezone as dt_timezone
+        from stackoverflow.models import StackAnswer, StackComment
+
+        def day(d):
+            return datetime(2024, 1, d, 12, tzinfo=dt_timezone.utc)
+
+        alice = StackUser.objects.create(user_id=1, display_name="Alice")
+        bob = StackUser.objects.create(user_id=2, display_name="Bob")
+        python, django = StackTag.objects.create(name="python"), StackTag.objects.create(name="django")
+
+        both = StackQuestion.objects.create(question_id=1, title="Q1", owner=alice, creation_date=day(1))
+        both.tags.add(python, django)
+        only_python = StackQuestion.objects.create(question_id=2, title="Q2", owner=bob, creation_date=day(2))
+        only_python.tags.add(python)
+        StackQuestion.objects.create(question_id=3, title="Untagged", owner=alice, creation_date=day(2))
+
+        answer = StackAnswer.objects.create(answer_id=10, question=both, body="A", owner=bob, creation_date=day(3),
+                                            share_link="https://so/a/10", body_markdown="A", link="https://so/a/10", title="Q1")
+        for comment_id, kwargs in ((100, {"question": both}), (101, {"answer": answer})):
+            StackComment.objects.create(comment_id=comment_id, post_type="question", post_id=1, body="C", owner=bob,
+                                        content_license="CC BY-SA 4.0", body_markdown="C", link="https://so/c", **kwargs)
+
+    def test_dashboard_and_top_tags_are_served_from_daily_counters(self):
+        """
+        [Scenario]: Two tagged questions (one with two tags), one untagged, with an answer and comments.
+        [What it tests]: refresh_tag_stats materializes per-tag/per-day counters and the dashboard reads them.
+        [How it tests]: Refreshes the counters, then calls the dashboard with and without tag and dates.
+        [Expected result]: Totals count each question once and each user once, tags count theirs, in few queries.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from stackoverflow.stats import refresh_tag_stats
+
+        self.assertEqual(refresh_tag_stats("2024-01-01", "2024-01-31"), 5)  # python x2, django, and 2 all-tag days
+        url = reverse("stackoverflow-dashboard")
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(url).json()
+        self.assertLessEqual(len(queries), 4)
+        # Alice and Bob, although Bob is active on three days
+        self.assertEqual(
+            (data["questions_count"], data["answers_count"], data["comments_count"], data["users_count"]), (3, 1, 2, 2)
+        )
+        self.assertEqual(data["tags_count"], 2)
+        self.assertEqual(data["top_tags"], [{"name": "python", "count": 2}, {"name": "django", "count": 1}])
+        latest = StackQuestion.objects.order_by("-time_mined").first().time_mined
+        self.assertEqual(data["time_mined"][:19], latest.strftime("%Y-%m-%dT%H:%M:%S"))
+
+        data = self.client.get(url, {"tag": "python", "start_date": "2024-01-02T00:00:00Z"}).json()
+        self.assertEqual((data["questions_count"], data["answers_count"], data["users_count"]), (1, 0, 1))
+        self.assertIsNone(data["top_tags"])
+
+    def test_refresh_drops_days_without_questions(self):
+        """
+        [Scenario]: A question is deleted after its day was materialized.
+        [What it tests]: A refresh of the range removes the counters of days left without questions.
+        [How it tests]: Refreshes, deletes question 1, refreshes the same range again.
+        [Expected result]: Only the rows of January 2nd remain, django has disappeared.
+        """
+        from stackoverflow.models import StackTagDailyStats
+        from stackoverflow.stats import refresh_tag_stats
+
+        refresh_tag_stats("2024-01-01", "2024-01-31")
+        StackQuestion.objects.filter(question_id=1).delete()
+        refresh_tag_stats("2024-01-01", "2024-01-31")
+
+        self.assertEqual(
+            sorted(StackTagDailyStats.objects.values_list("tag", "day__day", "questions")),
+            [("", 2, 2), ("python", 2, 1)],
+        )
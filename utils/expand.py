@@ -0,0 +1,83 @@
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_list_param(request, name):
+    """Read a comma separated query parameter (`?expand=a,b` or `?expand=a&expand=b`) as a set."""
+    if request is None:
+        return set()
+    values = set()
+    for raw in request.query_params.getlist(name):
+        values.update(v.strip() for v in raw.split(',') if v.strip())
+    return values
+
+
+def fields_parameter():
+    return OpenApiParameter(
+        name=FIELDS_PARAM, type=str, location=OpenApiParameter.QUERY, required=False,
+        description="Comma separated list of top-level fields to return (default: all)"
+    )
+
+
+def expand_parameter(*choices):
+    return OpenApiParameter(
+        name=EXPAND_PARAM, type=str, location=OpenApiParameter.QUERY, required=False,
+        description=f"Comma separated heavy relations to include: {', '.join(choices)}"
+    )
+
+
+class ExpandableFieldsMixin:
+    """
+    Serializer mixin for sparse and expandable output.
+
+    - `Meta.expandable_fields` lists fields (at any nesting level) that are only
+      rendered when named in the view's expand set.
+    - On the root serializer, `?fields=` keeps only the listed top-level fields.
+
+    The expand/fields sets come from the serializer context, filled in by
+    ExpandableViewMixin, so views can load exactly the relations they render.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        expand = self.context.get('expand', set())
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expand:
+                fields.pop(name, None)
+
+        root = self.root
+        is_root = self is root or (self.parent is root and isinstance(root, serializers.ListSerializer))
+        only = self.context.get('only_fields')
+        if is_root and only:
+            fields = {name: field for name, field in fields.items() if name in only}
+        return fields
+
+
+class ExpandableViewMixin:
+    """
+    View mixin pairing with ExpandableFieldsMixin.
+
+    `default_expand` is merged with `?expand=`; views use `get_expand()` and
+    `wants_field()` in get_queryset to build a matching prefetch plan.
+    """
+    default_expand = ()
+
+    def get_expand(self):
+        return set(self.default_expand) | parse_list_param(getattr(self, 'request', None), EXPAND_PARAM)
+
+    def get_only_fields(self):
+        return parse_list_param(getattr(self, 'request', None), FIELDS_PARAM)
+
+    def wants_field(self, name):
+        only = self.get_only_fields()
+        return not only or name in only
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        context['only_fields'] = self.get_only_fields()
+        return context
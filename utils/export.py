@@ -0,0 +1,354 @@
+import csv
+import gzip
+import json
+import os
+import zlib
+from typing import NamedTuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils.encoding import smart_str
+
+from utils.search import is_search_vector
+
+# Rows fetched per round-trip of the server-side cursor
+EXPORT_CHUNK_SIZE = 2000
+
+STREAM_FORMATS = {
+    'json': ('application/json', 'json'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+}
+
+# Binary formats with typed columns and zstd-compressed column chunks
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+COLUMNAR_COMPRESSION = 'zstd'
+
+# Rows per Parquet row group / Arrow record batch
+ROW_GROUP_SIZE = 50000
+
+# Extensions of the compressed files written by asynchronous export jobs
+EXPORT_FILE_EXTENSIONS = {
+    'json': 'json.gz',
+    'ndjson': 'ndjson.gz',
+    'csv': 'csv.gz',
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+}
+
+# Asynchronous exports report progress every this many rows
+EXPORT_PROGRESS_EVERY = 50000
+
+
+class ExportError(Exception):
+    """Invalid export request, carrying the HTTP status the view should answer with."""
+
+    def __init__(self, detail, status_code=400):
+        super().__init__(str(detail))
+        self.detail = detail
+        self.status_code = status_code
+
+    @property
+    def payload(self):
+        return self.detail if isinstance(self.detail, dict) else {"error": self.detail}
+
+
+class ExportPlan(NamedTuple):
+    """Everything needed to run an export, as built from the request body."""
+    queryset: object
+    fields: list
+    format_type: str
+    filename_base: str
+    run_async: bool = False
+    compress: bool = False
+
+
+def get_export_fields(model):
+    """Concrete column names exported by default (FKs export their primary key)."""
+    return [f.name for f in model._meta.fields if not is_search_vector(f)]
+
+
+def iter_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield one dict per row without building model instances.
+
+    Uses `.values_list().iterator()`, which Postgres serves from a server-side
+    cursor, so memory stays flat regardless of the export size.
+    """
+    for values in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield dict(zip(fields, values))
+
+
+def csv_value(val):
+    if val is None:
+        return ""
+    if hasattr(val, "isoformat"):
+        return val.isoformat()
+    if isinstance(val, bool):
+        return "true" if val else "false"
+    if isinstance(val, (list, tuple, set)):
+        return ", ".join(map(str, val))
+    return smart_str(val)
+
+
+class Echo:
+    """Pseudo-buffer that hands back what csv.writer writes."""
+
+    def write(self, value):
+        return value
+
+
+def stream_json_array(rows):
+    yield "["
+    first = True
+    for row in rows:
+        yield ("\n" if first else ",\n") + json.dumps(row, cls=DjangoJSONEncoder)
+        first = False
+    yield "\n]\n"
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow([smart_str(col) for col in fields])
+    for row in rows:
+        yield writer.writerow([csv_value(row[col]) for col in fields])
+
+
+def _json_list_item(item):
+    return item if isinstance(item, str) else json.dumps(item, cls=DjangoJSONEncoder)
+
+
+def _json_text(val):
+    return None if val is None else json.dumps(val, cls=DjangoJSONEncoder)
+
+
+def _json_list(val):
+    if val is None:
+        return None
+    if not isinstance(val, (list, tuple)):
+        val = [val]
+    return [_json_list_item(item) for item in val]
+
+
+def arrow_column(field):
+    """
+    Arrow type for a model field, plus an optional converter for its values.
+
+    JSON columns defaulting to a list become list<string> (non-string items are
+    JSON-encoded); other JSON columns are exported as JSON text.
+    """
+    if isinstance(field, (models.ForeignKey, models.OneToOneField)):
+        return arrow_column(field.target_field)
+    if isinstance(field, models.BooleanField):
+        return pa.bool_(), None
+    if isinstance(field, (models.AutoField, models.IntegerField)):
+        return pa.int64(), None
+    if isinstance(field, (models.FloatField, models.DecimalField)):
+        return pa.float64(), float
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC'), None
+    if isinstance(field, models.DateField):
+        return pa.date32(), None
+    if isinstance(field, models.JSONField):
+        if field.default is list:
+            return pa.list_(pa.string()), _json_list
+        return pa.string(), _json_text
+    return pa.string(), smart_str
+
+
+def export_field(model, name, annotations=None):
+    """Model field behind an exported column; annotated (joined) columns use their output field."""
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        if annotations and name in annotations:
+            return annotations[name].output_field
+        raise
+
+
+def arrow_schema(model, fields, annotations=None):
+    """Build the Arrow schema and per-column converters for exported fields."""
+    columns, converters = [], []
+    for name in fields:
+        field = export_field(model, name, annotations)
+        arrow_type, converter = arrow_column(field)
+        columns.append(pa.field(name, arrow_type, nullable=True))
+        converters.append(converter)
+    return pa.schema(columns), converters
+
+
+def iter_record_batches(rows, fields, schema, converters, batch_size=ROW_GROUP_SIZE):
+    """Group row dicts into typed Arrow record batches of batch_size rows."""
+    columns = [[] for _ in fields]
+    count = 0
+    for row in rows:
+        for values, name, convert in zip(columns, fields, converters):
+            val = row[name]
+            values.append(convert(val) if convert and val is not None else val)
+        count += 1
+        if count == batch_size:
+            yield pa.record_batch(columns, schema=schema)
+            columns = [[] for _ in fields]
+            count = 0
+    if count:
+        yield pa.record_batch(columns, schema=schema)
+
+
+class ByteSink:
+    """Write-only file object that hands back the bytes written since the last drain."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def open_columnar_writer(sink, schema, format_type):
+    if format_type == 'parquet':
+        return pq.ParquetWriter(sink, schema, compression=COLUMNAR_COMPRESSION)
+    return pa.ipc.new_file(
+        sink, schema, options=pa.ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION)
+    )
+
+
+def stream_columnar(rows, fields, format_type, model, annotations=None):
+    """
+    Encode rows as Parquet or an Arrow IPC file, yielding bytes per row group.
+
+    Only one row group is held in memory at a time; the footer is emitted last.
+    """
+    schema, converters = arrow_schema(model, fields, annotations)
+    sink = ByteSink()
+    writer = open_columnar_writer(pa.PythonFile(sink, mode='w'), schema, format_type)
+    try:
+        for batch in iter_record_batches(rows, fields, schema, converters):
+            writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(rows, fields, format_type, model=None, annotations=None):
+    """Encode an iterable of row dicts in the requested format."""
+    if format_type in COLUMNAR_FORMATS:
+        return stream_columnar(rows, fields, format_type, model, annotations)
+    if format_type == 'csv':
+        return stream_csv(rows, fields)
+    if format_type == 'ndjson':
+        return stream_ndjson(rows)
+    return stream_json_array(rows)
+
+
+def gzip_stream(chunks):
+    """Gzip a stream of text or byte chunks on the fly."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def streaming_export_response(queryset, fields, format_type, filename_base, compress=False):
+    """
+    Build a StreamingHttpResponse for a queryset export.
+
+    Args:
+        queryset: Filtered queryset to export
+        fields: Column names (model field names or annotations) to include
+        format_type: 'json', 'ndjson', 'csv', 'parquet' or 'arrow'
+        filename_base: File name without extension
+        compress: Gzip text formats (Parquet and Arrow are already compressed)
+
+    Returns:
+        StreamingHttpResponse with a Content-Disposition attachment header
+    """
+    content_type, extension = STREAM_FORMATS[format_type]
+    chunks = stream_export(
+        iter_rows(queryset, fields), fields, format_type, queryset.model, queryset.query.annotations
+    )
+    if compress and format_type not in COLUMNAR_FORMATS:
+        chunks = gzip_stream(chunks)
+        content_type, extension = 'application/gzip', f"{extension}.gz"
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename_base}.{extension}"'
+    response['Access-Control-Expose-Headers'] = 'Content-Disposition'
+    return response
+
+
+def write_export_file(queryset, fields, format_type, path, on_progress=None,
+                      progress_every=EXPORT_PROGRESS_EVERY):
+    """
+    Stream a queryset export into a file in EXPORT_DIRECTORY.
+
+    Text formats are gzip-compressed; Parquet and Arrow are written as-is since
+    their column chunks are already zstd-compressed. The file is written next
+    to `path` with a `.part` suffix and renamed once complete, so a download
+    never sees a truncated export.
+
+    Args:
+        queryset: Filtered queryset to export
+        fields: Column names (model field names or annotations) to include
+        format_type: 'json', 'ndjson', 'csv', 'parquet' or 'arrow'
+        path: Destination file path
+        on_progress: Optional callable receiving the number of rows written so far
+        progress_every: Rows between two on_progress calls
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+
+    def counted(rows):
+        nonlocal written
+        for row in rows:
+            yield row
+            written += 1
+            if on_progress and written % progress_every == 0:
+                on_progress(written)
+
+    tmp_path = f"{path}.part"
+    try:
+        if format_type in COLUMNAR_FORMATS:
+            fh = open(tmp_path, 'wb')
+        else:
+            fh = gzip.open(tmp_path, 'wt', encoding='utf-8', newline='')
+        with fh:
+            rows = counted(iter_rows(queryset, fields))
+            for chunk in stream_export(rows, fields, format_type, queryset.model, queryset.query.annotations):
+                fh.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
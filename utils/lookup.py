@@ -1,11 +1,13 @@
 
 from django.db import models
 
+from utils.search import is_search_vector
+
 def get_filterset_fields(model):
     """Generate filterset_fields dictionary for django-filters"""
     filterset_fields = {}
     for field in model._meta.fields:
-        if isinstance(field, models.JSONField):
+        if isinstance(field, models.JSONField) or is_search_vector(field):
             continue
         elif isinstance(field, (models.DateField, models.TimeField, models.DateTimeField)):
             filterset_fields[field.name] = ['exact', 'gte', 'lte', 'year', 'month', 'day']
@@ -23,6 +25,8 @@ def get_search_fields(model):
     """Generate a list of fields that are searchable (CharField, TextField) for DRF search_fields."""
     search_fields = []
     for field in model._meta.fields:
+        if is_search_vector(field):
+            continue
         if not isinstance(field, (models.JSONField, models.ForeignKey, models.ManyToManyField, models.OneToOneField, models.DateField, models.TimeField, models.DateTimeField)):
             search_fields.append(field.name)
     return search_fields
\ No newline at end of file
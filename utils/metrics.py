@@ -0,0 +1,117 @@
+import logging
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+
+# Request parameters and headers never written to logs
+SECRET_PARAMS = frozenset({
+    'key', 'api_key', 'access_token', 'token', 'password', 'secret', 'client_secret', 'authorization',
+})
+REDACTED = '***'
+# key=value pairs of secret parameters inside URLs and exception messages
+SECRET_QUERY = re.compile(r"(?i)\b(%s)=([^&\s'\"]+)" % "|".join(sorted(SECRET_PARAMS)))
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def redact(params):
+    """Copy of a params/headers dict with credential values masked."""
+    if not params:
+        return params
+    return {k: REDACTED if str(k).lower() in SECRET_PARAMS and v else v for k, v in params.items()}
+
+
+def redact_text(text):
+    """Mask secret query parameters in a URL or message (e.g. a requests exception)."""
+    return SECRET_QUERY.sub(rf"\1={REDACTED}", str(text))
+
+
+def _logfmt(fields):
+    return " ".join(f"{k}={v}" for k, v in fields.items() if v is not None)
+
+
+class MinerMetrics:
+    """
+    Counters, latency histograms and gauges of one miner run.
+
+    Nothing is written per item: callers count items and log one structured
+    record per page (DEBUG, skipped entirely unless enabled) and a summary
+    at the end (INFO). Records carry the values twice: as key=value pairs in
+    the message for the console, and under `extra["miner"]` for structured
+    handlers.
+    """
+
+    def __init__(self, source, logger=None, **labels):
+        self.source = source
+        self.labels = labels
+        self.logger = logger or logging.getLogger(__name__)
+        self.counters = Counter()
+        self.gauges = {}
+        self.histograms = {}
+        self.started = time.monotonic()
+
+    def incr(self, name, value=1):
+        self.counters[name] += value
+
+    def gauge(self, name, value):
+        if value is not None:
+            self.gauges[name] = value
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.setdefault(
+            name, {'count': 0, 'sum': 0.0, 'buckets': [0] * (len(LATENCY_BUCKETS) + 1)}
+        )
+        histogram['count'] += 1
+        histogram['sum'] += seconds
+        histogram['buckets'][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    @contextmanager
+    def timer(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start)
+
+    def snapshot(self):
+        """Current values as a JSON-serializable dict."""
+        return {
+            'source': self.source,
+            **self.labels,
+            'elapsed_s': round(time.monotonic() - self.started, 3),
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'histograms': {
+                name: {
+                    'count': h['count'],
+                    'sum_s': round(h['sum'], 3),
+                    'buckets': dict(zip([*map(str, LATENCY_BUCKETS), 'inf'], h['buckets'])),
+                }
+                for name, h in self.histograms.items()
+            },
+        }
+
+    def event(self, event, level=logging.DEBUG, **fields):
+        """Log one structured record, only building it when `level` is enabled."""
+        if not self.logger.isEnabledFor(level):
+            return
+        record = {'source': self.source, 'event': event, **self.labels, **fields}
+        self.logger.log(level, _logfmt(record), extra={'miner': record})
+
+    def summary(self, level=logging.INFO):
+        """Log the run totals and latency as one record; returns the snapshot."""
+        snapshot = self.snapshot()
+        if self.logger.isEnabledFor(level):
+            latency = {
+                f"{name}_avg_s": round(h['sum_s'] / h['count'], 3)
+                for name, h in snapshot['histograms'].items() if h['count']
+            }
+            record = {
+                'source': self.source, 'event': 'summary', **self.labels,
+                'elapsed_s': snapshot['elapsed_s'], **snapshot['counters'], **snapshot['gauges'], **latency,
+            }
+            self.logger.log(level, _logfmt(record), extra={'miner': {**record, 'metrics': snapshot}})
+        return snapshot
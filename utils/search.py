@@ -0,0 +1,100 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField
+from django.db import models
+from django.db.models import F, Q
+from rest_framework.filters import SearchFilter
+
+# Text search configuration used both to build the stored vectors and to parse
+# queries. Changing it requires a migration of every search_vector column.
+SEARCH_CONFIG = 'english'
+SEARCH_VECTOR_FIELD = 'search_vector'
+
+
+def weighted_search_vector(*weighted_fields):
+    """
+    Build the expression for a stored tsvector column.
+
+    Args:
+        weighted_fields: (field_name, weight) pairs, e.g. ('title', 'A'), ('body', 'B')
+
+    Returns:
+        A combined SearchVector suitable for a GeneratedField expression
+    """
+    vector = None
+    for field_name, weight in weighted_fields:
+        part = SearchVector(field_name, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def search_vector_field(*weighted_fields):
+    """Return a GeneratedField that Postgres keeps in sync with the source columns."""
+    return models.GeneratedField(
+        expression=weighted_search_vector(*weighted_fields),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        editable=False,
+    )
+
+
+def has_search_vector(model):
+    try:
+        field = model._meta.get_field(SEARCH_VECTOR_FIELD)
+    except Exception:
+        return False
+    return isinstance(getattr(field, 'output_field', field), SearchVectorField)
+
+
+def is_search_vector(field):
+    """True for stored tsvector columns, which are not meant to be filtered, exported or serialized."""
+    return isinstance(getattr(field, 'output_field', field), SearchVectorField)
+
+
+def apply_search(queryset, search_terms, search_fields=None, rank=True):
+    """
+    Filter a queryset by a free-text search.
+
+    Models with a search_vector column use Postgres full-text search (GIN indexed)
+    and are annotated with `search_rank`. Other models fall back to OR-ing
+    `icontains` over search_fields, matching DRF's SearchFilter.
+    """
+    if not search_terms:
+        return queryset
+
+    if has_search_vector(queryset.model):
+        query = SearchQuery(search_terms, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(**{SEARCH_VECTOR_FIELD: query})
+        if rank:
+            queryset = queryset.annotate(
+                search_rank=SearchRank(F(SEARCH_VECTOR_FIELD), query)
+            ).order_by('-search_rank')
+        return queryset
+
+    q = Q()
+    for fld in search_fields or []:
+        if "__" in fld:
+            q |= Q(**{fld: search_terms})
+        else:
+            q |= Q(**{f"{fld}__icontains": search_terms})
+    return queryset.filter(q) if q else queryset
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on the `search=` parameter.
+
+    Uses the model's search_vector column when it has one, ranking results by
+    relevance unless the client passes `ordering=`. Otherwise behaves exactly
+    like SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not has_search_vector(queryset.model):
+            return super().filter_queryset(request, queryset, view)
+
+        search_terms = request.query_params.get(self.search_param, '').replace('\x00', '').strip()
+        if not search_terms:
+            return queryset
+
+        ordering_param = getattr(view, 'ordering_param', 'ordering')
+        rank = not request.query_params.get(ordering_param)
+        return apply_search(queryset, search_terms, rank=rank)